@@ -1,10 +1,16 @@
 from abc import ABC as AbstractClass, abstractmethod
 from collections import defaultdict
+import re
 from ..sollumz_properties import SollumzGame
 from mathutils import Vector
 from xml.etree import ElementTree as ET
+import numpy as np
+from numpy.typing import NDArray
+from typing import Iterator, Optional
 from .element import (
     AttributeProperty,
+    ChunkedElements,
+    ChunkedText,
     ElementTree,
     ElementProperty,
     FlagsProperty,
@@ -12,8 +18,14 @@ from .element import (
     MatrixProperty,
     ValueProperty,
     VectorProperty,
-    TextProperty
+    TextProperty,
+    load_document,
+    write_leaf_end,
+    write_start_tag,
+    StreamReader,
+    SubtreeReader
 )
+from ..tools.utils import np_arr_to_str_chunks, np_struct_arr_to_str_chunks, np_str_to_arr, np_str_to_values
 from bpy import context
 
 current_game = SollumzGame.GTA
@@ -24,16 +36,16 @@ class YBN:
 
     @staticmethod
     def from_xml_file(filepath):
-        global current_game
-        tree = ET.parse(filepath)
-        gameTag = tree.getroot().tag
-        
-        if "RDR2" in gameTag:
-            current_game = SollumzGame.RDR
-            return RDRBoundFile("RDR2Bounds").from_xml_file(filepath)
-        else:
-            current_game = SollumzGame.GTA
-            return BoundFile.from_xml_file(filepath)
+        def get_reader(root: ET.Element):
+            global current_game
+            if "RDR2" in root.tag:
+                current_game = SollumzGame.RDR
+                return RDRBoundFile.stream_reader(root)
+            else:
+                current_game = SollumzGame.GTA
+                return BoundFile.stream_reader(root)
+
+        return load_document(filepath, get_reader)
 
     @staticmethod
     def write_xml(bound_file, filepath):
@@ -199,44 +211,38 @@ class RDRBoundDisc(BoundChild):
         super().__init__()
 
 class VerticesProperty(ElementProperty):
-    value_types = (list)
+    """Vertex positions stored as a (N, 3) float32 array."""
+    value_types = (np.ndarray)
 
     def __init__(self, tag_name: str = "Vertices", value=None):
-        super().__init__(tag_name, value or [])
+        super().__init__(tag_name, None)
+        self.value = value if value is not None else np.empty((0, 3), dtype=np.float32)
 
     @staticmethod
     def from_xml(element: ET.Element):
-        new = VerticesProperty(element.tag, [])
-        text = element.text.strip().split("\n")
-        if len(text) > 0:
-            for line in text:
-                coords = line.strip().split(",")
-                if not len(coords) == 3:
-                    return VerticesProperty.read_value_error(element)
+        new = VerticesProperty(element.tag)
+        if not element.text or not element.text.strip():
+            return new
 
-                new.value.append(
-                    Vector((float(coords[0]), float(coords[1]), float(coords[2]))))
+        try:
+            # Parsed as float64 first, faster than parsing float32 and rounds the same as float()
+            values = np_str_to_arr(element.text, np.float64)
+        except ValueError:
+            return VerticesProperty.read_value_error(element)
+        if values.shape[1] != 3:
+            return VerticesProperty.read_value_error(element)
 
+        new.value = values.astype(np.float32)
         return new
 
     def to_xml(self):
-        element = ET.Element(self.tag_name)
-        text = ["\n"]
-
-        if not self.value:
-            return
-
-        for vertex in self.value:
-            if not isinstance(vertex, Vector):
-                raise TypeError(
-                    f"VerticesProperty can only contain Vector objects, not '{type(self.value)}'!")
-            for index, component in enumerate(vertex):
-                text.append(str(component))
-                if index < len(vertex) - 1:
-                    text.append(", ")
-            text.append("\n")
+        if len(self.value) == 0:
+            return None
 
-        element.text = "".join(text)
+        element = ET.Element(self.tag_name)
+        # Same text as formatting each component with str()
+        vertices = np.asarray(self.value, dtype=np.float32).reshape((-1, 3))
+        element.text = ChunkedText(lambda: np_arr_to_str_chunks(vertices, "%r, %r, %r"))
 
         return element
 
@@ -258,11 +264,14 @@ class OctantsProperty(ElementProperty):
         lines = element.text.strip().split("\n")
 
         for i, line in enumerate(lines):
-            for vert_ind in line.strip().replace(" ", "").split(","):
-                if not vert_ind:
-                    continue
+            line = line.replace(" ", "").strip().strip(",")
+            if not line:
+                continue
 
-                octants[i].append(int(vert_ind))
+            try:
+                octants[i] = np_str_to_values(line, np.int64, sep=",").tolist()
+            except ValueError:
+                return OctantsProperty.read_value_error(element)
 
         new.value = octants
 
@@ -376,38 +385,37 @@ class MaterialsList(ListProperty):
 
 
 class VertexColorProperty(ElementProperty):
-    value_types = (list[tuple[int, int, int, int]])
+    """Vertex colors stored as a (N, 4) uint8 array."""
+    value_types = (np.ndarray)
 
     def __init__(self, tag_name: str = "VertexColours", value=None):
-        super().__init__(tag_name, value or [])
+        super().__init__(tag_name, None)
+        self.value = value if value is not None else np.empty((0, 4), dtype=np.uint8)
 
     @staticmethod
     def from_xml(element: ET.Element):
-        new = VertexColorProperty(element.tag, [])
-        text = element.text.strip().split("\n")
-        if len(text) > 0:
-            for line in text:
-                colors = line.strip().split(",")
-                if len(colors) != 4:
-                    return VertexColorProperty.read_value_error(element)
+        new = VertexColorProperty(element.tag)
+        if not element.text or not element.text.strip():
+            return new
 
-                new.value.append((int(colors[0]), int(colors[1]), int(colors[2]), int(colors[3])))
+        try:
+            # Parsed wider so out of range values are rejected instead of wrapping around
+            values = np_str_to_arr(element.text, np.int64)
+        except ValueError:
+            return VertexColorProperty.read_value_error(element)
+        if values.shape[1] != 4 or values.min() < 0 or values.max() > 255:
+            return VertexColorProperty.read_value_error(element)
 
+        new.value = values.astype(np.uint8)
         return new
 
     def to_xml(self):
-        element = ET.Element(self.tag_name)
-        element.text = "\n"
-
         if len(self.value) == 0:
             return None
 
-        for color in self.value:
-            for index, component in enumerate(color):
-                element.text += str(int(component))
-                if index < len(color) - 1:
-                    element.text += ", "
-            element.text += "\n"
+        element = ET.Element(self.tag_name)
+        colors = np.asarray(self.value).reshape((-1, 4))
+        element.text = ChunkedText(lambda: np_arr_to_str_chunks(colors, "%u, %u, %u, %u"))
 
         return element
 
@@ -424,21 +432,39 @@ class Polygons(ListProperty):
 
     @staticmethod
     def from_xml(element: ET.Element):
+        builder = PolygonsBuilder()
+        for child in element:
+            builder.add(child)
+
         new = Polygons()
+        new.value = builder.finish()
+        return new
 
-        for child in element.iter():
-            if child.tag == "Box":
-                new.value.append(PolyBox.from_xml(child))
-            elif child.tag == "Sphere":
-                new.value.append(PolySphere.from_xml(child))
-            elif child.tag == "Capsule":
-                new.value.append(PolyCapsule.from_xml(child))
-            elif child.tag == "Cylinder":
-                new.value.append(PolyCylinder.from_xml(child))
-            elif child.tag == "Triangle":
-                new.value.append(PolyTriangle.from_xml(child))
+    @classmethod
+    def stream_reader(cls, element: ET.Element) -> StreamReader:
+        return PolygonsReader()
 
-        return new
+    def to_xml(self):
+        if not any(isinstance(poly, PolyTriangleArray) for poly in self.value):
+            return super().to_xml()
+
+        element = ET.Element(self.tag_name)
+        element.text = ChunkedElements(self._polygons_to_str_chunks)
+        return element
+
+    def _polygons_to_str_chunks(self) -> Iterator[str]:
+        for poly in self.value:
+            if isinstance(poly, PolyTriangleArray):
+                yield from poly.to_str_chunks(PolyTriangleArray.XML_FMT)
+            elif isinstance(poly, Polygon):
+                parts = []
+                poly_element = poly.to_xml()
+                write_start_tag(parts.append, poly_element)
+                write_leaf_end(parts.append, poly_element, 0)
+                yield "".join(parts)
+            else:
+                raise TypeError(
+                    f"Polygons can only hold objects of type 'Polygon' or 'PolyTriangleArray', not '{type(poly)}'")
 
 
 class PolyTriangle(Polygon):
@@ -454,6 +480,113 @@ class PolyTriangle(Polygon):
         self.f3 = AttributeProperty("f3", 0)
 
 
+POLY_TRIANGLE_DTYPE = np.dtype([
+    ("m", np.uint32),
+    ("v1", np.uint32),
+    ("v2", np.uint32),
+    ("v3", np.uint32),
+    ("f1", np.uint32),
+    ("f2", np.uint32),
+    ("f3", np.uint32),
+])
+
+
+class PolyTriangleArray:
+    """Block of triangle polygons stored as a structured array of ``POLY_TRIANGLE_DTYPE`` instead of one
+    ``PolyTriangle`` per triangle. Can be added to ``Polygons`` and ``PolygonListProperty`` along with other
+    polygons."""
+
+    XML_FMT = '<Triangle m="%u" v1="%u" v2="%u" v3="%u" f1="%u" f2="%u" f3="%u" />'
+    RDR_FMT = "Tri %u %u %u %u"
+
+    def __init__(self, data: Optional[NDArray] = None):
+        self.data = data if data is not None else np.empty(0, dtype=POLY_TRIANGLE_DTYPE)
+
+    def __len__(self):
+        return len(self.data)
+
+    def to_str_chunks(self, fmt: str) -> Iterator[str]:
+        """Format each triangle as a line of text with ``fmt``, which takes the fields in ``POLY_TRIANGLE_DTYPE``
+        order (``RDR_FMT`` only uses the material and vertex indices)."""
+        names = list(POLY_TRIANGLE_DTYPE.names[:fmt.count("%")])
+        return np_struct_arr_to_str_chunks(self.data[names], fmt)
+
+
+class PolygonsBuilder:
+    """Builds the list of ``Polygons`` from its child elements. Consecutive triangles are stored together in
+    a ``PolyTriangleArray``, other polygons are created as ``Polygon`` objects."""
+
+    # Triangles converted to an array at a time, so their attribute strings don't pile up
+    CHUNK_SIZE = 65536
+
+    def __init__(self):
+        self.polygons: list[Polygon | PolyTriangleArray] = []
+        self.triangle_values: list[str] = []
+        self.triangle_chunks: list[NDArray] = []
+
+    def add(self, child: ET.Element):
+        if child.tag == "Triangle":
+            get = child.attrib.get
+            self.triangle_values.extend([
+                get("m", "0"), get("v1", "0"), get("v2", "0"), get("v3", "0"),
+                get("f1", "0"), get("f2", "0"), get("f3", "0")
+            ])
+            if len(self.triangle_values) >= self.CHUNK_SIZE * 7:
+                self._flush_chunk()
+            return
+
+        poly_type = POLYGON_TYPES_BY_TAG.get(child.tag)
+        if poly_type is None:
+            return
+
+        self._flush_triangles()
+        self.polygons.append(poly_type.from_xml(child))
+
+    def finish(self) -> list[Polygon | PolyTriangleArray]:
+        self._flush_triangles()
+        return self.polygons
+
+    def _flush_chunk(self):
+        try:
+            # Parsed wider so out of range values are rejected instead of wrapping around
+            values = np.array(self.triangle_values, dtype=np.int64)
+        except (ValueError, OverflowError):
+            values = None
+        self.triangle_values = []
+        if values is None or values.min() < 0 or values.max() > np.iinfo(np.uint32).max:
+            return PolyTriangle.read_value_error(ET.Element(PolyTriangle.tag_name))
+
+        self.triangle_chunks.append(values.astype(np.uint32).view(POLY_TRIANGLE_DTYPE).reshape(-1))
+
+    def _flush_triangles(self):
+        if self.triangle_values:
+            self._flush_chunk()
+        if not self.triangle_chunks:
+            return
+
+        self.polygons.append(PolyTriangleArray(np.concatenate(self.triangle_chunks)))
+        self.triangle_chunks = []
+
+
+class PolygonsReader(StreamReader):
+    """Streaming equivalent of ``Polygons.from_xml``, each polygon element is discarded once read."""
+
+    def __init__(self):
+        self.builder = PolygonsBuilder()
+        self.leaf_reader = SubtreeReader(lambda element: None)
+
+    def read_child(self, child: ET.Element):
+        return self.leaf_reader
+
+    def add_child(self, child: ET.Element, value):
+        self.builder.add(child)
+
+    def finish(self, element: ET.Element):
+        new = Polygons()
+        new.value = self.builder.finish()
+        return new
+
+
 class PolySphere(Polygon):
     tag_name = "Sphere"
 
@@ -494,6 +627,35 @@ class PolyCylinder(Polygon):
         self.radius = AttributeProperty("radius", 0)
 
 
+POLYGON_TYPES_BY_TAG = {
+    "Box": PolyBox,
+    "Sphere": PolySphere,
+    "Capsule": PolyCapsule,
+    "Cylinder": PolyCylinder,
+}
+
+
+# RDR polygon lines other than triangles: type name followed by the material index, vertex indices and
+# radius (except boxes)
+RDR_PRIMITIVE_LINE_RE = re.compile(r"(Box|Sph|Cap|Cyl)([^\n]*)")
+RDR_PRIMITIVE_NUM_VALUES = {"Box": 5, "Sph": 3, "Cap": 4, "Cyl": 4}
+
+
+def get_rdr_primitive(poly_type: str, text: str) -> Optional[list]:
+    """Parse the values of a ``Box``, ``Sph``, ``Cap`` or ``Cyl`` line. Returns None if they are invalid."""
+    items = text.split()
+    if len(items) != RDR_PRIMITIVE_NUM_VALUES[poly_type]:
+        return None
+
+    try:
+        poly = [poly_type, *(int(item) for item in items[:-1])]
+        poly.append(int(items[-1]) if poly_type == "Box" else float(items[-1]))
+    except ValueError:
+        return None
+
+    return poly
+
+
 class PolygonListProperty(ElementProperty):
     value_types = (list)
 
@@ -503,31 +665,59 @@ class PolygonListProperty(ElementProperty):
     @staticmethod
     def from_xml(element: ET.Element):
         new = PolygonListProperty(element.tag, [])
-        text = element.text.strip().split("\n")
-        if len(text) > 0:
-            for line in text:
-                line = line.strip().split(" ")
-                if len(line) > 0:
-                    poly = [line[0]]
-                    for item in line[1:]:
-                        if (poly[0] == 'Cyl' and len(poly) == 4) or \
-                          (poly[0] == 'Sph' and len(poly) == 3) or \
-                          (poly[0] == 'Cap' and len(poly) == 4) or \
-                          (poly[0] == "Cyl" and len(poly) == 4):
-                            poly.append(float(item))
-                        else:
-                            poly.append(int(item))
-                    new.value.append(poly)
+        text = element.text or ""
+
+        # The other polygons split the text into runs of triangles, all the triangles are parsed at once
+        matches = list(RDR_PRIMITIVE_LINE_RE.finditer(text))
+        triangle_texts = [text[start:end] for start, end in zip(
+            [0, *(match.end() for match in matches)], [*(match.start() for match in matches), len(text)])]
+
+        try:
+            # Type names are replaced with -1 to check that every line has the type name followed by 4 indices
+            values = np_str_to_values("\n".join(triangle_texts).replace("Tri", "-1"), np.int64)
+        except ValueError:
+            return PolygonListProperty.read_value_error(element)
+        if len(values) % 5 != 0:
+            return PolygonListProperty.read_value_error(element)
+        values = values.reshape((-1, 5))
+        if np.any(values[:, 0] != -1) or np.any(values[:, 1:] < 0):
+            return PolygonListProperty.read_value_error(element)
+
+        triangles = np.zeros(len(values), dtype=POLY_TRIANGLE_DTYPE)
+        for i, name in enumerate(("m", "v1", "v2", "v3")):
+            triangles[name] = values[:, i + 1]
+
+        num_triangles_read = 0
+        for i, triangle_text in enumerate(triangle_texts):
+            num_triangles = triangle_text.count("Tri")
+            if num_triangles > 0:
+                new.value.append(PolyTriangleArray(triangles[num_triangles_read:num_triangles_read + num_triangles]))
+                num_triangles_read += num_triangles
+
+            if i < len(matches):
+                poly = get_rdr_primitive(*matches[i].groups())
+                if poly is None:
+                    return PolygonListProperty.read_value_error(element)
+                new.value.append(poly)
+
         return new
-    
+
     def to_xml(self):
         element = ET.Element(self.tag_name)
-        element.text = "\n"
 
         if len(self.value) == 0:
             return None
 
-        for poly in self.value:
-            element.text += (poly + "\n")
+        element.text = ChunkedText(self._polygons_to_str_chunks)
 
         return element
+
+    def _polygons_to_str_chunks(self) -> Iterator[str]:
+        for poly in self.value:
+            if isinstance(poly, PolyTriangleArray):
+                yield from poly.to_str_chunks(PolyTriangleArray.RDR_FMT)
+            elif isinstance(poly, list):
+                # Polygon read by from_xml
+                yield " ".join(str(value) for value in poly)
+            else:
+                yield poly
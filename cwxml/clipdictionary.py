@@ -1,7 +1,6 @@
 # from .element import *
 from abc import ABC as AbstractClass, abstractmethod
 from enum import Enum
-from mathutils import Vector
 from .element import (
     ElementTree,
     ElementProperty,
@@ -14,7 +13,8 @@ from .element import (
 )
 from xml.etree import ElementTree as ET
 from inspect import isclass
-from math import sqrt
+import numpy as np
+from numpy.typing import NDArray
 
 
 class YCD:
@@ -208,7 +208,9 @@ class ChannelsList(ItemTypeList):
             super().__init__()
             self.type = ValueProperty("Type", "")
 
-        def get_value(self, frame_id, channel_values):
+        def get_values(self, frame_ids: NDArray[np.int64], channel_values: list[NDArray]) -> NDArray:
+            """Get the values of this channel at each frame of ``frame_ids``. ``channel_values`` are the values of
+            the previous channels of the sequence data."""
             raise NotImplementedError
 
     class StaticQuaternion(Channel):
@@ -219,8 +221,9 @@ class ChannelsList(ItemTypeList):
             self.value = QuaternionProperty("Value")
             self.type = "StaticQuaternion"
 
-        def get_value(self, frame_id, channel_values):
-            return self.value
+        def get_values(self, frame_ids, channel_values):
+            # (N, 4) array of W, X, Y, Z
+            return np.tile(np.array(self.value, dtype=np.float64), (len(frame_ids), 1))
 
     class StaticVector3(Channel):
         type = "StaticVector3"
@@ -230,8 +233,8 @@ class ChannelsList(ItemTypeList):
             self.value = VectorProperty("Value")
             self.type = "StaticVector3"
 
-        def get_value(self, frame_id, channel_values):
-            return self.value
+        def get_values(self, frame_ids, channel_values):
+            return np.tile(np.array(self.value, dtype=np.float64), (len(frame_ids), 1))
 
     class StaticFloat(Channel):
         type = "StaticFloat"
@@ -241,8 +244,8 @@ class ChannelsList(ItemTypeList):
             self.value = ValueProperty("Value", 0.0)
             self.type = "StaticFloat"
 
-        def get_value(self, frame_id, channel_values):
-            return self.value
+        def get_values(self, frame_ids, channel_values):
+            return np.full(len(frame_ids), self.value, dtype=np.float64)
 
     class RawFloat(Channel):
         type = "RawFloat"
@@ -252,8 +255,8 @@ class ChannelsList(ItemTypeList):
             self.values = ValuesBuffer()
             self.type = "RawFloat"
 
-        def get_value(self, frame_id, channel_values):
-            return self.values[frame_id % len(self.values)]
+        def get_values(self, frame_ids, channel_values):
+            return np.asarray(self.values, dtype=np.float64)[frame_ids % len(self.values)]
 
     class QuantizeFloat(Channel):
         type = "QuantizeFloat"
@@ -265,8 +268,8 @@ class ChannelsList(ItemTypeList):
             self.values = ValuesBuffer()
             self.type = "QuantizeFloat"
 
-        def get_value(self, frame_id, channel_values):
-            return self.values[frame_id % len(self.values)]
+        def get_values(self, frame_ids, channel_values):
+            return np.asarray(self.values, dtype=np.float64)[frame_ids % len(self.values)]
 
     class IndirectQuantizeFloat(QuantizeFloat):
         type = "IndirectQuantizeFloat"
@@ -276,8 +279,9 @@ class ChannelsList(ItemTypeList):
             self.frames = FramesBuffer()
             self.type = "IndirectQuantizeFloat"
 
-        def get_value(self, frame_id, channel_values):
-            return self.values[(self.frames[frame_id % len(self.frames)]) % len(self.values)]
+        def get_values(self, frame_ids, channel_values):
+            frames = np.asarray(self.frames, dtype=np.int64)[frame_ids % len(self.frames)]
+            return np.asarray(self.values, dtype=np.float64)[frames % len(self.values)]
 
     class LinearFloat(QuantizeFloat):
         type = "LinearFloat"
@@ -296,11 +300,13 @@ class ChannelsList(ItemTypeList):
             self.quat_index = ValueProperty("QuatIndex", 0)
             self.type = "CachedQuaternion1"
 
-        def get_value(self, frame_id, channel_values):
-            vec_len = Vector(
-                (channel_values[0], channel_values[1], channel_values[2])).length
+        def get_values(self, frame_ids, channel_values):
+            # Length of the other 3 components as single precision vectors, same as mathutils.Vector
+            components = np.column_stack(channel_values[:3]).astype(np.float32)
+            squared = (components * components).astype(np.float64)
+            vec_len = np.sqrt(squared[:, 0] + squared[:, 1] + squared[:, 2])
 
-            return sqrt(max(1.0 - vec_len * vec_len, 0))
+            return np.sqrt(np.maximum(1.0 - vec_len * vec_len, 0))
 
     class CachedQuaternion2(CachedQuaternion1):
         type = "CachedQuaternion2"
@@ -1,11 +1,12 @@
-import io
 import os
 from ..sollumz_properties import SollumzGame
 from mathutils import Matrix
 import numpy as np
 from numpy.typing import NDArray
-from ..tools.utils import np_arr_to_str
+from ..tools.utils import np_arr_to_str, np_arr_to_str_chunks, np_struct_arr_to_str_chunks, np_str_to_struct_arr
+from ..tools.importworker import PREDECODED_ATTR
 from typing import Optional
+from contextlib import contextmanager
 from abc import ABC as AbstractClass, abstractmethod
 from xml.etree import ElementTree as ET
 from .element import (
@@ -21,7 +22,13 @@ from .element import (
     ValueProperty,
     VectorProperty,
     Vector4Property,
-    MatrixProperty
+    MatrixProperty,
+    ChildrenReader,
+    ChunkedText,
+    ElementTreeReader,
+    ListReader,
+    SubtreeReader,
+    load_document
 )
 from .bound import (
     BoundBox,
@@ -46,22 +53,46 @@ from .drawable_RDR import BoneMappingProperty, VertexLayout, VerticesProperty, I
 
 current_game = SollumzGame.GTA
 
+# Vertex and index buffers decoded by the import worker processes, see ``tools.importworker``
+_predecoded_buffers: Optional[list[NDArray]] = None
+
+
+@contextmanager
+def predecoded_buffers(buffers: list[NDArray]):
+    """Use the buffers decoded by an import worker while parsing the XML it returned."""
+    global _predecoded_buffers
+    _predecoded_buffers = buffers
+    try:
+        yield
+    finally:
+        _predecoded_buffers = None
+
+
+def get_predecoded_buffer(data_elem: ET.Element) -> Optional[NDArray]:
+    """Get the buffer decoded from the text of ``data_elem`` by an import worker, or ``None`` if it wasn't."""
+    index = data_elem.get(PREDECODED_ATTR)
+    if index is None or _predecoded_buffers is None:
+        return None
+
+    return _predecoded_buffers[int(index)]
+
+
 class YDD:
 
     file_extension = ".ydd.xml"
 
     @staticmethod
     def from_xml_file(filepath):
-        global current_game
-        tree = ET.parse(filepath)
-        gameTag = tree.getroot().tag
-        if "RDR2" in gameTag:
-            current_game = SollumzGame.RDR
-            return RDR2DrawableDictionary.from_xml_file(filepath)
-        else:
-            current_game = SollumzGame.GTA
-            return DrawableDictionary.from_xml_file(filepath)
-        
+        def get_reader(root: ET.Element):
+            global current_game
+            if "RDR2" in root.tag:
+                current_game = SollumzGame.RDR
+                return RDR2DrawableDictionary.stream_reader(root)
+            else:
+                current_game = SollumzGame.GTA
+                return DrawableDictionary.stream_reader(root)
+
+        return load_document(filepath, get_reader)
 
     @staticmethod
     def write_xml(drawable_dict, filepath):
@@ -74,14 +105,15 @@ class YDR:
 
     @staticmethod
     def from_xml_file(filepath):
-        global current_game
-        tree = ET.parse(filepath)
-        gameTag = tree.getroot().tag
-        if "RDR2" in gameTag:
-            current_game = SollumzGame.RDR
-        else:
-            current_game = SollumzGame.GTA
-        return Drawable(gameTag).from_xml_file(filepath)
+        def get_reader(root: ET.Element):
+            global current_game
+            if "RDR2" in root.tag:
+                current_game = SollumzGame.RDR
+            else:
+                current_game = SollumzGame.GTA
+            return Drawable.stream_reader(root)
+
+        return load_document(filepath, get_reader)
 
     @staticmethod
     def write_xml(drawable, filepath):
@@ -684,7 +716,15 @@ class VertexBuffer(ElementTree):
         if data_elem is None and data2_elem is not None:
             data_elem = data2_elem
 
-        if data_elem is None or not data_elem.text:
+        if data_elem is None:
+            return new
+
+        data = get_predecoded_buffer(data_elem)
+        if data is not None:
+            new.data = data
+            return new
+
+        if not data_elem.text:
             return new
 
         new._load_data_from_str(data_elem.text)
@@ -699,7 +739,10 @@ class VertexBuffer(ElementTree):
             return element
 
         data_elem = ET.Element("Data")
-        data_elem.text = self._data_to_str()
+        if len(self.data) > 1:
+            data_elem.text = ChunkedText(self._data_to_str_chunks)
+        else:
+            data_elem.text = self._data_to_str()
 
         element.append(data_elem)
 
@@ -709,9 +752,12 @@ class VertexBuffer(ElementTree):
         struct_dtype = np.dtype([self.VERT_ATTR_DTYPES[attr_name]
                                  for attr_name in self.layout])
 
-        self.data = np.loadtxt(io.StringIO(_str), dtype=struct_dtype)
+        self.data = np_str_to_struct_arr(_str, struct_dtype)
 
     def _data_to_str(self):
+        return "\n".join(self._data_to_str_chunks())
+
+    def _data_to_str_chunks(self):
         vert_arr = self.data
 
         FLOAT_FMT = "%.7f"
@@ -728,10 +774,8 @@ class VertexBuffer(ElementTree):
             formats.append(" ".join([attr_fmt] * column.shape[1]))
 
         fmt = ATTR_SEP.join(formats)
-        vert_arr_2d = np.column_stack(
-            [vert_arr[name] for name in vert_arr.dtype.names])
 
-        return np_arr_to_str(vert_arr_2d, fmt)
+        return np_struct_arr_to_str_chunks(vert_arr, fmt)
 
 
 class IndexBuffer(ElementTree):
@@ -747,7 +791,11 @@ class IndexBuffer(ElementTree):
 
         data_elem = element.find("Data")
 
-        if data_elem is None or not data_elem.text:
+        if data_elem is None:
+            return new
+
+        new.data = get_predecoded_buffer(data_elem)
+        if new.data is not None or not data_elem.text:
             return new
 
         new.data = np.fromstring(data_elem.text, sep=" ", dtype=np.uint32)
@@ -760,7 +808,10 @@ class IndexBuffer(ElementTree):
             return element
 
         data_elem = ET.Element("Data")
-        data_elem.text = self._inds_to_str()
+        if len(self.data) > 0:
+            data_elem.text = ChunkedText(self._inds_to_str_chunks)
+        else:
+            data_elem.text = self._inds_to_str()
 
         element.append(data_elem)
 
@@ -785,6 +836,21 @@ class IndexBuffer(ElementTree):
 
         return f"{index_buffer_str}\n{last_row_str}"
 
+    def _inds_to_str_chunks(self):
+        """Same lines as ``_inds_to_str``, in chunks"""
+        indices_arr = self.data
+
+        num_inds = len(indices_arr)
+        num_divisble_inds = num_inds - (num_inds % 24)
+        num_rows = int(num_divisble_inds / 24)
+
+        indices_arr_2d = indices_arr[:num_divisble_inds].reshape(
+            (num_rows, 24))
+
+        yield from np_arr_to_str_chunks(indices_arr_2d, fmt="%.0u")
+        if num_divisble_inds < num_inds:
+            yield np_arr_to_str(indices_arr[num_divisble_inds:], fmt="%.0u")
+
 
 class Geometry(ElementTree):
     tag_name = "Item"
@@ -921,57 +987,60 @@ class Drawable(ElementTree, AbstractClass):
     @classmethod
     def from_xml(cls, element: ET.Element):
         new = super().from_xml(element)
-        bounds = element.findall("Bounds")
+        for child in element.findall("Bounds"):
+            bound = cls.bound_from_xml(child)
+            if bound:
+                new.bounds.append(bound)
+
+        return new
+
+    @classmethod
+    def stream_reader(cls, element: ET.Element):
+        return DrawableReader(cls)
+
+    @staticmethod
+    def bound_from_xml(child: ET.Element):
+        bound_type = child.get("type")
+        bound = None
         if current_game == SollumzGame.GTA:
-            for child in bounds:
-                bound_type = child.get("type")
-                bound = None
-                if bound_type == "Composite":
-                    bound = BoundComposite.from_xml(child)
-                elif bound_type == "Box":
-                    bound = BoundBox.from_xml(child)
-                elif bound_type == "Sphere":
-                    bound = BoundSphere.from_xml(child)
-                elif bound_type == "Capsule":
-                    bound = BoundCapsule.from_xml(child)
-                elif bound_type == "Cylinder":
-                    bound = BoundCylinder.from_xml(child)
-                elif bound_type == "Disc":
-                    bound = BoundDisc.from_xml(child)
-                elif bound_type == "Cloth":
-                    bound = BoundCloth.from_xml(child)
-                elif bound_type == "Geometry":
-                    bound = BoundGeometry.from_xml(child)
-                elif bound_type == "GeometryBVH":
-                    bound = BoundGeometryBVH.from_xml(child)
-                    
-                if bound:
-                    bound.tag_name = "Bounds"
-                    new.bounds.append(bound)
+            if bound_type == "Composite":
+                bound = BoundComposite.from_xml(child)
+            elif bound_type == "Box":
+                bound = BoundBox.from_xml(child)
+            elif bound_type == "Sphere":
+                bound = BoundSphere.from_xml(child)
+            elif bound_type == "Capsule":
+                bound = BoundCapsule.from_xml(child)
+            elif bound_type == "Cylinder":
+                bound = BoundCylinder.from_xml(child)
+            elif bound_type == "Disc":
+                bound = BoundDisc.from_xml(child)
+            elif bound_type == "Cloth":
+                bound = BoundCloth.from_xml(child)
+            elif bound_type == "Geometry":
+                bound = BoundGeometry.from_xml(child)
+            elif bound_type == "GeometryBVH":
+                bound = BoundGeometryBVH.from_xml(child)
 
         elif current_game == SollumzGame.RDR:
-            for child in bounds:
-                bound_type = child.get("type")
-                bound = None
-                if bound_type == "Composite":
-                    bound = RDRBoundFile.from_xml(child)
-                elif bound_type == "Box":
-                    bound = RDRBoundBox.from_xml(child)
-                elif bound_type == "Sphere":
-                    bound = RDRBoundSphere.from_xml(child)
-                elif bound_type == "Capsule":
-                    bound = RDRBoundCapsule.from_xml(child)
-                elif bound_type == "Cylinder":
-                    bound = RDRBoundCylinder.from_xml(child)
-                elif bound_type == "Disc":
-                    bound = RDRBoundDisc.from_xml(child)
-                else:
-                    raise Exception("Unable to create RDR bound since its not composite and hence unimplemented")
-                if bound:
-                    bound.tag_name = "Bounds"
-                    new.bounds.append(bound)
-       
-        return new
+            if bound_type == "Composite":
+                bound = RDRBoundFile.from_xml(child)
+            elif bound_type == "Box":
+                bound = RDRBoundBox.from_xml(child)
+            elif bound_type == "Sphere":
+                bound = RDRBoundSphere.from_xml(child)
+            elif bound_type == "Capsule":
+                bound = RDRBoundCapsule.from_xml(child)
+            elif bound_type == "Cylinder":
+                bound = RDRBoundCylinder.from_xml(child)
+            elif bound_type == "Disc":
+                bound = RDRBoundDisc.from_xml(child)
+            else:
+                raise Exception("Unable to create RDR bound since its not composite and hence unimplemented")
+
+        if bound:
+            bound.tag_name = "Bounds"
+        return bound
 
     def to_xml(self):
         element = super().to_xml()
@@ -981,6 +1050,24 @@ class Drawable(ElementTree, AbstractClass):
         return element
 
 
+class DrawableReader(ElementTreeReader):
+    """Streams a drawable like any ``ElementTree`` and builds each ``<Bounds />`` child as it is read."""
+
+    def read_child(self, child: ET.Element):
+        if child.tag == "Bounds":
+            return SubtreeReader(Drawable.bound_from_xml)
+
+        return super().read_child(child)
+
+    def add_child(self, child: ET.Element, value):
+        if child.tag == "Bounds":
+            if value:
+                self.new.bounds.append(value)
+            return
+
+        super().add_child(child, value)
+
+
 class RDR2DrawableDictionary(ElementTree, AbstractClass):
     tag_name = "RDR2DrawableDictionary"
 
@@ -1002,6 +1089,17 @@ class RDR2DrawableDictionary(ElementTree, AbstractClass):
                 drawable.tag_name = "Drawable"
                 new.drawables.append(drawable)
         return new
+
+    @classmethod
+    def stream_reader(cls, element: ET.Element):
+        # Only the attributes are available at this point
+        new = super().from_xml(element)
+
+        def add_drawable(drawable: Drawable):
+            drawable.tag_name = "Drawable"
+            new.drawables.append(drawable)
+
+        return ChildrenReader(new, {"Drawables": lambda child: ListReader(new, Drawable, "Item", add_drawable)})
     
     def to_xml(self):
         element = ET.Element(self.tag_name)
@@ -1060,6 +1158,12 @@ class DrawableDictionary(MutableSequence, Element):
 
         return new
 
+    @classmethod
+    def stream_reader(cls, element: ET.Element):
+        new = cls()
+        new.tag_name = "Item"
+        return ListReader(new, Drawable, new.tag_name, new.append)
+
     def to_xml(self):
         element = ET.Element(self.tag_name)
         for drawable in self._value:
@@ -1,16 +1,16 @@
-import io
 import os
 from xml.etree.ElementTree import Element
 from ..cwxml.element import Element
 from mathutils import Matrix
 import numpy as np
 from numpy.typing import NDArray
-from ..tools.utils import np_arr_to_str
+from ..tools.utils import np_arr_to_str, np_arr_to_str_chunks, np_struct_arr_to_str_chunks, np_str_to_struct_arr
 from typing import Optional
 from abc import ABC as AbstractClass, abstractmethod
 from xml.etree import ElementTree as ET
 from .element import (
     AttributeProperty,
+    ChunkedText,
     FlagsProperty,
     Element,
     ColorProperty,
@@ -145,7 +145,7 @@ class VerticesProperty(ElementProperty):
     
     def _load_data_from_str(self, _str: str):
         struct_dtype = np.dtype(self._create_dtype())
-        a = np.loadtxt(io.StringIO(_str), dtype=struct_dtype)
+        a = np_str_to_struct_arr(_str, struct_dtype)
         return a
 
     def _create_dtype(self):
@@ -183,10 +183,16 @@ class VerticesProperty(ElementProperty):
         if hasattr(self, "value") and self.value is None:
             return None
         # element.text = ", ".join([str(id) for id in self.value])
-        element.text = self._data_to_str()
+        if len(self.value) > 1:
+            element.text = ChunkedText(self._data_to_str_chunks)
+        else:
+            element.text = self._data_to_str()
         return element
     
     def _data_to_str(self):
+        return "\n".join(self._data_to_str_chunks())
+
+    def _data_to_str_chunks(self):
         vert_arr = self.value
 
         FLOAT_FMT = "%.7f"
@@ -203,10 +209,8 @@ class VerticesProperty(ElementProperty):
             formats.append(" ".join([attr_fmt] * column.shape[1]))
 
         fmt = ATTR_SEP.join(formats)
-        vert_arr_2d = np.column_stack(
-            [vert_arr[name] for name in vert_arr.dtype.names])
 
-        return np_arr_to_str(vert_arr_2d, fmt)
+        return np_struct_arr_to_str_chunks(vert_arr, fmt)
     
     def _write_semantic_layout(self):
         vert_arr = self.value
@@ -251,6 +255,21 @@ class IndicesProperty(ElementProperty):
 
         return f"{index_buffer_str}\n{last_row_str}"
 
+    def _inds_to_str_chunks(self):
+        """Same lines as ``_inds_to_str``, in chunks"""
+        indices_arr = self.value
+
+        num_inds = len(indices_arr)
+        num_divisble_inds = num_inds - (num_inds % 24)
+        num_rows = int(num_divisble_inds / 24)
+
+        indices_arr_2d = indices_arr[:num_divisble_inds].reshape(
+            (num_rows, 24))
+
+        yield from np_arr_to_str_chunks(indices_arr_2d, fmt="%.0u")
+        if num_divisble_inds < num_inds:
+            yield np_arr_to_str(indices_arr[num_divisble_inds:], fmt="%.0u")
+
     def to_xml(self):
         if len(self.value) < 1:
             return None
@@ -258,7 +277,7 @@ class IndicesProperty(ElementProperty):
         element = ET.Element(self.tag_name)
 
         if len(self.value) > 0:
-            element.text = self._inds_to_str()
+            element.text = ChunkedText(self._inds_to_str_chunks)
         return element
 
 
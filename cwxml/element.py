@@ -2,43 +2,296 @@
 from mathutils import Vector, Quaternion, Matrix
 from abc import abstractmethod, ABC as AbstractClass, abstractclassmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Iterable, Optional
 from xml.etree import ElementTree as ET
 from numpy import float32
 
 
-def remove_elements_with_no_attributes(elem):
-    for child in list(elem):
-        remove_elements_with_no_attributes(child)
-        
-        if child.text or len(child.attrib) > 0:
+class ChunkedText:
+    """Multi-line element text produced in chunks of lines. Used for large numeric buffers so ``Element.write_xml``
+    can write the text straight to the file instead of building it as a single string. Only supported by
+    ``write_indented_xml``, not by the ``ET`` serialization functions."""
+
+    def __init__(self, get_chunks: Callable[[], Iterable[str]]):
+        self.get_chunks = get_chunks
+
+    def write(self, write: Callable[[str], Any], level: int):
+        line_indent = "\n" + (level + 1) * INDENT
+        for chunk in self.get_chunks():
+            if chunk:
+                write(line_indent)
+                write(chunk.replace("\n", line_indent))
+        write("\n" + level * INDENT)
+
+
+class ChunkedElements(ChunkedText):
+    """Child elements already serialized as XML, one element per line, produced in chunks. Used to write long
+    lists of small elements, like bound polygons, without creating an ``ET.Element`` for each of them. Written
+    the same way as ``ChunkedText``, one level deeper than the parent element."""
+
+
+INDENT = "  "
+
+
+def escape_text(text: str) -> str:
+    """Escape element text the same way ``ET`` does"""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escape_attrib(value: str) -> str:
+    """Escape attribute value the same way ``ET`` does"""
+    value = escape_text(value)
+    if "\"" in value:
+        value = value.replace("\"", "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+def is_empty_element(elem: ET.Element) -> bool:
+    """Empty elements (no text, attributes or children) are left out of written files"""
+    return not elem.text and not elem.attrib and not len(elem)
+
+
+def write_indented_xml(write: Callable[[str], Any], root: ET.Element):
+    """Write ``root`` as indented XML in a single pass, leaving out empty child elements. Multi-line text
+    is indented one level deeper than its element, like vertex buffers."""
+    # Frames of (element, iterator over its children, level, whether the start tag has been closed)
+    stack = [[root, iter(root), 0, False]]
+    write_start_tag(write, root)
+
+    while stack:
+        frame = stack[-1]
+        elem, children, level, opened = frame
+
+        child = next(children, None)
+        if child is not None:
+            if is_empty_element(child):
+                continue
+
+            if not opened:
+                text = elem.text
+                write(">")
+                if text and text.strip():
+                    write(escape_text(text))
+                else:
+                    write("\n" + (level + 1) * INDENT)
+                frame[3] = True
+            else:
+                write("\n" + (level + 1) * INDENT)
+
+            write_start_tag(write, child)
+            if len(child):
+                stack.append([child, iter(child), level + 1, False])
+            else:
+                write_leaf_end(write, child, level + 1)
             continue
-        elem.remove(child)
-
-
-def indent(elem: ET.Element, level=0):
-    """Custom indentation to get elements like <VerticesProperty /> to output nicely"""
-    amount = "  "
-    i = "\n" + level * amount
-    if len(elem):
-        if not elem.text or not elem.text.strip():
-            elem.text = i + amount
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = i
-        for elem in elem:
-            indent(elem, level + 1)
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = i
-    else:
-        if level and (not elem.tail or not elem.tail.strip()):
-            elem.tail = i
 
+        stack.pop()
+        if opened:
+            write("\n" + level * INDENT + "</" + elem.tag + ">")
+        else:
+            write_leaf_end(write, elem, level)
+
+    if len(root):
+        write("\n")
+
+
+def write_start_tag(write: Callable[[str], Any], elem: ET.Element):
+    """Write start tag of ``elem`` without the closing bracket"""
+    write("<" + elem.tag)
+    for name, value in elem.attrib.items():
+        write(" " + name + "=\"" + escape_attrib(value) + "\"")
+
+
+def write_leaf_end(write: Callable[[str], Any], elem: ET.Element, level: int):
+    """Write text and end tag of an element with no written children"""
+    text = elem.text
+
+    if isinstance(text, ChunkedText):
+        write(">")
+        text.write(write, level)
+    elif text:
         # Indent innertext of elements on new lines. Used in cases like <VerticesProperty />
-        if elem.text and len(elem.text.strip()) > 0 and elem.text.find("\n") != -1:
-            lines = elem.text.strip().split("\n")
-            for index, line in enumerate(lines):
-                lines[index] = ((level + 1) * amount) + line
-            elem.text = "\n" + "\n".join(lines) + i
+        if text.find("\n") != -1 and text.strip():
+            line_indent = "\n" + (level + 1) * INDENT
+            text = line_indent + text.strip().replace("\n", line_indent) + "\n" + level * INDENT
+        write(">" + escape_text(text))
+    else:
+        write(" />")
+        return
+
+    write("</" + elem.tag + ">")
+
+
+class StreamReader:
+    """Builds an Element incrementally while ``load_document`` streams through a file. A reader is created
+    when the start tag of its element is read, so only the tag and attributes are available at that point."""
+
+    def read_child(self, child: ET.Element) -> Optional["StreamReader"]:
+        """Get the reader for a direct child element. Returning ``None`` keeps the child in the DOM until
+        ``finish`` is called on this element."""
+        return None
+
+    def add_child(self, child: ET.Element, value):
+        """Called with the value built by the child reader once the child element has been fully read."""
+        pass
+
+    def finish(self, element: ET.Element):
+        """Called when the end tag is read. Children that had their own reader have already been removed
+        from ``element``."""
+        raise NotImplementedError
+
+
+class SubtreeReader(StreamReader):
+    """Keeps the whole subtree in memory and builds it with a regular ``from_xml`` once it is complete."""
+
+    def __init__(self, build: Callable[[ET.Element], Any]):
+        self.build = build
+
+    def finish(self, element: ET.Element):
+        return self.build(element)
+
+
+class SkipReader(StreamReader):
+    """Discards an element that is not used by its parent. ``add_child`` is not called for skipped elements."""
+
+    def read_child(self, child: ET.Element):
+        return self
+
+    def finish(self, element: ET.Element):
+        return None
+
+
+class ListReader(StreamReader):
+    """Builds each ``item_tag`` child with ``item_cls`` as soon as it is read and passes it to ``add``."""
+
+    def __init__(self, result, item_cls: type, item_tag: str, add: Callable[[Any], None]):
+        self.result = result
+        self.item_cls = item_cls
+        self.item_tag = item_tag
+        self.add = add
+
+    def read_child(self, child: ET.Element):
+        if child.tag != self.item_tag:
+            return SkipReader()
+
+        return self.item_cls.stream_reader(child)
+
+    def add_child(self, child: ET.Element, value):
+        self.add(value)
+
+    def finish(self, element: ET.Element):
+        return self.result
+
+
+class ChildrenReader(StreamReader):
+    """Reads children whose tag is in ``readers`` with the reader returned by the matching factory and
+    discards the others. Used by elements with custom ``from_xml`` that can still be streamed."""
+
+    def __init__(self, result, readers: dict[str, Callable[[ET.Element], StreamReader]]):
+        self.result = result
+        self.readers = readers
+
+    def read_child(self, child: ET.Element):
+        get_reader = self.readers.get(child.tag)
+        if get_reader is None:
+            return SkipReader()
+
+        return get_reader(child)
+
+    def finish(self, element: ET.Element):
+        return self.result
+
+
+class ElementTreeReader(StreamReader):
+    """Streaming equivalent of ``ElementTree.from_xml``."""
+
+    def __init__(self, cls: type):
+        self.new = cls()
+        self.props_by_tag: dict[str, list[tuple[str, Element]]] = {}
+        for prop_name, obj_element in vars(self.new).items():
+            if get_type_flags(type(obj_element)) & IS_ELEMENT:
+                self.props_by_tag.setdefault(obj_element.tag_name, []).append((prop_name, obj_element))
+
+    def read_child(self, child: ET.Element):
+        # Like ``element.find``, only the first child with a matching tag is used
+        props = self.props_by_tag.pop(child.tag, None)
+        if props is None:
+            return SkipReader()
+
+        self.current_props = props
+        if len(props) == 1:
+            return type(props[0][1]).stream_reader(child)
+
+        return SubtreeReader(lambda element: [type(obj_element).from_xml(element) for _, obj_element in props])
+
+    def add_child(self, child: ET.Element, value):
+        props = self.current_props
+        values = value if len(props) > 1 else [value]
+        for (prop_name, _), prop_value in zip(props, values):
+            setattr(self.new, prop_name, prop_value)
+
+    def finish(self, element: ET.Element):
+        if self.new.tag_name == element.tag:
+            for obj_element in vars(self.new).values():
+                if get_type_flags(type(obj_element)) & IS_ATTRIBUTE_PROPERTY and obj_element.name in element.attrib:
+                    obj_element.value = element.get(obj_element.name)
+
+        return self.new
+
+
+def load_document(filepath, get_reader: Callable[[ET.Element], StreamReader]):
+    """Read the XML file at ``filepath`` in a single streaming pass. ``get_reader`` is called with the root
+    element as soon as its start tag is read, so file classes (YDR, YFT, YBN...) can detect the game from
+    the root tag before any object is created.
+
+    Child elements are built as soon as their end tag is read and then removed from the DOM, so peak memory
+    scales with the largest element that has to be kept whole (see ``SubtreeReader``) instead of the whole file."""
+    # Stack of (element, reader). reader is None for elements kept in the DOM of an enclosing SubtreeReader
+    stack: list[tuple[ET.Element, Optional[StreamReader]]] = []
+    result = None
+
+    for event, elem in ET.iterparse(filepath, events=("start", "end")):
+        if event == "start":
+            if not stack:
+                reader = get_reader(elem)
+            else:
+                parent_reader = stack[-1][1]
+                reader = parent_reader.read_child(elem) if parent_reader is not None else None
+            stack.append((elem, reader))
+            continue
+
+        elem, reader = stack.pop()
+        if reader is None:
+            continue
+
+        value = reader.finish(elem)
+        if not stack:
+            # Root element, last event of the document
+            result = value
+            continue
+
+        parent, parent_reader = stack[-1]
+        if not isinstance(reader, SkipReader):
+            parent_reader.add_child(elem, value)
+
+        # Free the consumed element. Later siblings may already be attached to the parent, since the parser reads
+        # the file in chunks, but earlier ones were already removed so this finds it right away
+        elem.clear()
+        parent.remove(elem)
+
+    return result
 
 
 def get_str_type(value: str):
@@ -87,17 +340,21 @@ class Element(AbstractClass):
     @classmethod
     def from_xml_file(cls, filepath):
         """Read XML from filepath"""
-        element_tree = ET.ElementTree()
-        element_tree.parse(filepath)
-        return cls.from_xml(element_tree.getroot())
+        return load_document(filepath, cls.stream_reader)
+
+    @classmethod
+    def stream_reader(cls, element: ET.Element) -> StreamReader:
+        """Get the reader used to build this element while streaming a file. By default the element is kept
+        whole and built with ``from_xml``, subclasses that can be built incrementally override this."""
+        return SubtreeReader(cls.from_xml)
 
     def write_xml(self, filepath):
         """Write object as XML to filepath"""
         element = self.to_xml()
-        indent(element)
-        elementTree = ET.ElementTree(element)
-        remove_elements_with_no_attributes(elementTree.getroot())
-        elementTree.write(filepath, encoding="UTF-8", xml_declaration=True)
+        with open(filepath, "w", encoding="UTF-8", errors="xmlcharrefreplace", buffering=1 << 20) as file:
+            # Same declaration ET writes with encoding="UTF-8"
+            file.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+            write_indented_xml(file.write, element)
 
 
 class ElementTree(Element):
@@ -108,63 +365,154 @@ class ElementTree(Element):
         """Convert ET.Element object to ElementTree"""
         new = cls()
 
+        # First child of each tag, same as element.find(tag) but without scanning the children for each property
+        children = {}
+        for child in element:
+            children.setdefault(child.tag, child)
+        read_attributes = new.tag_name == element.tag
+
         for prop_name, obj_element in vars(new).items():
-            if isinstance(obj_element, Element):
-                child = element.find(obj_element.tag_name)
-                if child is not None and obj_element.tag_name == child.tag:
+            flags = get_type_flags(type(obj_element))
+            if flags & IS_ELEMENT:
+                child = children.get(obj_element.tag_name)
+                if child is not None:
                     # Add element to object if tag is defined in class definition
                     setattr(new, prop_name, type(obj_element).from_xml(child))
-            elif isinstance(obj_element, AttributeProperty):
+            elif flags & IS_ATTRIBUTE_PROPERTY:
                 # Add attribute to element if attribute is defined in class definition
-                if obj_element.name in element.attrib and new.tag_name == element.tag:
+                if read_attributes and obj_element.name in element.attrib:
                     obj_element.value = element.get(obj_element.name)
 
         return new
 
+    @classmethod
+    def stream_reader(cls, element: ET.Element) -> StreamReader:
+        if getattr(cls.from_xml, "__func__", None) is not ElementTree.from_xml.__func__:
+            # Custom from_xml, needs the whole element
+            return super().stream_reader(element)
+
+        return ElementTreeReader(cls)
+
     def to_xml(self):
         """Convert ElementTree to ET.Element object"""
         root = ET.Element(self.tag_name)
         for child in vars(self).values():
-            if isinstance(child, Element):
+            flags = get_type_flags(type(child))
+            if flags & IS_ELEMENT:
                 element = child.to_xml()
                 if element is not None:
                     root.append(element)
-            elif isinstance(child, AttributeProperty):
+            elif flags & IS_ATTRIBUTE_PROPERTY:
                 root.set(child.name, str(child.value))
 
         return root
 
-    def __getattribute__(self, key: str, onlyValue: bool = True):
-        obj = None
-        # Try and see if key exists
-        try:
-            obj = object.__getattribute__(self, key)
-            if isinstance(obj, (ElementProperty, AttributeProperty)) and onlyValue:
-                # If the property is an ElementProperty or AttributeProperty, and onlyValue is true, return just the value of the Element property
-                return obj.value
-            else:
-                return obj
-        except AttributeError:
-            # Key doesn't exist, return None
-            return None
+    def __getattr__(self, key: str):
+        # Only called when the normal lookup fails. Key doesn't exist, return None
+        return None
 
     def __setattr__(self, name: str, value) -> None:
-        # Get the full object
-        obj = self.__getattribute__(name, False)
-        if obj is not None and isinstance(obj, (ElementProperty, AttributeProperty)) and not isinstance(value, (ElementProperty, AttributeProperty)):
-            # If the object is an ElementProperty or AttributeProperty, set it's value
-            obj.value = value
-            super().__setattr__(name, obj)
+        if get_type_flags(type(value)) & IS_PROPERTY:
+            cls = type(self)
+            if type(cls.__dict__.get(name)) is not PropertyField:
+                PropertyField.install(cls, name)
+            # Property objects always replace the current one
+            self.__dict__[name] = value
         else:
-            super().__setattr__(name, value)
+            object.__setattr__(self, name, value)
 
     def get_element(self, key):
-        obj = self.__getattribute__(key, False)
+        obj = vars(self).get(key)
 
         if isinstance(obj, ElementProperty):
             return obj
 
 
+_MISSING = object()
+
+
+class PropertyField:
+    """Class-level data descriptor for an ``ElementTree`` field holding an ``ElementProperty`` or
+    ``AttributeProperty``. The property object is stored in the instance ``__dict__``; reading the field returns
+    just its value and assigning a plain value sets the value of the property object.
+
+    Fields are defined in ``__init__`` (and often depend on the game), so descriptors are installed on the class
+    the first time a property object is assigned to a field. Other attributes use regular attribute access."""
+    __slots__ = ("name", "class_value")
+
+    def __init__(self, name: str, class_value=_MISSING):
+        self.name = name
+        # Class attribute shadowed by this descriptor, e.g. ``TextureShaderParameter.type``
+        self.class_value = class_value
+
+    @staticmethod
+    def install(cls: type, name: str):
+        class_value = _MISSING
+        for base in cls.__mro__:
+            if name in base.__dict__:
+                class_value = base.__dict__[name]
+                break
+
+        if isinstance(class_value, PropertyField):
+            class_value = class_value.class_value
+        elif isinstance(class_value, property):
+            # Let the property handle it
+            return
+
+        setattr(cls, name, PropertyField(name, class_value))
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            if self.class_value is _MISSING:
+                raise AttributeError(f"type object '{owner.__name__}' has no attribute '{self.name}'")
+            return self.class_value
+
+        obj = instance.__dict__.get(self.name, _MISSING)
+        if obj is _MISSING:
+            return None if self.class_value is _MISSING else self.class_value
+
+        if get_type_flags(type(obj)) & IS_PROPERTY:
+            return obj.value
+
+        return obj
+
+    def __set__(self, instance, value):
+        # Only called with values that are not property objects, see ElementTree.__setattr__
+        instance_dict = instance.__dict__
+        obj = instance_dict.get(self.name)
+        if get_type_flags(type(obj)) & IS_PROPERTY:
+            # If the object is an ElementProperty or AttributeProperty, set it's value
+            obj.value = value
+        else:
+            instance_dict[self.name] = value
+
+    def __delete__(self, instance):
+        del instance.__dict__[self.name]
+
+
+IS_ELEMENT = 1
+IS_PROPERTY = 2
+IS_ATTRIBUTE_PROPERTY = 4
+_type_flags: dict[type, int] = {}
+
+
+def get_type_flags(cls: type) -> int:
+    """Get whether ``cls`` is an ``Element``, ``ElementProperty`` or ``AttributeProperty`` as ``IS_*`` flags.
+    Cached per type, ``isinstance`` checks against the abstract ``Element`` classes are slow."""
+    flags = _type_flags.get(cls)
+    if flags is None:
+        flags = 0
+        if issubclass(cls, Element):
+            flags |= IS_ELEMENT
+        if issubclass(cls, ElementProperty):
+            flags |= IS_PROPERTY
+        if issubclass(cls, AttributeProperty):
+            flags |= IS_PROPERTY | IS_ATTRIBUTE_PROPERTY
+        _type_flags[cls] = flags
+
+    return flags
+
+
 @dataclass
 class AttributeProperty:
     name: str
@@ -224,6 +572,14 @@ class ListProperty(ElementProperty, AbstractClass):
             new.value.append(new.list_type.from_xml(child))
         return new
 
+    @classmethod
+    def stream_reader(cls, element: ET.Element) -> StreamReader:
+        if getattr(cls.from_xml, "__func__", None) is not ListProperty.from_xml.__func__:
+            return super().stream_reader(element)
+
+        new = cls(element.tag)
+        return ListReader(new, new.list_type, new.list_type.tag_name, new.value.append)
+
     def to_xml(self):
         element = ET.Element(self.tag_name)
 
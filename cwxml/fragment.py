@@ -12,7 +12,8 @@ from .element import (
     Vector4Property,
     TextProperty,
     ValueProperty,
-    VectorProperty
+    VectorProperty,
+    load_document
 )
 from .drawable import Drawable, Lights, VertexLayoutList
 from .bound import BoundComposite
@@ -26,15 +27,16 @@ class YFT:
 
     @staticmethod
     def from_xml_file(filepath):
-        global current_game
-        tree = ET.parse(filepath)
-        gameTag = tree.getroot().tag
-        if "RDR2" in gameTag:
-            current_game = SollumzGame.RDR
-            return RDRFragment.from_xml_file(filepath)
-        else:
-            current_game = SollumzGame.GTA
-            return Fragment.from_xml_file(filepath)
+        def get_reader(root: ET.Element):
+            global current_game
+            if "RDR2" in root.tag:
+                current_game = SollumzGame.RDR
+                return RDRFragment.stream_reader(root)
+            else:
+                current_game = SollumzGame.GTA
+                return Fragment.stream_reader(root)
+
+        return load_document(filepath, get_reader)
 
     @staticmethod
     def write_xml(fragment, filepath):
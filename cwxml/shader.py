@@ -426,21 +426,22 @@ class ShaderManager:
                 if filename is None:
                     continue
 
-                filename_hash = jenkhash.Generate(filename)
                 render_bucket = int(filename_elem.attrib["bucket"])
 
                 shader = ShaderDef.from_xml(node)
                 shader.filename = filename
                 shader.render_bucket = render_bucket
                 ShaderManager._shaders[filename] = shader
-                ShaderManager._shaders_by_hash[filename_hash] = shader
                 ShaderManager._shaders_base_names[shader] = base_name
+
+        filename_hashes = jenkhash.generate_many(list(ShaderManager._shaders.keys())).tolist()
+        for filename_hash, shader in zip(filename_hashes, ShaderManager._shaders.values()):
+            ShaderManager._shaders_by_hash[filename_hash] = shader
         
         current_game = SollumzGame.RDR
         for node in rdrtree.getroot():
             base_name = node.find("Name").text
 
-            filename_hash = jenkhash.Generate(base_name)
             render_bucket = node.find("DrawBucket").text.split(" ")
             if len(render_bucket) == 1:
                 render_bucket = int(render_bucket[0])
@@ -456,8 +457,11 @@ class ShaderManager:
             shader.render_bucket = render_bucket
             shader.buffer_size = buffer_size
             ShaderManager._rdr_shaders[base_name] = shader
-            ShaderManager._rdr_shaders_by_hash[filename_hash] = shader
             ShaderManager._rdr_shaders_base_names[shader] = base_name
+
+        filename_hashes = jenkhash.generate_many(list(ShaderManager._rdr_shaders.keys())).tolist()
+        for filename_hash, shader in zip(filename_hashes, ShaderManager._rdr_shaders.values()):
+            ShaderManager._rdr_shaders_by_hash[filename_hash] = shader
         print("\Loaded total RDR shaders:", len(ShaderManager._rdr_shaders))
         print("\Loaded total GTA shaders:", len(ShaderManager._shaders))
 
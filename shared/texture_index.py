@@ -0,0 +1,155 @@
+"""
+Index of the DDS textures in a directory tree, used to look up textures in the
+shared textures directories without walking the whole tree for each texture.
+The index is persisted to a cache file and, when refreshed, only directories
+whose modification time changed are listed again.
+"""
+
+import json
+import os
+from typing import NamedTuple, Optional
+
+TEXTURE_EXTENSION = ".dds"
+CACHE_VERSION = 1
+
+
+class TextureIndexStats(NamedTuple):
+    num_directories: int
+    num_textures: int
+    num_rescanned: int
+
+
+class TextureIndex:
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path
+        # Root directory -> relative directory path -> [mtime_ns, subdirectory names, texture file names]
+        self.listings: dict[str, dict[str, list]] = {}
+        # Root directory -> lowercase texture file name -> full path
+        self.textures: dict[str, dict[str, str]] = {}
+        # Roots already refreshed in the current session
+        self.refreshed: set[str] = set()
+        self.loaded = False
+
+    def new_session(self):
+        """Check the directories for changes again on the next lookup."""
+        self.refreshed.clear()
+
+    def find(self, root: str, texture_filename: str) -> Optional[str]:
+        """Get the path of ``texture_filename`` (case-insensitive) anywhere under ``root``. Refreshes the index
+        of ``root`` the first time it is searched in the session."""
+        root = os.path.normpath(root)
+        if root not in self.refreshed:
+            self.refresh(root)
+
+        return self.textures[root].get(texture_filename.lower())
+
+    def refresh(self, root: str, rebuild: bool = False) -> TextureIndexStats:
+        """Bring the index of ``root`` up to date. Only directories whose modification time changed since they
+        were last listed are listed again, unless ``rebuild`` is set."""
+        root = os.path.normpath(root)
+        self.load()
+
+        old_listings = {} if rebuild else self.listings.get(root, {})
+        listings: dict[str, list] = {}
+        textures: dict[str, str] = {}
+        num_rescanned = 0
+
+        # Depth-first in sorted order so the texture found for a name doesn't depend on the file system
+        stack = [""]
+        while stack:
+            rel_path = stack.pop()
+            path = os.path.join(root, rel_path) if rel_path else root
+
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                listing = old_listings.get(rel_path)
+                if listing is None or listing[0] != mtime:
+                    listing = list_directory(path, mtime)
+                    num_rescanned += 1
+            except OSError:
+                continue
+
+            listings[rel_path] = listing
+            for filename in listing[2]:
+                textures.setdefault(filename.lower(), os.path.join(path, filename))
+
+            stack.extend(os.path.join(rel_path, name) for name in reversed(listing[1]))
+
+        if num_rescanned or len(listings) != len(old_listings):
+            self.listings[root] = listings
+            self.save()
+
+        self.textures[root] = textures
+        self.refreshed.add(root)
+
+        return TextureIndexStats(len(listings), len(textures), num_rescanned)
+
+    def get_stats(self, root: str) -> Optional[TextureIndexStats]:
+        """Get the size of the index of ``root``, or ``None`` if it hasn't been indexed."""
+        root = os.path.normpath(root)
+        self.load()
+
+        listings = self.listings.get(root)
+        if listings is None:
+            return None
+
+        if root in self.textures:
+            num_textures = len(self.textures[root])
+        else:
+            num_textures = sum(len(listing[2]) for listing in listings.values())
+        return TextureIndexStats(len(listings), num_textures, 0)
+
+    def clear(self):
+        """Remove all roots from the index and the cache file."""
+        self.listings.clear()
+        self.textures.clear()
+        self.refreshed.clear()
+        self.loaded = True
+        self.save()
+
+    def load(self):
+        if self.loaded:
+            return
+
+        self.loaded = True
+        if self.cache_path is None or not os.path.isfile(self.cache_path):
+            return
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Failed to read texture index cache '{self.cache_path}': {e}")
+            return
+
+        if cache.get("version") == CACHE_VERSION:
+            self.listings = cache["roots"]
+
+    def save(self):
+        if self.cache_path is None:
+            return
+
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "roots": self.listings}, f, separators=(",", ":"))
+        except OSError as e:
+            print(f"Failed to write texture index cache '{self.cache_path}': {e}")
+
+
+def list_directory(path: str, mtime: int) -> list:
+    """Get the listing of a directory as stored in the index."""
+    subdirs = []
+    filenames = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.name.lower().endswith(TEXTURE_EXTENSION) and entry.is_file():
+                    filenames.append(entry.name)
+            except OSError:
+                continue
+
+    subdirs.sort()
+    filenames.sort()
+    return [mtime, subdirs, filenames]
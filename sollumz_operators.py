@@ -1,16 +1,18 @@
 import traceback
 import os
-from typing import Optional
+import io
+from typing import Callable, Optional
 import bpy
 import time
 from collections import defaultdict
+from concurrent.futures import BrokenExecutor
 import re
 from bpy_extras.io_utils import ImportHelper
 from mathutils import Matrix, Quaternion
 from .sollumz_helper import SOLLUMZ_OT_base, find_sollumz_parent
 from .sollumz_properties import SollumType, SOLLUMZ_UI_NAMES, BOUND_TYPES, TimeFlags, ArchetypeType, LODLevel
-from .sollumz_preferences import get_export_settings
-from .cwxml.drawable import YDR, YDD
+from .sollumz_preferences import get_export_settings, get_import_settings, get_shared_textures_index
+from .cwxml.drawable import YDR, YDD, VertexBuffer, predecoded_buffers
 from .cwxml.fragment import YFT
 from .cwxml.bound import YBN
 from .cwxml.navmesh import YNV
@@ -32,6 +34,7 @@ from .ymap.ymapimport import import_ymap
 from .ymap.ymapexport import export_ymap
 from .tools.blenderhelper import add_child_of_bone_constraint, get_child_of_pose_bone, get_terrain_texture_brush, remove_number_suffix, create_blender_object, join_objects
 from .tools.ytyphelper import ytyp_from_objects
+from .tools import importworker
 from .ybn.properties import BoundProperties
 from .ybn.properties import BoundFlags
 
@@ -55,6 +58,32 @@ class TimedOperator:
         ...
 
 
+# Maximum total size of the files handed to the import worker processes ahead of the file being imported
+IMPORT_MAX_PENDING_BYTES = 512 * 1024 * 1024
+
+
+def get_xml_importer(filepath: str) -> Optional[tuple[Optional[type], Callable]]:
+    """Get the XML file class and import function for ``filepath``. The file class is ``None`` if the import
+    function parses the file itself."""
+    if YDR.file_extension in filepath:
+        return YDR, import_ydr
+    elif YDD.file_extension in filepath:
+        return YDD, import_ydd
+    elif YFT.file_extension in filepath:
+        return None, import_yft
+    elif YBN.file_extension in filepath:
+        return YBN, import_ybn
+    elif YNV.file_extension in filepath:
+        return YNV, import_ynv
+    elif YCD.file_extension in filepath:
+        return YCD, import_ycd
+    elif YMAP.file_extension in filepath:
+        # YMAP.from_xml_file needs the file path to detect the game
+        return None, import_ymap
+
+    return None
+
+
 class SOLLUMZ_OT_import(bpy.types.Operator, ImportHelper, TimedOperator):
     """Imports xml files exported by codewalker"""
     bl_idname = "sollumz.import"
@@ -84,35 +113,84 @@ class SOLLUMZ_OT_import(bpy.types.Operator, ImportHelper, TimedOperator):
             self.report({"INFO"}, "No file selected for import!")
             return {"CANCELLED"}
 
-        for file in self.files:
-            filepath = os.path.join(self.directory, file.name)
+        # Pick up changes in the shared textures directories made since the last import
+        get_shared_textures_index().new_session()
+
+        filepaths = [os.path.join(self.directory, file.name) for file in self.files]
+        filepaths = [filepath for filepath in filepaths if get_xml_importer(filepath) is not None]
+        stage_times = defaultdict(float)
+
+        # With parallel parsing, the XML of the files is parsed and their vertex and index buffers decoded in worker
+        # processes ahead of the file being imported, while the Blender objects are created here. The cwxml objects
+        # are still built on the main thread from the XML returned by the workers, the cwxml classes depend on bpy
+        # and on module globals (e.g. current_game) set while parsing.
+        parsed_filepaths = [filepath for filepath in filepaths if get_xml_importer(filepath)[0] is not None]
+        executor = None
+        if get_import_settings().parallel_parsing and len(parsed_filepaths) > 1:
+            worker = importworker.get_worker_module()
+            num_workers = min(len(parsed_filepaths), max((os.cpu_count() or 1) - 1, 1))
+            executor = worker.create_process_pool(num_workers)
+            predecoded_files = worker.submit_in_order(
+                executor, worker.predecode_xml_file, parsed_filepaths, IMPORT_MAX_PENDING_BYTES,
+                VertexBuffer.VERT_ATTR_DTYPES
+            )
 
-            try:
-
-                if YDR.file_extension in filepath:
-                    import_ydr(filepath)
-                elif YDD.file_extension in filepath:
-                    import_ydd(filepath)
-                elif YFT.file_extension in filepath:
-                    import_yft(filepath)
-                elif YBN.file_extension in filepath:
-                    import_ybn(filepath)
-                elif YNV.file_extension in filepath:
-                    import_ynv(filepath)
-                elif YCD.file_extension in filepath:
-                    import_ycd(filepath)
-                elif YMAP.file_extension in filepath:
-                    import_ymap(filepath)
-                else:
-                    continue
-
-                self.report({"INFO"}, f"Successfully imported '{filepath}'")
-            except:
-                self.report({"ERROR"}, f"Error importing: {filepath} \n {traceback.format_exc()}")
-
-                return {"CANCELLED"}
+        try:
+            for filepath in filepaths:
+                xml_cls, import_func = get_xml_importer(filepath)
+
+                try:
+                    t_start = time.perf_counter()
+                    predecoded = None
+                    if executor is not None and xml_cls is not None:
+                        try:
+                            predecoded = next(predecoded_files).result()
+                        except BrokenExecutor:
+                            # The worker processes failed to start, parse the remaining files here instead
+                            self.report({"WARNING"}, "Parallel parsing failed, parsing the remaining files in Blender")
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            executor = None
+
+                    t_wait = time.perf_counter()
+                    if predecoded is not None:
+                        with predecoded_buffers(predecoded.buffers):
+                            xml = xml_cls.from_xml_file(io.BytesIO(predecoded.xml))
+                    elif xml_cls is not None:
+                        xml = xml_cls.from_xml_file(filepath)
+
+                    t_parse = time.perf_counter()
+                    if xml_cls is not None:
+                        import_func(filepath, xml)
+                    else:
+                        import_func(filepath)
+
+                    t_create = time.perf_counter()
+                except:
+                    self.report({"ERROR"}, f"Error importing: {filepath} \n {traceback.format_exc()}")
+
+                    return {"CANCELLED"}
+
+                t_worker = predecoded.time if predecoded is not None else 0.0
+                stage_times["worker"] += t_worker
+                stage_times["wait"] += t_wait - t_start
+                stage_times["parse"] += t_parse - t_wait
+                stage_times["create"] += t_create - t_parse
+                self.report(
+                    {"INFO"},
+                    f"Successfully imported '{filepath}' (worker {t_worker:.3f}s, wait {t_wait - t_start:.3f}s, "
+                    f"parse {t_parse - t_wait:.3f}s, create {t_create - t_parse:.3f}s)"
+                )
+        finally:
+            if executor is not None:
+                # Don't parse the files left when the import is cancelled
+                executor.shutdown(wait=False, cancel_futures=True)
 
-        self.report({"INFO"}, f"Imported in {self.time_elapsed} seconds")
+        self.report(
+            {"INFO"},
+            f"Imported in {self.time_elapsed} seconds (worker {stage_times['worker']:.3f}s, "
+            f"waiting for workers {stage_times['wait']:.3f}s, parse {stage_times['parse']:.3f}s, "
+            f"create {stage_times['create']:.3f}s)"
+        )
 
         return {"FINISHED"}
 
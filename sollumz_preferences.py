@@ -9,10 +9,14 @@ import os
 import ast
 from typing import Any
 from .sollumz_properties import SollumType, SollumzGame, items_from_enums
+from .shared.texture_index import TextureIndex
 from configparser import ConfigParser
 from typing import Optional
 
 PREFS_FILE_NAME = "sollumz_prefs.ini"
+SHARED_TEXTURES_INDEX_FILE_NAME = "shared_textures_index.json"
+
+_shared_textures_index: Optional[TextureIndex] = None
 
 
 def _save_preferences(self, context):
@@ -62,6 +66,25 @@ class SollumzExportSettings(bpy.types.PropertyGroup):
         update=_save_preferences
     )
 
+    build_collision_bvh: bpy.props.BoolProperty(
+        name="Build Collision BVH",
+        description=(
+            "Sort the polygon triangles of collision geometries along a bounding volume hierarchy, so triangles "
+            "close in space are stored together, and calculate the octants of Bound Geometries. Slower export"
+        ),
+        default=False,
+        update=_save_preferences
+    )
+
+    collision_bvh_leaf_size: bpy.props.IntProperty(
+        name="BVH Leaf Size",
+        description="Maximum number of triangles in each leaf of the collision bounding volume hierarchy",
+        default=4,
+        min=1,
+        max=64,
+        update=_save_preferences
+    )
+
     exclude_skeleton: bpy.props.BoolProperty(
         name="Exclude Skeleton",
         description="Exclude skeleton from export. Usually done with mp ped components",
@@ -125,6 +148,87 @@ class SollumzExportSettings(bpy.types.PropertyGroup):
         update=_save_preferences
     )
 
+    reorder_split_triangles: bpy.props.BoolProperty(
+        name="Reorder Split Geometries",
+        description=(
+            "Reorder the triangles of geometries with more than 65535 indices before splitting them, so fewer "
+            "vertices are duplicated across the split geometries"
+        ),
+        default=False,
+        update=_save_preferences
+    )
+
+    optimize_vertex_cache: bpy.props.BoolProperty(
+        name="Optimize Vertex Cache",
+        description=(
+            "Reorder the triangles and vertices of each geometry for better GPU vertex cache usage in-game. "
+            "Slower export"
+        ),
+        default=False,
+        update=_save_preferences
+    )
+
+    weld_position_tolerance: bpy.props.FloatProperty(
+        name="Position",
+        description="Vertices with positions closer than this are merged when they share all other attributes",
+        default=1e-6,
+        min=0.0,
+        soft_max=0.001,
+        precision=6,
+        update=_save_preferences
+    )
+
+    weld_normal_tolerance: bpy.props.FloatProperty(
+        name="Normal",
+        description=(
+            "Vertices with normals and tangents closer than this are merged when they share all other attributes"
+        ),
+        default=1e-5,
+        min=0.0,
+        soft_max=0.01,
+        precision=6,
+        update=_save_preferences
+    )
+
+    weld_texcoord_tolerance: bpy.props.FloatProperty(
+        name="UV",
+        description="Vertices with UVs closer than this are merged when they share all other attributes",
+        default=1e-5,
+        min=0.0,
+        soft_max=0.01,
+        precision=6,
+        update=_save_preferences
+    )
+
+    @property
+    def weld_tolerances(self) -> dict[str, float]:
+        return {
+            "Position": self.weld_position_tolerance,
+            "Normal": self.weld_normal_tolerance,
+            "Tangent": self.weld_normal_tolerance,
+            "TexCoord": self.weld_texcoord_tolerance,
+        }
+
+    compress_animations: bpy.props.BoolProperty(
+        name="Error-Bounded Compression",
+        description=(
+            "Encode each animation channel with the smallest channel type that stays within the maximum error, "
+            "and report the compressed size and error of each animation"
+        ),
+        default=False,
+        update=_save_preferences
+    )
+
+    animation_max_error: bpy.props.FloatProperty(
+        name="Max Error",
+        description="Maximum difference allowed between the exported and the original animation values",
+        default=0.0005,
+        min=0.0,
+        soft_max=0.01,
+        precision=5,
+        update=_save_preferences
+    )
+
     @property
     def export_hi(self):
         return "sollumz_export_very_high" in self.export_lods
@@ -163,6 +267,16 @@ class SollumzImportSettings(bpy.types.PropertyGroup):
         update=_save_preferences
     )
 
+    parallel_parsing: bpy.props.BoolProperty(
+        name="Parallel Parsing",
+        description=(
+            "When importing multiple files, parse them and decode their vertex and index buffers in background "
+            "processes while the Blender objects of the previous files are created"
+        ),
+        default=False,
+        update=_save_preferences
+    )
+
     ymap_skip_missing_entities: bpy.props.BoolProperty(
         name="Skip Missing Entities",
         description="If enabled, missing entities wont be created as an empty object",
@@ -326,6 +440,48 @@ class SOLLUMZ_OT_prefs_shared_textures_directory_move_down(bpy.types.Operator):
         return {"FINISHED"}
 
 
+class SOLLUMZ_OT_prefs_shared_textures_index_rebuild(bpy.types.Operator):
+    bl_idname = "sollumz.prefs_shared_textures_index_rebuild"
+    bl_label = "Rebuild Shared Textures Index"
+    bl_description = "Search the recursive shared textures directories again for all textures"
+
+    def execute(self, context):
+        prefs = get_addon_preferences(context)
+        index = get_shared_textures_index()
+        index.clear()
+        for d in prefs.shared_textures_directories:
+            if not d.recursive or not os.path.isdir(d.path):
+                continue
+
+            stats = index.refresh(d.path, rebuild=True)
+            self.report(
+                {"INFO"}, f"Indexed {stats.num_textures} textures in {stats.num_directories} directories of '{d.path}'"
+            )
+        return {"FINISHED"}
+
+
+class SOLLUMZ_OT_prefs_shared_textures_index_info(bpy.types.Operator):
+    bl_idname = "sollumz.prefs_shared_textures_index_info"
+    bl_label = "Shared Textures Index Info"
+    bl_description = "Show the number of textures indexed for each recursive shared textures directory"
+
+    def execute(self, context):
+        prefs = get_addon_preferences(context)
+        index = get_shared_textures_index()
+        for d in prefs.shared_textures_directories:
+            if not d.recursive:
+                continue
+
+            stats = index.get_stats(d.path)
+            if stats is None:
+                self.report({"INFO"}, f"'{d.path}' not indexed yet")
+            else:
+                self.report(
+                    {"INFO"}, f"'{d.path}': {stats.num_textures} textures in {stats.num_directories} directories"
+                )
+        return {"FINISHED"}
+
+
 class SollumzAddonPreferences(bpy.types.AddonPreferences):
     bl_idname = __package__.split(".")[0]
 
@@ -416,6 +572,9 @@ class SollumzAddonPreferences(bpy.types.AddonPreferences):
         subcol = side_col.column(align=True)
         subcol.operator(SOLLUMZ_OT_prefs_shared_textures_directory_move_up.bl_idname, text="", icon="TRIA_UP")
         subcol.operator(SOLLUMZ_OT_prefs_shared_textures_directory_move_down.bl_idname, text="", icon="TRIA_DOWN")
+        row = layout.row(align=True)
+        row.operator(SOLLUMZ_OT_prefs_shared_textures_index_rebuild.bl_idname, icon="FILE_REFRESH")
+        row.operator(SOLLUMZ_OT_prefs_shared_textures_index_info.bl_idname, icon="INFO")
 
     def register():
         _load_preferences()
@@ -511,6 +670,15 @@ def get_config_directory_path() -> str:
     return bpy.utils.user_resource(resource_type="CONFIG", path="sollumz", create=True)
 
 
+def get_shared_textures_index() -> TextureIndex:
+    """Get the index of the textures in the recursive shared textures directories, cached in the config directory."""
+    global _shared_textures_index
+    if _shared_textures_index is None:
+        index_path = os.path.join(get_config_directory_path(), SHARED_TEXTURES_INDEX_FILE_NAME)
+        _shared_textures_index = TextureIndex(index_path)
+    return _shared_textures_index
+
+
 def register():
     bpy.utils.register_class(SollumzAddonPreferences)
 
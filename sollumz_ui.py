@@ -186,6 +186,14 @@ class SOLLUMZ_PT_import_ymap(bpy.types.Panel, SollumzImportSettingsPanel):
         layout.prop(settings, "ymap_car_generators")
 
 
+class SOLLUMZ_PT_import_performance(bpy.types.Panel, SollumzImportSettingsPanel):
+    bl_label = "Performance"
+    bl_order = 4
+
+    def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzImportSettings):
+        layout.prop(settings, "parallel_parsing")
+
+
 class SOLLUMZ_PT_export_include(bpy.types.Panel, SollumzExportSettingsPanel):
     bl_label = "Include"
     bl_order = 0
@@ -202,6 +210,13 @@ class SOLLUMZ_PT_export_drawable(bpy.types.Panel, SollumzExportSettingsPanel):
     def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzExportSettings):
         layout.prop(settings, "apply_transforms")
         layout.prop(settings, "export_with_ytyp")
+        layout.prop(settings, "reorder_split_triangles")
+        layout.prop(settings, "optimize_vertex_cache")
+
+        col = layout.column(heading="Weld Tolerance", align=True)
+        col.prop(settings, "weld_position_tolerance")
+        col.prop(settings, "weld_normal_tolerance")
+        col.prop(settings, "weld_texcoord_tolerance")
 
 
 class SOLLUMZ_PT_export_fragment(bpy.types.Panel, SollumzExportSettingsPanel):
@@ -219,6 +234,8 @@ class SOLLUMZ_PT_export_collision(bpy.types.Panel, SollumzExportSettingsPanel):
     def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzExportSettings):
         layout.prop(settings, "auto_calculate_inertia")
         layout.prop(settings, "auto_calculate_volume")
+        layout.prop(settings, "build_collision_bvh")
+        layout.prop(settings, "collision_bvh_leaf_size")
 
 
 class SOLLUMZ_PT_export_ydd(bpy.types.Panel, SollumzExportSettingsPanel):
@@ -240,6 +257,17 @@ class SOLLUMZ_PT_export_ymap(bpy.types.Panel, SollumzExportSettingsPanel):
         layout.prop(settings, "ymap_car_generators")
 
 
+class SOLLUMZ_PT_export_ycd(bpy.types.Panel, SollumzExportSettingsPanel):
+    bl_label = "Clip Dictionary"
+    bl_order = 6
+
+    def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzExportSettings):
+        layout.prop(settings, "compress_animations")
+        row = layout.row()
+        row.enabled = settings.compress_animations
+        row.prop(settings, "animation_max_error")
+
+
 class SOLLUMZ_PT_GAME_PANEL(bpy.types.Panel):
     bl_label = "Game"
     bl_idname = "SOLLUMZ_PT_GAME_PANEL"
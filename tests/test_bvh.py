@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from ..ybn.bvh import build_sah_bvh, validate_bvh, get_octants
+
+
+def create_random_triangles(num_tris: int):
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(-100, 100, (num_tris, 3))
+    tri_verts = centers[:, None, :] + rng.normal(0, 1, (num_tris, 3, 3))
+    return tri_verts.min(axis=1), tri_verts.max(axis=1)
+
+
+@pytest.mark.parametrize("leaf_size", (1, 4, 16))
+def test_build_sah_bvh(leaf_size: int):
+    tri_min, tri_max = create_random_triangles(5000)
+
+    bvh = build_sah_bvh(tri_min, tri_max, leaf_size)
+
+    validate_bvh(bvh, tri_min, tri_max, leaf_size)
+    assert bvh.node_count.max() <= leaf_size
+    assert_array_equal(bvh.node_min[0], tri_min.min(axis=0))
+    assert_array_equal(bvh.node_max[0], tri_max.max(axis=0))
+
+
+def test_build_sah_bvh_degenerate():
+    # All centroids in the same place, nodes are split in half
+    tri_min = np.zeros((100, 3))
+    tri_max = np.ones((100, 3))
+
+    bvh = build_sah_bvh(tri_min, tri_max, 4)
+
+    validate_bvh(bvh, tri_min, tri_max, 4)
+    assert_array_equal(bvh.prim_order, np.arange(100))
+
+    bvh = build_sah_bvh(np.empty((0, 3)), np.empty((0, 3)))
+
+    validate_bvh(bvh, np.empty((0, 3)), np.empty((0, 3)))
+    assert len(bvh.node_children) == 0
+
+
+def test_validate_bvh():
+    tri_min, tri_max = create_random_triangles(100)
+    bvh = build_sah_bvh(tri_min, tri_max, 4)
+
+    with pytest.raises(ValueError):
+        validate_bvh(bvh, tri_min, tri_max, 2)
+
+    bvh.node_min[-1] += 1
+    with pytest.raises(ValueError):
+        validate_bvh(bvh, tri_min, tri_max, 4)
+
+
+def test_get_octants():
+    corners = np.array([[x, y, z] for z in (-1, 1) for y in (-1, 1) for x in (-1, 1)], dtype=np.float32)
+    vertices = np.concatenate((np.zeros((1, 3), dtype=np.float32), corners, corners, [[1, 1, 0.5]]))
+
+    octants = get_octants(vertices)
+
+    # Each octant only has the corner pointing in its direction, first one of the duplicates
+    assert octants == {i: [i + 1] for i in range(8)}
+
+    # Vertices that are not beaten on all axes are kept
+    vertices = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [0.5, 0.5, 0.5], [0.1, 0.1, 0.1]], dtype=np.float32)
+
+    assert get_octants(vertices)[7] == [0, 1, 2, 3]
+    assert get_octants(np.empty((0, 3), dtype=np.float32)) == {}
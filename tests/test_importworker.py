@@ -0,0 +1,102 @@
+import io
+import time
+import pytest
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from numpy.testing import assert_array_equal
+from ..cwxml.drawable import YDR, VertexBuffer, predecoded_buffers
+from ..tools.importworker import predecode_xml_file, submit_in_order
+from .shared import SOLLUMZ_TEST_ASSETS_DIR
+
+YDR_PATH = str(SOLLUMZ_TEST_ASSETS_DIR.joinpath("sollumz_cube.ydr.xml"))
+
+
+class ImmediateExecutor(Executor):
+    """Runs the functions as soon as they are submitted, recording the order."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args[0])
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def assert_geoms_equal(drawable, expected_drawable):
+    geoms = drawable.all_geoms
+    expected_geoms = expected_drawable.all_geoms
+    assert len(geoms) == len(expected_geoms) > 0
+    for geom, expected_geom in zip(geoms, expected_geoms):
+        assert_array_equal(geom.vertex_buffer.data, expected_geom.vertex_buffer.data)
+        assert geom.vertex_buffer.data.dtype == expected_geom.vertex_buffer.data.dtype
+        assert_array_equal(geom.index_buffer.data, expected_geom.index_buffer.data)
+
+
+def test_predecode_xml_file_matches_parsing():
+    expected = YDR.from_xml_file(YDR_PATH)
+
+    predecoded = predecode_xml_file(YDR_PATH, VertexBuffer.VERT_ATTR_DTYPES)
+    assert len(predecoded.buffers) == 2
+
+    with predecoded_buffers(predecoded.buffers):
+        drawable = YDR.from_xml_file(io.BytesIO(predecoded.xml))
+
+    assert_geoms_equal(drawable, expected)
+
+
+def test_submit_in_order_keeps_file_order(tmp_path):
+    filepaths = []
+    for i in range(6):
+        filepath = tmp_path.joinpath(f"{i}.xml")
+        filepath.write_text(str(i))
+        filepaths.append(str(filepath))
+
+    def parse(filepath):
+        with open(filepath) as f:
+            i = int(f.read())
+        # Later files finish first
+        time.sleep((6 - i) * 0.02)
+        if i == 3:
+            raise ValueError(f"Failed to parse {i}")
+        return i
+
+    results = []
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        for future in submit_in_order(executor, parse, filepaths, 1 << 30):
+            try:
+                results.append(future.result())
+            except ValueError as e:
+                results.append(str(e))
+
+    assert results == [0, 1, 2, "Failed to parse 3", 4, 5]
+
+
+def test_submit_in_order_caps_pending_bytes(tmp_path):
+    filepaths = []
+    for i, size in enumerate((100, 100, 100, 1000, 100)):
+        filepath = tmp_path.joinpath(f"{i}.xml")
+        filepath.write_bytes(b" " * size)
+        filepaths.append(str(filepath))
+
+    executor = ImmediateExecutor()
+    num_submitted = []
+    for _ in submit_in_order(executor, len, filepaths, 250):
+        num_submitted.append(len(executor.submitted))
+
+    # At most 250 bytes submitted ahead, except for a larger file submitted on its own
+    assert num_submitted == [2, 3, 3, 4, 5]
+    assert executor.submitted == filepaths
+
+
+@pytest.mark.parametrize("layout, text", (("<Position /><Unknown />", "1 2 3 4"), ("<Position />", "a b c")))
+def test_predecode_xml_file_leaves_undecodable_buffers(tmp_path, layout, text):
+    filepath = tmp_path.joinpath("test.ydr.xml")
+    filepath.write_text(
+        f"<Drawable><VertexBuffer><Layout type=\"GTAV1\">{layout}</Layout><Data>{text}</Data></VertexBuffer></Drawable>"
+    )
+
+    predecoded = predecode_xml_file(str(filepath), VertexBuffer.VERT_ATTR_DTYPES)
+
+    assert predecoded.buffers == []
+    assert predecoded.xml == filepath.read_bytes()
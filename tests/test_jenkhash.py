@@ -0,0 +1,24 @@
+import pytest
+from ..tools.jenkhash import Generate, GenerateCaseSensitive, generate_many
+
+
+@pytest.mark.parametrize("text, expected", (
+    ("adder", 0xB779A091),
+    ("Adder", 0xB779A091),
+    ("default.sps", 0x18AD1594),
+    ("", 0),
+))
+def test_generate(text: str, expected: int):
+    assert Generate(text) == expected
+
+
+def test_generate_many():
+    texts = ["adder", "", "default.sps", "Terrain_CB_4lyr.sps", "a", "ÄÖü", "adder"]
+
+    assert generate_many(texts).tolist() == [Generate(text) for text in texts]
+    assert generate_many(texts, seed=123).tolist() == [Generate(text, seed=123) for text in texts]
+    assert generate_many(texts, case_sensitive=True).tolist() == [GenerateCaseSensitive(text) for text in texts]
+
+
+def test_generate_many_empty():
+    assert generate_many([]).shape == (0,)
@@ -0,0 +1,47 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from ..ydr.mesh_builder import get_normalized_normals, get_vertex_group_weight_batches
+
+
+def test_get_normalized_normals():
+    normals = np.array([
+        [2.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0],
+        [1.0, 1.0, 0.0],
+    ], dtype=np.float32)
+
+    normalized = get_normalized_normals(normals)
+
+    assert normalized.dtype == np.float32
+    assert normalized.flags.c_contiguous
+    assert_allclose(normalized, [
+        [1.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0],
+        [0.70710678, 0.70710678, 0.0],
+    ], rtol=1e-6)
+    assert normals[0, 0] == 2.0
+
+
+def test_get_vertex_group_weight_batches():
+    weights = np.array([
+        [255, 0, 0, 0],
+        [128, 127, 0, 0],
+        [128, 64, 63, 0],
+    ], dtype=np.uint32)
+    indices = np.array([
+        [2, 0, 0, 0],
+        [2, 5, 0, 0],
+        [5, 2, 5, 0],
+    ], dtype=np.uint32)
+
+    bone_inds, batches = get_vertex_group_weight_batches(weights, indices)
+
+    assert bone_inds == [2, 5]
+    assert batches == [
+        (2, 128 / 255, [1]),
+        (2, 255 / 255, [0]),
+        (5, 128 / 255, [2]),
+        (2, 64 / 255, [2]),
+        (5, 127 / 255, [1]),
+        (5, 63 / 255, [2]),
+    ]
@@ -0,0 +1,41 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..ydr.model_data import MeshData, get_faces_subset, get_group_face_inds
+from ..cwxml.drawable import Bone
+
+
+def test_get_faces_subset():
+    vert_arr = np.arange(6, dtype=np.float32) * 10
+    ind_arr = np.array([0, 1, 2, 5, 3, 1, 4, 5, 3], dtype=np.uint32)
+
+    new_vert_arr, new_ind_arr = get_faces_subset(vert_arr, ind_arr, np.array([1, 2], dtype=np.uint32))
+
+    # Vertices are numbered in order of first appearance
+    assert_array_equal(new_vert_arr, [50, 30, 10, 40])
+    assert_array_equal(new_ind_arr, [0, 1, 2, 3, 0, 1])
+
+
+def test_get_group_face_inds():
+    bones = []
+    for parent_index in (-1, 0, 1, 0):
+        bone = Bone()
+        bone.parent_index = parent_index
+        bones.append(bone)
+
+    vert_arr = np.zeros(7, dtype=[("BlendWeights", np.uint32, 4), ("BlendIndices", np.uint32, 4)])
+    vert_arr["BlendIndices"][:, 0] = [3, 3, 3, 1, 1, 2, 0]
+    vert_arr["BlendWeights"][:, 0] = 255
+    ind_arr = np.array([
+        0, 1, 2,  # only group 3
+        3, 4, 5,  # groups 1 and 2 overlap, merged into common parent 1
+        6, 6, 6,  # no group
+        0, 1, 2,
+    ], dtype=np.uint32)
+    mesh_data = MeshData(vert_arr, ind_arr, np.zeros(4, dtype=np.uint32))
+
+    group_face_inds = get_group_face_inds(mesh_data, bones)
+
+    assert list(group_face_inds.keys()) == [3, 1, 0]
+    assert_array_equal(group_face_inds[3], [0, 3])
+    assert_array_equal(group_face_inds[1], [1])
+    assert_array_equal(group_face_inds[0], [2])
@@ -0,0 +1,50 @@
+import os
+from ..shared.texture_index import TextureIndex
+
+
+def create_file(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+
+def test_texture_index_find(tmp_path):
+    create_file(tmp_path / "a" / "Tex1.dds")
+    create_file(tmp_path / "b" / "c" / "tex2.dds")
+    create_file(tmp_path / "b" / "tex1.dds")
+    create_file(tmp_path / "b" / "tex3.png")
+
+    index = TextureIndex()
+
+    assert index.find(str(tmp_path), "tex1.dds") == str(tmp_path / "a" / "Tex1.dds")
+    assert index.find(str(tmp_path), "TEX2.dds") == str(tmp_path / "b" / "c" / "tex2.dds")
+    assert index.find(str(tmp_path), "tex3.png") is None
+    assert index.find(str(tmp_path), "unknown.dds") is None
+
+
+def test_texture_index_refresh_only_lists_changed_directories(tmp_path):
+    create_file(tmp_path / "a" / "tex1.dds")
+    create_file(tmp_path / "b" / "tex2.dds")
+    cache_path = str(tmp_path / "index.json")
+    root = str(tmp_path / "a"), str(tmp_path / "b")
+
+    index = TextureIndex(cache_path)
+    assert index.refresh(root[0]).num_rescanned == 1
+    assert index.refresh(root[1]).num_rescanned == 1
+
+    # New instance loads the listings from the cache file
+    index = TextureIndex(cache_path)
+    create_file(tmp_path / "b" / "new" / "tex3.dds")
+    assert index.refresh(root[0]).num_rescanned == 0
+    stats = index.refresh(root[1])
+    assert stats.num_rescanned == 2
+    assert stats.num_textures == 2
+    assert index.find(root[1], "tex3.dds") == str(tmp_path / "b" / "new" / "tex3.dds")
+
+    assert index.refresh(root[1], rebuild=True).num_rescanned == 2
+
+
+def test_texture_index_missing_directory(tmp_path):
+    index = TextureIndex()
+
+    assert index.find(str(tmp_path / "missing"), "tex1.dds") is None
+    assert index.get_stats(str(tmp_path / "missing")) is None
@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 from numpy.testing import assert_array_equal, assert_allclose
-from ..ydr.vertex_buffer_builder import dedupe_and_get_indices
+from ..ydr.vertex_buffer_builder import dedupe_and_get_indices, get_bone_lookup_array, select_vertex_group_influences
 from ..cwxml.drawable import VertexBuffer
 
 
@@ -93,3 +93,71 @@ def test_dedupe_repeated_but_with_rounding_errors():
     assert len(vertex_arr) == 2
     assert len(ind_arr) == 9
     assert_allclose(vertex_arr[ind_arr]["Normal"], input_vertex_arr["Normal"], atol=1e-6)
+
+
+def test_dedupe_per_attribute_tolerances():
+    struct_dtype = [VertexBuffer.VERT_ATTR_DTYPES["Position"], VertexBuffer.VERT_ATTR_DTYPES["TexCoord0"]]
+    input_vertex_arr = np.empty(4, dtype=struct_dtype)
+    input_vertex_arr["Position"] = [
+        [0, 0, 1],
+        [0, 0, 1.1],
+        [0, 0, 1.1],
+        [0, 0, 1],
+    ]
+    input_vertex_arr["TexCoord0"] = [
+        [0.5, 0.5],
+        [0.5, 0.5],
+        [0.5, 0.5004],
+        [0.5, 0.5004],
+    ]
+
+    vertex_arr, ind_arr = dedupe_and_get_indices(input_vertex_arr, {"Position": 0.01, "TexCoord": 0.001})
+
+    assert len(vertex_arr) == 2
+    assert_array_equal(ind_arr, [0, 1, 1, 0])
+    assert_array_equal(vertex_arr, input_vertex_arr[:2])
+
+    vertex_arr, ind_arr = dedupe_and_get_indices(input_vertex_arr, {"Position": 0.01, "TexCoord": 0})
+
+    assert len(vertex_arr) == 4
+    assert_array_equal(ind_arr, [0, 1, 2, 3])
+
+
+def test_dedupe_across_cell_boundary():
+    struct_dtype = [VertexBuffer.VERT_ATTR_DTYPES["Position"]]
+    input_vertex_arr = np.empty(4, dtype=struct_dtype)
+    input_vertex_arr["Position"] = [
+        [0, 0, 0.0049],
+        [0, 0, 0.0051],  # within tolerance, but snaps to the next cell
+        [0, 0, 0.025],
+        [0, 0, 0.0051],
+    ]
+
+    vertex_arr, ind_arr = dedupe_and_get_indices(input_vertex_arr, {"Position": 0.01})
+
+    assert len(vertex_arr) == 2
+    assert_array_equal(ind_arr, [0, 0, 1, 0])
+    assert_array_equal(vertex_arr, input_vertex_arr[[0, 2]])
+
+
+def test_select_vertex_group_influences():
+    # vertex 0: group 3 has no bone, groups 0 and 2 tie
+    # vertex 1: no groups
+    # vertex 2: more groups than influences
+    vert_inds = np.array([0, 0, 0, 0, 2, 2, 2, 2, 2, 2])
+    group_inds = np.array([0, 3, 1, 2, 0, 1, 2, 4, 5, 6])
+    weights = np.array([0.25, 1.0, 0.5, 0.25, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6], dtype=np.float32)
+    bone_lookup = get_bone_lookup_array({0: 10, 1: 11, 2: 12, 3: -1, 4: 14, 5: 15, 6: 16})
+
+    weights_arr, group_arr = select_vertex_group_influences(vert_inds, group_inds, weights, 3, bone_lookup, 4)
+
+    assert_array_equal(weights_arr, np.array([
+        [0.5, 0.25, 0.25, 0.0],
+        [0.0, 0.0, 0.0, 0.0],
+        [0.6, 0.5, 0.4, 0.3],
+    ], dtype=np.float32))
+    assert_array_equal(group_arr, [
+        [1, 0, 2, -1],
+        [-1, -1, -1, -1],
+        [6, 5, 4, 2],
+    ])
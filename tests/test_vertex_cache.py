@@ -0,0 +1,47 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..ydr.vertex_cache import get_vertex_cache_stats, optimize_vertex_cache, optimize_vertex_fetch
+
+
+def create_shuffled_grid(size: int):
+    verts = np.arange((size + 1) * (size + 1)).reshape((size + 1, size + 1))
+    a, b, c, d = verts[:-1, :-1].ravel(), verts[:-1, 1:].ravel(), verts[1:, :-1].ravel(), verts[1:, 1:].ravel()
+    tris = np.concatenate((np.column_stack((a, b, c)), np.column_stack((b, d, c)))).astype(np.uint32)
+    tris = tris[np.random.default_rng(0).permutation(len(tris))]
+    return tris.reshape(-1), verts.size
+
+
+def test_get_vertex_cache_stats():
+    ind_arr = np.array([0, 1, 2, 2, 1, 3], dtype=np.uint32)
+
+    stats = get_vertex_cache_stats(ind_arr, 4, cache_size=3)
+
+    assert stats.acmr == 2.0
+    assert stats.atvr == 1.0
+
+    stats = get_vertex_cache_stats(ind_arr, 4, cache_size=1)
+
+    assert stats.acmr == 3.0
+    assert stats.atvr == 1.5
+
+
+def test_optimize_vertex_cache():
+    ind_arr, num_verts = create_shuffled_grid(32)
+
+    new_ind_arr = optimize_vertex_cache(ind_arr, num_verts)
+
+    old_tris = sorted(map(tuple, ind_arr.reshape((-1, 3)).tolist()))
+    new_tris = sorted(map(tuple, new_ind_arr.reshape((-1, 3)).tolist()))
+    assert new_tris == old_tris
+    assert get_vertex_cache_stats(new_ind_arr, num_verts).acmr < 0.7
+    assert get_vertex_cache_stats(ind_arr, num_verts).acmr > 2.5
+
+
+def test_optimize_vertex_fetch():
+    vert_arr = np.array([10, 11, 12, 13, 14], dtype=np.float32)
+    ind_arr = np.array([3, 1, 4, 4, 1, 0], dtype=np.uint32)
+
+    new_vert_arr, new_ind_arr = optimize_vertex_fetch(vert_arr, ind_arr)
+
+    assert_array_equal(new_vert_arr, [13, 11, 14, 10])
+    assert_array_equal(new_ind_arr, [0, 1, 2, 2, 1, 3])
@@ -1,6 +1,32 @@
+import io
 import pytest
-from ..cwxml.element import get_str_type, ElementTree, ValueProperty
+import numpy as np
+from numpy.testing import assert_array_equal
+from xml.etree import ElementTree as ET
+from ..cwxml.element import (
+    get_str_type,
+    write_indented_xml,
+    ChunkedText,
+    ElementTree,
+    ValueProperty,
+    TextProperty,
+    AttributeProperty,
+    ListProperty,
+)
 from ..cwxml.ymap import HexColorProperty
+from ..cwxml.bound import (
+    Polygons,
+    PolyBox,
+    PolySphere,
+    PolyTriangle,
+    PolyTriangleArray,
+    POLY_TRIANGLE_DTYPE,
+    VerticesProperty,
+    VertexColorProperty,
+    OctantsProperty,
+    PolygonListProperty,
+)
+from ..tools.utils import np_str_to_struct_arr, np_arr_to_str_chunks
 
 
 @pytest.mark.parametrize("string, expected", (
@@ -52,3 +78,308 @@ def test_argb_hex_to_rgba(argb_hex, expected_rgba):
 ))
 def test_rgba_to_argb_hex(rgba, expected_argb_hex):
     assert HexColorProperty.rgba_to_argb_hex(rgba) == expected_argb_hex
+
+
+def test_xml_streaming_reader_matches_from_xml(tmp_path):
+    class Item(ElementTree):
+        tag_name = "Item"
+
+        def __init__(self):
+            self.name = TextProperty("name")
+            self.v = ValueProperty("v")
+
+    class ItemList(ListProperty):
+        list_type = Item
+        tag_name = "items"
+
+    class Data(ElementTree):
+        tag_name = "Data"
+
+        def __init__(self):
+            self.version = AttributeProperty("version", 0)
+            self.name = TextProperty("name")
+            self.items = ItemList()
+
+    xml = (
+        '<Data version="2"><unused><name>x</name></unused><name>first</name><items>'
+        '<Item><name>a</name><v value="1" /></Item><Other /><Item><name>b</name><v value="2" /></Item>'
+        '</items><name>second</name></Data>'
+    )
+    filepath = tmp_path.joinpath("data.xml")
+    filepath.write_text(xml)
+
+    expected = Data.from_xml(ET.fromstring(xml))
+    streamed = Data.from_xml_file(str(filepath))
+
+    assert ET.tostring(streamed.to_xml()) == ET.tostring(expected.to_xml())
+    assert streamed.version == 2
+    assert [item.name for item in streamed.items] == ["a", "b"]
+
+
+def test_xml_streaming_reader_frees_consumed_elements(tmp_path):
+    num_children_left = []
+
+    class Item(ElementTree):
+        tag_name = "Item"
+
+        def __init__(self):
+            self.name = TextProperty("name")
+
+    class ItemList(ListProperty):
+        list_type = Item
+        tag_name = "items"
+
+        @classmethod
+        def stream_reader(cls, element):
+            reader = super().stream_reader(element)
+            finish = reader.finish
+
+            def count_and_finish(elem):
+                # Children still attached once every item has been read
+                num_children_left.append(len(elem))
+                return finish(elem)
+
+            reader.finish = count_and_finish
+            return reader
+
+    class Data(ElementTree):
+        tag_name = "Data"
+
+        def __init__(self):
+            self.items = ItemList()
+
+    # Enough items for the parser to read many of them ahead of the one being consumed
+    num_items = 20000
+    items_xml = "".join(f"<Item><name>{i}</name></Item>" for i in range(num_items))
+    filepath = tmp_path.joinpath("data.xml")
+    filepath.write_text(f"<Data><items>{items_xml}</items></Data>")
+
+    streamed = Data.from_xml_file(str(filepath))
+
+    assert len(streamed.items) == num_items
+    assert streamed.items[-1].name == str(num_items - 1)
+    assert num_children_left == [0]
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 1 << 20))
+def test_np_str_to_struct_arr(chunk_size):
+    struct_dtype = np.dtype([("Position", np.float32, 3), ("Colour0", np.uint32, 4)])
+    text = """
+        0.0000000 1.5000000 -2.2500000   255 0 128 7
+        3.1415927 0.0000001 100.0000000   1 2 3 4
+
+        -0.5000000 -0.2500000 0.1250000   0 0 0 255
+    """
+
+    expected = np.loadtxt(io.StringIO(text), dtype=struct_dtype)
+    arr = np_str_to_struct_arr(text, struct_dtype, chunk_size)
+
+    assert_array_equal(arr, expected)
+
+
+def test_np_str_to_struct_arr_single_row():
+    struct_dtype = np.dtype([("Position", np.float32, 3)])
+
+    arr = np_str_to_struct_arr("\n 1.0 2.0 3.0\n", struct_dtype)
+
+    assert arr.shape == (1,)
+    assert_array_equal(arr["Position"], [[1.0, 2.0, 3.0]])
+
+
+@pytest.mark.parametrize("num_rows, chunk_rows", ((0, 2), (1, 2), (5, 2), (6, 3), (5, 8192)))
+def test_np_arr_to_str_chunks(num_rows, chunk_rows):
+    arr = np.arange(num_rows * 3, dtype=np.float32).reshape((num_rows, 3)) / 4
+    expected = "\n".join(" ".join("%.7f" % v for v in row) for row in arr.tolist())
+
+    chunks = list(np_arr_to_str_chunks(arr, "%.7f", chunk_rows))
+
+    assert "\n".join(chunks) == expected
+    assert len(chunks) == -(-num_rows // chunk_rows)
+
+
+def test_element_tree_property_fields():
+    class Item(ElementTree):
+        tag_name = "Item"
+        type = "Default"
+
+        def __init__(self):
+            super().__init__()
+            self.name = TextProperty("Name", "")
+            self.type = AttributeProperty("type", "Texture")
+            self.count = ValueProperty("Count", 0)
+
+    item = Item()
+    item.name = "a"
+    item.count = 3
+
+    assert item.name == "a"
+    assert item.count == 3
+    assert item.type == "Texture"
+    assert item.get_element("count").value == 3
+    assert item.missing is None
+    assert Item.type == "Default"
+
+    new = Item.from_xml(item.to_xml())
+
+    assert (new.name, new.count, new.type) == ("a", 3, "Texture")
+
+
+def test_write_indented_xml():
+    root = ET.Element("Drawable")
+    ET.SubElement(root, "Name").text = "a & b"
+    ET.SubElement(root, "Empty")
+    lod = ET.SubElement(root, "Lod", {"value": "1"})
+    ET.SubElement(lod, "Empty")
+    ET.SubElement(lod, "Data").text = "1 2\n3 4\n"
+    ET.SubElement(lod, "Chunked").text = ChunkedText(lambda: ("5 6\n7 8", "9 10"))
+    ET.SubElement(lod, "Empty")
+    items = ET.SubElement(root, "Items")
+    ET.SubElement(items, "Item")
+
+    file = io.StringIO()
+    write_indented_xml(file.write, root)
+
+    assert file.getvalue() == (
+        "<Drawable>\n"
+        "  <Name>a &amp; b</Name>\n"
+        "  <Lod value=\"1\">\n"
+        "    <Data>\n"
+        "      1 2\n"
+        "      3 4\n"
+        "    </Data>\n"
+        "    <Chunked>\n"
+        "      5 6\n"
+        "      7 8\n"
+        "      9 10\n"
+        "    </Chunked>\n"
+        "  </Lod>\n"
+        "  <Items />\n"
+        "</Drawable>\n"
+    )
+
+
+def test_polygons_triangle_array_to_xml():
+    triangles = np.zeros(2, dtype=POLY_TRIANGLE_DTYPE)
+    triangles["m"] = [0, 1]
+    triangles["v1"] = [3, 4]
+    triangles["v2"] = [5, 6]
+    triangles["v3"] = [7, 70000]
+
+    polygons = Polygons()
+    polygons.value = [PolyTriangleArray(triangles[:1]), PolyBox(), PolyTriangleArray(triangles[1:])]
+
+    expected_polygons = Polygons()
+    for m, v1, v2, v3 in ((0, 3, 5, 7), (1, 4, 6, 70000)):
+        triangle = PolyTriangle()
+        triangle.material_index = m
+        triangle.v1 = v1
+        triangle.v2 = v2
+        triangle.v3 = v3
+        expected_polygons.value.append(triangle)
+    expected_polygons.value.insert(1, PolyBox())
+
+    def write_bound(polygons: Polygons):
+        root = ET.Element("Bounds")
+        root.append(polygons.to_xml())
+        file = io.StringIO()
+        write_indented_xml(file.write, root)
+        return file.getvalue()
+
+    xml = write_bound(polygons)
+
+    assert xml == write_bound(expected_polygons)
+    assert "    <Triangle m=\"1\" v1=\"4\" v2=\"6\" v3=\"70000\" f1=\"0\" f2=\"0\" f3=\"0\" />\n" in xml
+
+
+def test_polygons_from_xml_triangle_arrays():
+    element = ET.fromstring(
+        "<Polygons>"
+        "<Triangle m=\"1\" v1=\"0\" v2=\"1\" v3=\"2\" f1=\"3\" f2=\"4\" f3=\"5\" />"
+        "<Triangle m=\"0\" v1=\"2\" v2=\"3\" v3=\"4\" />"
+        "<Sphere m=\"2\" v=\"5\" radius=\"1.5\" />"
+        "<Triangle m=\"0\" v1=\"6\" v2=\"7\" v3=\"8\" />"
+        "</Polygons>"
+    )
+
+    polygons = Polygons.from_xml(element).value
+
+    assert len(polygons) == 3
+    assert isinstance(polygons[0], PolyTriangleArray)
+    assert isinstance(polygons[1], PolySphere)
+    assert isinstance(polygons[2], PolyTriangleArray)
+    assert polygons[0].data.tolist() == [(1, 0, 1, 2, 3, 4, 5), (0, 2, 3, 4, 0, 0, 0)]
+    assert polygons[1].radius == 1.5
+    assert polygons[2].data.tolist() == [(0, 6, 7, 8, 0, 0, 0)]
+
+    for value in ("-1", "5000000000", "1.0", "a"):
+        element = ET.fromstring(f"<Polygons><Triangle m=\"0\" v1=\"{value}\" v2=\"1\" v3=\"2\" /></Polygons>")
+        with pytest.raises(ValueError):
+            Polygons.from_xml(element)
+
+
+def test_bound_vertices_xml():
+    element = ET.fromstring("<Vertices>\n  1.5, 2, -3\n  0.1, 5, 6.25\n</Vertices>")
+
+    vertices = VerticesProperty.from_xml(element)
+
+    assert vertices.value.dtype == np.float32
+    assert_array_equal(vertices.value, np.array([[1.5, 2, -3], [0.1, 5, 6.25]], dtype=np.float32))
+
+    root = ET.Element("Bound")
+    root.append(vertices.to_xml())
+    file = io.StringIO()
+    write_indented_xml(file.write, root)
+
+    assert file.getvalue() == (
+        "<Bound>\n"
+        "  <Vertices>\n"
+        "    1.5, 2.0, -3.0\n"
+        "    0.10000000149011612, 5.0, 6.25\n"
+        "  </Vertices>\n"
+        "</Bound>\n"
+    )
+
+
+def test_bound_vertex_colors_and_octants_from_xml():
+    element = ET.fromstring("<VertexColours>\n  255, 0, 128, 7\n\n  1, 2, 3, 4\n</VertexColours>")
+
+    colors = VertexColorProperty.from_xml(element)
+
+    assert colors.value.dtype == np.uint8
+    assert_array_equal(colors.value, [[255, 0, 128, 7], [1, 2, 3, 4]])
+
+    for text in ("1, 2, 3\n4, 5, 6, 7, 8", "256, 0, 0, 0", "1, 2, 3, 4,"):
+        with pytest.raises(ValueError):
+            VertexColorProperty.from_xml(ET.fromstring(f"<VertexColours>{text}</VertexColours>"))
+
+    element = ET.fromstring("<Octants>\n  0,1, 2\n\n  5,\n</Octants>")
+
+    octants = OctantsProperty.from_xml(element)
+
+    assert octants.value == {0: [0, 1, 2], 2: [5]}
+
+
+def test_rdr_polygons_from_xml():
+    lines = [
+        "Tri 0 1 2 3",
+        "Tri 1 4 5 6",
+        "Box 2 0 1 2 3",
+        "Sph 0 4 1.5",
+        "Tri 0 7 8 70000",
+        "Cap 1 1 2 0.25",
+        "Cyl 1 3 4 2.0",
+    ]
+    element = ET.fromstring("<Polygons>\n    " + "\n    ".join(lines) + "\n  </Polygons>")
+
+    polygons = PolygonListProperty.from_xml(element)
+
+    assert len(polygons.value) == 6
+    assert polygons.value[0].data[["m", "v1", "v2", "v3"]].tolist() == [(0, 1, 2, 3), (1, 4, 5, 6)]
+    assert polygons.value[1:3] == [["Box", 2, 0, 1, 2, 3], ["Sph", 0, 4, 1.5]]
+    assert polygons.value[3].data[["m", "v1", "v2", "v3"]].tolist() == [(0, 7, 8, 70000)]
+    assert polygons.value[4:] == [["Cap", 1, 1, 2, 0.25], ["Cyl", 1, 3, 4, 2.0]]
+    assert "\n".join(polygons.to_xml().text.get_chunks()) == "\n".join(lines)
+
+    for text in ("Tri 0 1 2", "Tri 0 1 2 3 4\nTri 0 1 2", "Sph 0 1", "Box 0 1 2 3 4.5", "Foo 0 1 2"):
+        with pytest.raises(ValueError):
+            PolygonListProperty.from_xml(ET.fromstring(f"<Polygons>{text}</Polygons>"))
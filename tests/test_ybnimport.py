@@ -0,0 +1,30 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..cwxml.bound import POLY_TRIANGLE_DTYPE
+from ..ybn.ybnimport import get_bound_geom_mesh_data
+
+
+def test_get_bound_geom_mesh_data():
+    vertices = np.array([
+        [9.0, 9.0, 9.0],  # Unused
+        [0.0, 0.0, 0.0],
+        [1.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        [1.0, 0.0, 0.0],  # Same position as 2
+        [-0.0, 0.0, 0.0],  # Same position as 1
+    ], dtype=np.float32)
+    vertex_colors = np.array([[i * 10, 0, 255, 255] for i in range(6)], dtype=np.uint8)
+    triangles = np.zeros(2, dtype=POLY_TRIANGLE_DTYPE)
+    triangles["v1"] = [3, 4]
+    triangles["v2"] = [1, 3]
+    triangles["v3"] = [2, 5]
+
+    verts, faces, colors = get_bound_geom_mesh_data(vertices, triangles, vertex_colors)
+
+    assert_array_equal(verts, [[0.0, 1.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    assert_array_equal(faces, [[0, 1, 2], [2, 0, 1]])
+    assert_array_equal(colors, vertex_colors[[3, 1, 2, 4, 3, 5]] / 255)
+
+    _, _, colors = get_bound_geom_mesh_data(vertices, triangles, None)
+
+    assert colors is None
@@ -0,0 +1,89 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..ycd.ycdexport import (
+    build_values_channel,
+    make_quaternions_continuous,
+    build_error_bounded_values_channel,
+    error_bounded_sequence_data_from_frames_data,
+)
+from ..tools.animationhelper import Track
+from ..tools.animationhelper import get_quantum_and_min_val
+
+
+def test_make_quaternions_continuous():
+    quats = np.array([
+        [1.0, 0.0, 0.0, 0.0],
+        [-1.0, 0.0, 0.0, 0.0],
+        [-1.0, 0.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0, 0.0],  # Orthogonal to the previous one, not negated
+        [0.0, -1.0, 0.0, 0.0],
+    ], dtype=np.float32)
+
+    make_quaternions_continuous(quats)
+
+    assert_array_equal(quats, [[1, 0, 0, 0], [1, 0, 0, 0], [1, 0, 0, 0], [0, 1, 0, 0], [0, 1, 0, 0]])
+
+
+def test_build_values_channel():
+    channel = build_values_channel(np.full(10, 2.0, dtype=np.float32))
+
+    assert channel.type == "StaticFloat"
+    assert channel.value == 2.0
+
+    values = np.array([3.0, 1.0] * 10, dtype=np.float32)
+    channel = build_values_channel(values)
+
+    assert channel.type == "IndirectQuantizeFloat"
+    assert channel.values == [1.0, 3.0]
+    assert channel.frames == [1, 0] * 10
+    assert_array_equal(channel.get_values(np.arange(20), []), values)
+
+    values = np.arange(10, dtype=np.float32)
+    channel = build_values_channel(values)
+
+    assert channel.type == "QuantizeFloat"
+    assert channel.values == values.tolist()
+
+
+def test_get_quantum_and_min_val():
+    assert get_quantum_and_min_val([1.0, 1.5, 3.0]) == (1.0, 0.5)
+    assert get_quantum_and_min_val([2.0, 2.0, 4.0]) == (2.0, 2.0)
+
+
+def test_build_error_bounded_values_channel():
+    frame_ids = np.arange(100)
+    values = np.sin(frame_ids / 10).astype(np.float32)
+
+    encoding = build_error_bounded_values_channel(values, 1.0)
+
+    assert encoding.channel.type == "StaticFloat"
+    assert encoding.size == 32
+
+    encoding = build_error_bounded_values_channel(values, 0.001)
+    decoded = encoding.channel.get_values(frame_ids, [])
+
+    assert encoding.channel.type == "QuantizeFloat"
+    assert encoding.size < values.size * 32
+    assert np.abs(decoded - values).max() == encoding.error <= 0.001
+
+    encoding = build_error_bounded_values_channel(values, 0.0)
+
+    assert encoding.channel.type == "RawFloat"
+    assert encoding.error == 0.0
+
+
+def test_error_bounded_sequence_data_from_frames_data():
+    angles = np.linspace(0.0, 1.0, 100)
+    quats = np.column_stack((np.cos(angles / 2), np.sin(angles / 2), np.zeros(100), np.zeros(100))).astype(np.float32)
+
+    sequence_data, size, error = error_bounded_sequence_data_from_frames_data(Track.BoneRotation, quats, 0.001)
+
+    # W calculated from X, Y and Z instead of stored
+    channel_types = [c.type for c in sequence_data.channels]
+    assert channel_types == ["QuantizeFloat", "StaticFloat", "StaticFloat", "CachedQuaternion1"]
+    assert error <= 0.001
+
+    sequence_data, size, error = error_bounded_sequence_data_from_frames_data(Track.BoneRotation, quats, 1.0)
+
+    assert [c.type for c in sequence_data.channels] == ["StaticQuaternion"]
+    assert size == 4 * 32
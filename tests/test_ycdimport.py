@@ -0,0 +1,43 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from ..cwxml.clipdictionary import Animation, ChannelsList
+from ..ycd.ycdimport import get_quaternion_from_sequence_data
+
+
+def create_float_channel(values):
+    channel = ChannelsList.QuantizeFloat()
+    channel.values = values
+    return channel
+
+
+def test_channel_get_values():
+    frame_ids = np.arange(5)
+
+    static = ChannelsList.StaticFloat()
+    static.value = 2.0
+    assert_array_equal(static.get_values(frame_ids, []), [2.0] * 5)
+
+    # Values wrap around when there are fewer than frames
+    quantized = create_float_channel([1.0, 2.0, 3.0])
+    assert_array_equal(quantized.get_values(frame_ids, []), [1.0, 2.0, 3.0, 1.0, 2.0])
+
+    indirect = ChannelsList.IndirectQuantizeFloat()
+    indirect.values = [5.0, 6.0]
+    indirect.frames = [1, 1, 0, 1, 0]
+    assert_array_equal(indirect.get_values(frame_ids, []), [6.0, 6.0, 5.0, 6.0, 5.0])
+
+
+def test_get_quaternion_from_sequence_data():
+    frame_ids = np.arange(2)
+    sequence_data = Animation.SequenceDataList.SequenceData()
+    sequence_data.channels = [
+        create_float_channel([0.0, 0.6]),
+        create_float_channel([0.0, 0.0]),
+        create_float_channel([0.0, 0.0]),
+        ChannelsList.CachedQuaternion1(),
+    ]
+    sequence_data.channels[3].quat_index = 3
+
+    # Missing W computed from the other components
+    quats = get_quaternion_from_sequence_data(sequence_data, frame_ids)
+    assert_allclose(quats, [[1.0, 0.0, 0.0, 0.0], [0.8, 0.6, 0.0, 0.0]])
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from ..ydr.ydrexport import split_vert_buffers
+
+MAX_INDEX = 65535
+
+
+def split_vert_buffers_per_index(vert_buffer, ind_buffer):
+    """Previous implementation of ``split_vert_buffers``, remapping one index at a time."""
+    total_index = 0
+    idx_count = len(ind_buffer)
+
+    split_vert_arrs = []
+    split_ind_arrs = []
+    while total_index < idx_count:
+        old_index_to_new_index = {}
+        chunk_vertices_indices = []
+        chunk_indices = []
+        chunk_index = 0
+        while total_index < idx_count and len(chunk_indices) < MAX_INDEX:
+            old_index = ind_buffer[total_index]
+            existing_index = old_index_to_new_index.get(old_index, None)
+            if existing_index is not None:
+                chunk_indices.append(existing_index)
+            else:
+                chunk_indices.append(chunk_index)
+                chunk_vertices_indices.append(old_index)
+                old_index_to_new_index[old_index] = chunk_index
+                chunk_index += 1
+
+            total_index += 1
+
+        split_vert_arrs.append(vert_buffer[chunk_vertices_indices])
+        split_ind_arrs.append(np.array(chunk_indices, dtype=np.uint32))
+
+    return (tuple(split_vert_arrs), tuple(split_ind_arrs))
+
+
+def create_buffers(num_triangles: int, num_vertices: int):
+    rng = np.random.default_rng(0)
+    # Mostly local triangles, like a real mesh, with some spanning the whole buffer
+    first = rng.integers(0, num_vertices - 2, num_triangles)
+    triangles = np.column_stack((first, first + 1, first + 2))
+    far = rng.random(num_triangles) < 0.05
+    triangles[far, 2] = rng.integers(0, num_vertices, far.sum())
+    ind_buffer = triangles.reshape(-1).astype(np.uint32)
+
+    vert_buffer = np.zeros(num_vertices, dtype=[("Position", np.float32, 3), ("Index", np.uint32)])
+    vert_buffer["Position"] = rng.normal(size=(num_vertices, 3))
+    vert_buffer["Index"] = np.arange(num_vertices)
+    return vert_buffer, ind_buffer
+
+
+def test_split_vert_buffers_matches_per_index():
+    # Several 65535 index windows plus a partial one
+    vert_buffer, ind_buffer = create_buffers(80000, 90000)
+
+    vert_arrs, ind_arrs = split_vert_buffers(vert_buffer, ind_buffer)
+    expected_vert_arrs, expected_ind_arrs = split_vert_buffers_per_index(vert_buffer, ind_buffer)
+
+    assert len(vert_arrs) == len(expected_vert_arrs) == 4
+    for verts, inds, expected_verts, expected_inds in zip(vert_arrs, ind_arrs, expected_vert_arrs, expected_ind_arrs):
+        assert_array_equal(verts, expected_verts)
+        assert_array_equal(inds, expected_inds)
+        assert inds.dtype == np.uint32
+
+
+@pytest.mark.parametrize("reorder_triangles", (False, True))
+def test_split_vert_buffers_keeps_triangles(reorder_triangles: bool):
+    vert_buffer, ind_buffer = create_buffers(80000, 90000)
+
+    vert_arrs, ind_arrs = split_vert_buffers(vert_buffer, ind_buffer, reorder_triangles)
+
+    split_triangles = []
+    for verts, inds in zip(vert_arrs, ind_arrs):
+        assert len(inds) <= MAX_INDEX
+        assert len(verts) <= MAX_INDEX
+        assert inds.max() < len(verts)
+        split_triangles.append(verts["Index"][inds].reshape((-1, 3)))
+
+    # Same triangles, with their vertices in the same order, once sorted
+    split_triangles = np.concatenate(split_triangles)
+    triangles = ind_buffer.reshape((-1, 3))
+    assert_array_equal(
+        split_triangles[np.lexsort(split_triangles.T[::-1])],
+        triangles[np.lexsort(triangles.T[::-1])]
+    )
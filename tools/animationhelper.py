@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import bpy
 import math
+import numpy as np
 from sys import float_info
 from mathutils import Quaternion, Vector, Euler, Matrix
 from enum import IntFlag, IntEnum
@@ -170,19 +171,13 @@ PropertyNameToTrackMap = {v: k for k, v in TrackToPropertyNameMap.items()}
 
 
 def get_quantum_and_min_val(nums):
-    min_val = float_info.max
-    max_val = float_info.min
-    min_delta = float_info.max
-    last_val = 0
+    nums = np.asarray(nums, dtype=np.float64)
+    min_val = nums.min(initial=float_info.max)
+    max_val = nums.max(initial=float_info.min)
 
-    for value in nums:
-        min_val = min(min_val, value)
-        max_val = max(max_val, value)
-
-        if value != last_val:
-            min_delta = min(min_delta, abs(value - last_val))
-
-        last_val = value
+    # Smallest change between consecutive values, starting from 0
+    last_vals = np.concatenate(([0.0], nums[:-1]))
+    min_delta = np.abs(nums - last_vals).min(where=nums != last_vals, initial=float_info.max)
 
     if min_delta == float_info.max:
         min_delta = 0
@@ -191,7 +186,7 @@ def get_quantum_and_min_val(nums):
     min_quant = range_value / 1048576
     quantum = max(min_delta, min_quant)
 
-    return min_val, quantum
+    return float(min_val), float(quantum)
 
 
 def decompose_uv_affine_matrix(
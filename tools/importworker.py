@@ -0,0 +1,155 @@
+"""
+Pure-data stage of the batch import, run in worker processes while the main thread creates the Blender objects.
+The worker processes don't have bpy or mathutils, so this module must only import the standard library and numpy.
+It is imported there by its file name (see ``create_process_pool``), not through the add-on package.
+"""
+
+import importlib.util
+import multiprocessing
+import os
+import site
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Name of this module in the worker processes
+WORKER_MODULE_NAME = os.path.splitext(os.path.basename(__file__))[0]
+# Attribute set on the Data elements whose text was decoded by a worker, with the index of the decoded buffer
+PREDECODED_ATTR = "sollumz_predecoded"
+
+
+class PredecodedFile(NamedTuple):
+    # XML of the file with the text of the decoded buffers removed
+    xml: bytes
+    buffers: list[NDArray]
+    # Time spent in the worker
+    time: float
+
+
+def predecode_xml_file(filepath: str, vert_attr_dtypes: dict[str, tuple]) -> PredecodedFile:
+    """Parse the XML file at ``filepath`` and decode the text of its vertex and index buffers into numpy arrays.
+    ``vert_attr_dtypes`` are the dtypes of the vertex attributes by name (``VertexBuffer.VERT_ATTR_DTYPES``).
+    RDR2 files and buffers that can't be decoded are left as they are, to be parsed as usual."""
+    t_start = time.perf_counter()
+
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    root = ET.fromstring(data)
+    buffers = []
+    if "RDR2" not in root.tag:
+        for elem in root.iter():
+            if elem.tag == "VertexBuffer":
+                buffer = decode_vertex_buffer(elem, vert_attr_dtypes)
+            elif elem.tag == "IndexBuffer":
+                buffer = decode_index_buffer(elem)
+            else:
+                continue
+
+            if buffer is None:
+                continue
+
+            data_elem, arr = buffer
+            data_elem.text = None
+            data_elem.set(PREDECODED_ATTR, str(len(buffers)))
+            buffers.append(arr)
+
+    if buffers:
+        data = ET.tostring(root, encoding="utf-8")
+
+    return PredecodedFile(data, buffers, time.perf_counter() - t_start)
+
+
+def decode_vertex_buffer(element: ET.Element, vert_attr_dtypes: dict[str, tuple]):
+    """Get the Data element of a VertexBuffer and its vertices, or ``None`` if it can't be decoded here."""
+    layout_elem = element.find("Layout")
+    data_elem = element.find("Data")
+    if data_elem is None:
+        data_elem = element.find("Data2")
+
+    if layout_elem is None or data_elem is None or not data_elem.text:
+        return None
+
+    try:
+        struct_dtype = np.dtype([vert_attr_dtypes[child.tag] for child in layout_elem])
+        return data_elem, np.loadtxt(data_elem.text.splitlines(), dtype=struct_dtype, ndmin=1)
+    except (KeyError, ValueError):
+        return None
+
+
+def decode_index_buffer(element: ET.Element):
+    """Get the Data element of an IndexBuffer and its indices, or ``None`` if it can't be decoded here."""
+    data_elem = element.find("Data")
+    if data_elem is None or not data_elem.text:
+        return None
+
+    return data_elem, np.fromstring(data_elem.text, sep=" ", dtype=np.uint32)
+
+
+def get_worker_module():
+    """Get this module as loaded by its file name, the same name the worker processes import it with. Functions
+    submitted to the pool must come from this module so they can be pickled by name."""
+    module = sys.modules.get(WORKER_MODULE_NAME)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(WORKER_MODULE_NAME, __file__)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[WORKER_MODULE_NAME] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def create_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Create a pool of worker processes that can run the functions of ``get_worker_module()``. Processes are
+    spawned, not forked, as forking Blender is unsafe."""
+    return ProcessPoolExecutor(
+        max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        # The add-on package can't be imported without bpy, so import this module from its own directory instead
+        initializer=site.addsitedir,
+        initargs=(os.path.dirname(__file__),),
+    )
+
+
+def submit_in_order(
+    executor: Executor,
+    func: Callable,
+    filepaths: Iterable[str],
+    max_pending_bytes: int,
+    *args
+) -> Iterator[Future]:
+    """Submit ``func(filepath, *args)`` for each file to ``executor`` ahead of it being needed, and yield the futures
+    in file order. Files are submitted while the total size of the files submitted but not yet yielded stays within
+    ``max_pending_bytes``, at least one file is always submitted. A failure in ``func`` is raised by the future of
+    that file only."""
+    pending: deque[tuple[Future, int]] = deque()
+    pending_bytes = 0
+    filepaths = iter(filepaths)
+    next_filepath = next(filepaths, None)
+
+    while True:
+        while next_filepath is not None:
+            try:
+                size = os.path.getsize(next_filepath)
+            except OSError:
+                # Let func report the error
+                size = 0
+
+            if pending and pending_bytes + size > max_pending_bytes:
+                break
+
+            pending.append((executor.submit(func, next_filepath, *args), size))
+            pending_bytes += size
+            next_filepath = next(filepaths, None)
+
+        if not pending:
+            return
+
+        future, size = pending.popleft()
+        pending_bytes -= size
+        yield future
@@ -1,3 +1,9 @@
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
 
 def GenerateData(bts: bytes, seed=0):
     h = seed
@@ -20,15 +26,57 @@ def GenerateData(bts: bytes, seed=0):
     return h
 
 
+@lru_cache(maxsize=65536)
 def Generate(text, encoding="utf-8", seed=0):
     bts = text.lower().encode(encoding)
     return GenerateData(bts, seed)
 
+
+@lru_cache(maxsize=65536)
 def GenerateCaseSensitive(text, encoding="utf-8", seed=0):
     bts = text.encode(encoding)
     return GenerateData(bts, seed)
 
 
+def generate_many(texts: Sequence[str], encoding="utf-8", seed=0, case_sensitive=False) -> NDArray[np.uint32]:
+    """Hash all strings in ``texts`` at once. Same results as ``Generate`` (or ``GenerateCaseSensitive``), but
+    each step of the hash runs over all strings in a single numpy operation."""
+    if not case_sensitive:
+        texts = [text.lower() for text in texts]
+    data = [text.encode(encoding) for text in texts]
+    num = len(data)
+
+    hashes = np.empty(num, dtype=np.uint32)
+    if num == 0:
+        return hashes
+
+    # Sort by length, longest first, so the strings still being hashed at any byte index are always a prefix
+    lengths = np.fromiter(map(len, data), dtype=np.int64, count=num)
+    order = np.argsort(-lengths, kind="stable")
+    lengths = lengths[order]
+    max_len = int(lengths[0])
+
+    # Pad bytes into a 2D array, one row per string
+    byte_arr = np.zeros((num, max_len), dtype=np.uint8)
+    byte_arr[np.arange(max_len) < lengths[:, None]] = np.frombuffer(b"".join(data[i] for i in order), dtype=np.uint8)
+    # Number of strings longer than each byte index
+    num_active = np.searchsorted(-lengths, -np.arange(max_len), side="left")
+
+    h = np.full(num, seed & 0xFFFFFFFF, dtype=np.uint32)
+    for i in range(max_len):
+        n = num_active[i]
+        x = h[:n] + byte_arr[:n, i]
+        x += x << 10
+        x ^= x >> 6
+        h[:n] = x
+
+    h += h << 3
+    h ^= h >> 11
+    h += h << 15
+
+    hashes[order] = h
+    return hashes
+
 
 def name_to_hash(name: str) -> int:
     """Gets a hash from a string. If it starts with `hash_`, it parses the hexadecimal number afterwards;
@@ -39,3 +87,29 @@ def name_to_hash(name: str) -> int:
         return int(name[5:], 16) & 0xFFFFFFFF
     else:
         return Generate(name)
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: python tools/jenkhash.py
+    import random
+    import string
+    import timeit
+
+    rng = random.Random(0)
+    names = ["".join(rng.choices(string.ascii_lowercase + "_", k=rng.randint(4, 32))) for _ in range(10000)]
+
+    def hash_loop():
+        return [GenerateData(name.lower().encode("utf-8")) for name in names]
+
+    def hash_cached():
+        return [Generate(name) for name in names]
+
+    def hash_many():
+        return generate_many(names)
+
+    assert hash_loop() == hash_many().tolist()
+
+    hash_cached()  # Fill cache
+    for func in (hash_loop, hash_cached, hash_many):
+        t = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{func.__name__:<12} {len(names)} names: {t * 1000:.2f} ms")
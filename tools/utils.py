@@ -1,8 +1,9 @@
 import os
+import warnings
 import numpy
 from numpy.typing import NDArray
 from math import sqrt
-from typing import Iterable, Tuple
+from typing import Iterable, Iterator, Tuple
 from mathutils import Vector, Quaternion, Matrix
 
 
@@ -187,19 +188,95 @@ def get_filename(filepath: str):
     return os.path.basename(filepath).split(".")[0]
 
 
-def np_arr_to_str(arr: NDArray, fmt: str):
-    """Convert numpy array to formatted string (faster than np.savetxt)"""
-    n_fmt_chars = fmt.count('%')
-
-    if arr.ndim == 1 and n_fmt_chars == 1:
-        fmt = ' '.join([fmt] * arr.size)
-    else:
-        if n_fmt_chars == 1:
-            fmt = ' '.join([fmt] * arr.shape[1])
+# Number of rows formatted at once by the ``*_to_str_chunks`` functions
+STR_CHUNK_ROWS = 8192
 
-        fmt = '\n'.join([fmt] * arr.shape[0])
 
-    return fmt % tuple(arr.ravel())
+def np_arr_to_str(arr: NDArray, fmt: str):
+    """Convert numpy array to formatted string (faster than np.savetxt)"""
+    return "\n".join(np_arr_to_str_chunks(arr, fmt))
+
+
+def np_arr_to_str_chunks(arr: NDArray, fmt: str, chunk_rows: int = STR_CHUNK_ROWS) -> Iterator[str]:
+    """Same as ``np_arr_to_str`` but yields the text in chunks of ``chunk_rows`` rows. Chunks have no leading or
+    trailing newline, joining them with newlines gives the same text as ``np_arr_to_str``."""
+    if arr.ndim == 1:
+        arr = arr.reshape((1, arr.size))
+
+    if fmt.count('%') == 1:
+        fmt = ' '.join([fmt] * arr.shape[1])
+
+    for start in range(0, arr.shape[0], chunk_rows):
+        block = arr[start:start + chunk_rows]
+        # tolist() converts to Python scalars in one go, much faster than formatting numpy scalars
+        yield '\n'.join([fmt] * block.shape[0]) % tuple(block.ravel().tolist())
+
+
+def np_struct_arr_to_str_chunks(arr: NDArray, fmt: str, chunk_rows: int = STR_CHUNK_ROWS) -> Iterator[str]:
+    """Same as ``np_arr_to_str_chunks`` for a structured array. The fields are stacked as columns one chunk at a
+    time, so a 2D copy of the whole array is never created."""
+    for start in range(0, len(arr), chunk_rows):
+        block = arr[start:start + chunk_rows]
+        block_2d = numpy.column_stack([block[name] for name in block.dtype.names])
+        yield from np_arr_to_str_chunks(block_2d, fmt, chunk_rows)
+
+
+def iter_str_lines(_str: str, chunk_size: int = 1 << 20):
+    """Iterate over the lines of ``_str`` splitting it in chunks of about ``chunk_size`` characters, so the
+    whole string is never held as a list of lines at once."""
+    start = 0
+    str_len = len(_str)
+    while start < str_len:
+        end = _str.find("\n", start + chunk_size)
+        if end == -1:
+            end = str_len
+
+        yield from _str[start:end].splitlines()
+        start = end + 1
+
+
+def np_str_to_struct_arr(_str: str, struct_dtype: numpy.dtype, chunk_size: int = 1 << 20) -> NDArray:
+    """Parse whitespace-separated rows of numbers into a structured array. Feeds the lines to ``np.loadtxt`` in
+    chunks instead of wrapping the string in a ``StringIO``, which keeps a 4-bytes-per-char copy of the whole
+    text alive while parsing."""
+    return numpy.loadtxt(iter_str_lines(_str, chunk_size), dtype=struct_dtype, ndmin=1)
+
+
+def np_str_to_arr(_str: str, dtype: numpy.dtype, delimiter: str = ",") -> NDArray:
+    """Parse rows of numbers separated by ``delimiter`` into a 2D array with ``np.loadtxt``, skipping blank lines.
+    Raises ``ValueError`` if the rows have different numbers of values or a value can't be converted to ``dtype``."""
+    lines = _str.strip().splitlines()
+    if not lines:
+        return numpy.empty((0, 0), dtype=dtype)
+
+    with warnings.catch_warnings():
+        # Older numpy versions warn and parse integers through float instead of raising
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            try:
+                return numpy.loadtxt(lines, dtype=dtype, delimiter=delimiter, comments=None, ndmin=2)
+            except ValueError:
+                # Lines with only whitespace are not skipped when there is a delimiter
+                lines = [line for line in lines if line.strip()]
+                return numpy.loadtxt(lines, dtype=dtype, delimiter=delimiter, comments=None, ndmin=2)
+        except DeprecationWarning as e:
+            raise ValueError(str(e)) from None
+
+
+def np_str_to_values(_str: str, dtype: numpy.dtype, sep: str = " ") -> NDArray:
+    """Parse numbers separated by ``sep`` into a 1D array with ``np.fromstring``. A space separator matches any
+    whitespace. Raises ``ValueError`` if the text has anything other than numbers."""
+    if not _str.strip():
+        # fromstring returns [-1] for text with only whitespace
+        return numpy.empty(0, dtype=dtype)
+
+    with warnings.catch_warnings():
+        # Older numpy versions warn and return the values read so far instead of raising
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return numpy.fromstring(_str, dtype=dtype, sep=sep)
+        except DeprecationWarning as e:
+            raise ValueError(str(e)) from None
 
 
 def get_matrix_without_scale(matrix: Matrix) -> Matrix:
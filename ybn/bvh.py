@@ -0,0 +1,265 @@
+"""
+Bounding volume hierarchy and octant generation for collision geometry.
+"""
+
+from bisect import bisect_left
+import numpy as np
+from numpy.typing import NDArray
+from typing import NamedTuple
+
+DEFAULT_BVH_LEAF_SIZE = 4
+BVH_NUM_BINS = 16
+
+
+class BVH(NamedTuple):
+    node_min: NDArray[np.float64]
+    """(K, 3) minimum corner of each node. Nodes are in breadth-first order, node 0 is the root."""
+    node_max: NDArray[np.float64]
+    """(K, 3) maximum corner of each node."""
+    node_children: NDArray[np.int32]
+    """(K, 2) left and right child of each node, -1 for leaves."""
+    node_first: NDArray[np.int32]
+    """(K,) index into ``prim_order`` of the first primitive of each leaf, -1 for inner nodes."""
+    node_count: NDArray[np.int32]
+    """(K,) number of primitives of each leaf, 0 for inner nodes."""
+    prim_order: NDArray[np.int32]
+    """(N,) primitive indices grouped by leaf, leaves are ordered left to right."""
+
+
+def get_segment_positions(starts: NDArray[np.int64], counts: NDArray[np.int64]) -> NDArray[np.int64]:
+    """Get the concatenated positions of the ranges ``starts[i]:starts[i] + counts[i]``."""
+    offsets = np.cumsum(counts) - counts
+    return np.arange(counts.sum()) - np.repeat(offsets - starts, counts)
+
+
+def get_surface_areas(bounds_min: NDArray[np.float64], bounds_max: NDArray[np.float64]) -> NDArray[np.float64]:
+    extents = bounds_max - bounds_min
+    x, y, z = extents[..., 0], extents[..., 1], extents[..., 2]
+    return 2 * (x * y + y * z + z * x)
+
+
+def build_sah_bvh(
+    prim_min: NDArray,
+    prim_max: NDArray,
+    leaf_size: int = DEFAULT_BVH_LEAF_SIZE,
+    num_bins: int = BVH_NUM_BINS
+) -> BVH:
+    """Build a binary BVH over the primitive bounding boxes ``prim_min``/``prim_max``, splitting nodes with more
+    than ``leaf_size`` primitives using the surface area heuristic (SAH) over ``num_bins`` centroid bins along
+    the longest axis. All nodes of a level are split at once, so the build runs in numpy per level instead of
+    per node."""
+    prim_min = np.asarray(prim_min, dtype=np.float64).reshape((-1, 3))
+    prim_max = np.asarray(prim_max, dtype=np.float64).reshape((-1, 3))
+    num_prims = len(prim_min)
+    leaf_size = max(leaf_size, 1)
+
+    prim_order = np.arange(num_prims, dtype=np.int32)
+    # Primitive bounds and centroids are kept in the same order as prim_order, so each level reads nearby memory
+    cur_min = prim_min.copy()
+    cur_max = prim_max.copy()
+    cur_cent = (prim_min + prim_max) * 0.5
+
+    level_min, level_max, level_children, level_first, level_count = [], [], [], [], []
+    num_nodes = 0
+
+    # Nodes of the current level, as ranges of prim_order
+    starts = np.zeros(1 if num_prims > 0 else 0, dtype=np.int64)
+    counts = np.full(len(starts), num_prims, dtype=np.int64)
+
+    while len(starts) > 0:
+        num_level_nodes = len(starts)
+        offsets = np.cumsum(counts) - counts
+        positions = get_segment_positions(starts, counts)
+        level_min.append(np.minimum.reduceat(cur_min[positions], offsets))
+        level_max.append(np.maximum.reduceat(cur_max[positions], offsets))
+
+        is_leaf = counts <= leaf_size
+        children = np.full((num_level_nodes, 2), -1, dtype=np.int32)
+        level_children.append(children)
+        level_first.append(np.where(is_leaf, starts, -1).astype(np.int32))
+        level_count.append(np.where(is_leaf, counts, 0).astype(np.int32))
+
+        split = np.flatnonzero(~is_leaf)
+        num_split = len(split)
+        first_child = num_nodes + num_level_nodes
+        children[split] = first_child + np.arange(num_split * 2, dtype=np.int32).reshape((-1, 2))
+        num_nodes += num_level_nodes
+        if num_split == 0:
+            break
+
+        starts = starts[split]
+        counts = counts[split]
+        offsets = np.cumsum(counts) - counts
+        positions = get_segment_positions(starts, counts)
+        node_ids = np.repeat(np.arange(num_split), counts)
+        node_min = cur_min[positions]
+        node_max = cur_max[positions]
+        cent = cur_cent[positions]
+
+        # Bin the centroids along the longest axis of the centroid bounds
+        cent_min = np.minimum.reduceat(cent, offsets)
+        cent_extent = np.maximum.reduceat(cent, offsets) - cent_min
+        axis = np.argmax(cent_extent, axis=1)
+        axis_min = cent_min[np.arange(num_split), axis]
+        axis_extent = cent_extent[np.arange(num_split), axis]
+        scale = np.divide(num_bins, axis_extent, out=np.zeros(num_split), where=axis_extent > 0)
+        prim_axis = axis[node_ids]
+        bins = ((cent[np.arange(len(positions)), prim_axis] - axis_min[node_ids]) * scale[node_ids]).astype(np.int64)
+        bins = np.minimum(bins, num_bins - 1)
+
+        # Bounds and primitive count of each bin
+        keys = node_ids * num_bins + bins
+        key_order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[key_order]
+        group_starts = np.flatnonzero(np.diff(sorted_keys, prepend=-1))
+        group_keys = sorted_keys[group_starts]
+        bin_min = np.full((num_split * num_bins, 3), np.inf)
+        bin_max = np.full((num_split * num_bins, 3), -np.inf)
+        bin_min[group_keys] = np.minimum.reduceat(node_min[key_order], group_starts)
+        bin_max[group_keys] = np.maximum.reduceat(node_max[key_order], group_starts)
+        bin_min = bin_min.reshape((num_split, num_bins, 3))
+        bin_max = bin_max.reshape((num_split, num_bins, 3))
+        bin_count = np.bincount(keys, minlength=num_split * num_bins).reshape((num_split, num_bins))
+
+        # SAH cost of splitting after each bin
+        left_count = np.cumsum(bin_count, axis=1)[:, :-1]
+        right_count = counts[:, None] - left_count
+        with np.errstate(invalid="ignore"):
+            left_area = get_surface_areas(np.minimum.accumulate(bin_min, axis=1),
+                                          np.maximum.accumulate(bin_max, axis=1))[:, :-1]
+            right_area = get_surface_areas(np.minimum.accumulate(bin_min[:, ::-1], axis=1)[:, ::-1],
+                                           np.maximum.accumulate(bin_max[:, ::-1], axis=1)[:, ::-1])[:, 1:]
+            cost = left_count * left_area + right_count * right_area
+        cost[(left_count == 0) | (right_count == 0)] = np.inf
+        best_bin = np.argmin(cost, axis=1)
+        has_split = np.isfinite(cost[np.arange(num_split), best_bin])
+
+        # Nodes without a valid split (all centroids in one bin) are split in half
+        goes_right = np.where(has_split[node_ids], bins > best_bin[node_ids],
+                              np.arange(len(positions)) - offsets[node_ids] >= counts[node_ids] // 2)
+        partition = np.argsort(node_ids * 2 + goes_right, kind="stable")
+        prim_order[positions] = prim_order[positions[partition]]
+        cur_min[positions] = node_min[partition]
+        cur_max[positions] = node_max[partition]
+        cur_cent[positions] = cent[partition]
+
+        left_counts = counts - np.bincount(node_ids, weights=goes_right, minlength=num_split).astype(np.int64)
+        starts = np.stack((starts, starts + left_counts), axis=1).reshape(-1)
+        counts = np.stack((left_counts, counts - left_counts), axis=1).reshape(-1)
+
+    if num_nodes == 0:
+        return BVH(np.empty((0, 3)), np.empty((0, 3)), np.empty((0, 2), dtype=np.int32),
+                   np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), prim_order)
+
+    return BVH(np.concatenate(level_min), np.concatenate(level_max), np.concatenate(level_children),
+               np.concatenate(level_first), np.concatenate(level_count), prim_order)
+
+
+def validate_bvh(bvh: BVH, prim_min: NDArray, prim_max: NDArray, leaf_size: int = DEFAULT_BVH_LEAF_SIZE):
+    """Check that ``bvh`` is a valid hierarchy over the primitive bounding boxes. Raises ``ValueError`` describing
+    the first problem found."""
+    prim_min = np.asarray(prim_min, dtype=np.float64).reshape((-1, 3))
+    prim_max = np.asarray(prim_max, dtype=np.float64).reshape((-1, 3))
+    num_prims = len(prim_min)
+    num_nodes = len(bvh.node_children)
+
+    if not np.array_equal(np.sort(bvh.prim_order), np.arange(num_prims)):
+        raise ValueError("Primitive order is not a permutation of the primitives")
+    if num_nodes == 0:
+        if num_prims > 0:
+            raise ValueError("BVH has no nodes")
+        return
+
+    children = bvh.node_children
+    is_leaf = children[:, 0] == -1
+    inner = np.flatnonzero(~is_leaf)
+    leaves = np.flatnonzero(is_leaf)
+
+    if np.any(children[leaves, 1] != -1):
+        raise ValueError("Leaf node has a right child")
+    child_ids = children[inner].reshape(-1)
+    if np.any(child_ids <= np.repeat(inner, 2)) or np.any(child_ids >= num_nodes):
+        raise ValueError("Inner node has an invalid child")
+    if not np.array_equal(np.sort(child_ids), np.arange(1, num_nodes)):
+        raise ValueError("Nodes are not referenced exactly once")
+
+    counts = bvh.node_count[leaves]
+    if np.any(counts < 1) or np.any(counts > max(leaf_size, 1)):
+        raise ValueError(f"Leaf node primitive count is outside 1 - {leaf_size}")
+    leaf_order = leaves[np.argsort(bvh.node_first[leaves], kind="stable")]
+    expected_first = np.cumsum(bvh.node_count[leaf_order]) - bvh.node_count[leaf_order]
+    if not np.array_equal(bvh.node_first[leaf_order], expected_first) or counts.sum() != num_prims:
+        raise ValueError("Leaf primitive ranges do not cover the primitives")
+
+    prim_leaf = np.repeat(leaf_order, bvh.node_count[leaf_order])
+    prims = bvh.prim_order
+    if np.any(bvh.node_min[prim_leaf] > prim_min[prims]) or np.any(bvh.node_max[prim_leaf] < prim_max[prims]):
+        raise ValueError("Leaf node bounds do not contain their primitives")
+
+    parents = np.repeat(inner, 2)
+    outside = (bvh.node_min[parents] > bvh.node_min[child_ids]) | (bvh.node_max[parents] < bvh.node_max[child_ids])
+    if np.any(outside):
+        raise ValueError("Inner node bounds do not contain their children")
+
+
+def get_octant_vertices(vertices: NDArray[np.float32], octant: int) -> list[int]:
+    """Get the indices of the vertices furthest out in the direction of ``octant``: vertices where no other vertex is
+    further out or level on all three axes. Bits 0, 1 and 2 of ``octant`` select the positive X, Y and Z directions.
+    Of identical vertices only the first is included."""
+    signs = np.array([1 if octant & (1 << axis) else -1 for axis in range(3)], dtype=np.float64)
+    points = vertices.astype(np.float64) * signs
+
+    # Visit vertices by descending X so only the Y/Z staircase of visited vertices has to be checked
+    order = np.lexsort((np.arange(len(points)), -points[:, 2], -points[:, 1], -points[:, 0]))
+    front_y: list[float] = []  # Ascending
+    front_z: list[float] = []  # Descending
+    indices = []
+    for i, y, z in zip(order.tolist(), points[order, 1].tolist(), points[order, 2].tolist()):
+        pos = bisect_left(front_y, y)
+        if pos < len(front_y) and front_z[pos] >= z:
+            continue
+
+        end = pos + 1 if pos < len(front_y) and front_y[pos] == y else pos
+        start = pos
+        while start > 0 and front_z[start - 1] <= z:
+            start -= 1
+        front_y[start:end] = [y]
+        front_z[start:end] = [z]
+        indices.append(i)
+
+    indices.sort()
+    return indices
+
+
+def get_octants(vertices: NDArray[np.float32]) -> dict[int, list[int]]:
+    """Get the vertex indices of each of the 8 octants of a ``BoundGeometry``."""
+    if len(vertices) == 0:
+        return {}
+
+    return {octant: get_octant_vertices(vertices, octant) for octant in range(8)}
+
+
+if __name__ == "__main__":
+    # Benchmark: python ybn/bvh.py
+    import timeit
+
+    rng = np.random.default_rng(0)
+    for num_tris in (10_000, 65_000, 500_000):
+        # Triangles scattered over a terrain-like height field
+        centers = rng.uniform(0, 1000, (num_tris, 3)) * (1, 1, 0.05)
+        tri_verts = centers[:, None, :] + rng.normal(0, 0.5, (num_tris, 3, 3))
+        tri_min, tri_max = tri_verts.min(axis=1), tri_verts.max(axis=1)
+
+        for leaf_size in (1, 4, 16):
+            bvh = build_sah_bvh(tri_min, tri_max, leaf_size)
+            validate_bvh(bvh, tri_min, tri_max, leaf_size)
+            t = min(timeit.repeat(lambda: build_sah_bvh(tri_min, tri_max, leaf_size), number=1, repeat=3))
+            inner = bvh.node_children[:, 0] != -1
+            sah_cost = (get_surface_areas(bvh.node_min, bvh.node_max) * np.where(inner, 1, bvh.node_count)).sum()
+            sah_cost /= get_surface_areas(bvh.node_min[0], bvh.node_max[0])
+            print(f"{num_tris:>7} tris, leaf size {leaf_size:>2}: {t * 1000:8.1f} ms, "
+                  f"{len(bvh.node_children):>7} nodes, SAH cost {sah_cost:.1f}")
+
+    vertices = rng.normal(0, 10, (32767, 3)).astype(np.float32)
+    t = min(timeit.repeat(lambda: get_octants(vertices), number=1, repeat=3))
+    print(f"octants, {len(vertices)} verts: {t * 1000:.1f} ms")
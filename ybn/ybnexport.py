@@ -2,6 +2,7 @@ import bpy
 from mathutils import Vector, Matrix
 from typing import Optional, TypeVar, Callable, Type
 import numpy as np
+from numpy.typing import NDArray
 
 from ..sollumz_helper import get_parent_inverse
 from ..tools.blenderhelper import get_pose_inverse, remove_number_suffix
@@ -17,7 +18,8 @@ from ..cwxml.bound import (
     BoundCapsule,
     BoundCylinder,
     BoundDisc,
-    PolyTriangle,
+    PolyTriangleArray,
+    POLY_TRIANGLE_DTYPE,
     PolyBox,
     PolySphere,
     PolyCapsule,
@@ -33,6 +35,7 @@ from ..sollumz_properties import MaterialType, SOLLUMZ_UI_NAMES, SollumType, BOU
 from ..sollumz_preferences import get_export_settings
 from .. import logger
 from .properties import CollisionMatFlags, RDRBoundFlags, get_collision_mat_raw_flags, BoundFlags
+from .bvh import build_sah_bvh, get_octants
 from ..cwxml import bound
 
 T_Bound = TypeVar("T_Bound", bound=Bound)
@@ -256,6 +259,12 @@ def create_bound_geom_xml_data(geom_xml: BoundGeometry | BoundGeometryBVH, obj:
     if current_game == SollumzGame.GTA:
         geom_xml.geometry_center = geometry_center
 
+    export_settings = get_export_settings()
+    if export_settings.build_collision_bvh:
+        sort_poly_triangles_by_bvh(geom_xml, export_settings.collision_bvh_leaf_size)
+        if isinstance(geom_xml, BoundGeometry):
+            geom_xml.octants = get_octants(geom_xml.vertices)
+
     num_vertices = len(geom_xml.vertices)
 
     if num_vertices == 0:
@@ -269,27 +278,43 @@ def create_bound_geom_xml_data(geom_xml: BoundGeometry | BoundGeometryBVH, obj:
 
 def center_verts_to_geometry(geom_xml: BoundGeometry | BoundGeometryBVH):
     """Position verts such that the origin is at their center of geometry. Returns the center of geometry."""
-    verts = np.array([tuple(v) for v in geom_xml.vertices], dtype=np.float32)
+    verts = geom_xml.vertices
 
     if current_game == SollumzGame.GTA:
         geom_center = Vector(np.average(verts, axis=0))
     elif current_game == SollumzGame.RDR:
         geom_center = get_bound_center_from_bounds(geom_xml.box_min, geom_xml.box_max)
-    geom_xml.vertices = [
-        Vector(vert) - geom_center for vert in geom_xml.vertices]
+    geom_center_arr = np.array(geom_center, dtype=np.float32)
+    geom_xml.vertices = verts - geom_center_arr
 
     if isinstance(geom_xml, BoundGeometry):
-        geom_xml.vertices_2 = [
-            Vector(vert) - geom_center for vert in geom_xml.vertices_2]
+        geom_xml.vertices_2 = geom_xml.vertices_2 - geom_center_arr
 
     if current_game == SollumzGame.GTA:
         return Vector(geom_center)
 
 
+def sort_poly_triangles_by_bvh(geom_xml: BoundGeometry | BoundGeometryBVH, leaf_size: int):
+    """Reorder the poly triangles of ``geom_xml`` along the leaves of a SAH BVH built over their bounds, so triangles
+    close in space are close in the polygon list. The triangles are placed before the other poly primitives."""
+    triangle_arrays = [poly.data for poly in geom_xml.polygons if isinstance(poly, PolyTriangleArray)]
+    if not triangle_arrays:
+        return
+
+    triangles = np.concatenate(triangle_arrays)
+    tri_verts = geom_xml.vertices[np.stack((triangles["v1"], triangles["v2"], triangles["v3"]), axis=1)]
+    bvh = build_sah_bvh(tri_verts.min(axis=1), tri_verts.max(axis=1), leaf_size)
+
+    primitives = [poly for poly in geom_xml.polygons if not isinstance(poly, PolyTriangleArray)]
+    geom_xml.polygons = [PolyTriangleArray(triangles[bvh.prim_order]), *primitives]
+
+
 def create_bound_xml_polys(geom_xml: BoundGeometry | BoundGeometryBVH, obj: bpy.types.Object):
     # Create mappings of vertices and materials by index to build the new geom_xml vertices
     ind_by_vert: dict[tuple, int] = {}
     ind_by_mat: dict[bpy.types.Material, int] = {}
+    vertices: list[Vector] = []
+    vertex_colors: list[tuple[int, int, int, int]] = []
 
     def get_vert_index(vert: Vector, vert_color: Optional[tuple[int, int, int, int]] = None):
         default_vert_color = (255, 255, 255, 255)
@@ -297,12 +322,12 @@ def create_bound_xml_polys(geom_xml: BoundGeometry | BoundGeometryBVH, obj: bpy.
         if current_game == SollumzGame.GTA:
             # These are safety checks in case the user mixed poly primitives and poly meshes with color attributes
             # This doesn't occur in original .ybns, if they have vertex colors, only poly triangles (meshes) are used.
-            if vert_color is not None and len(geom_xml.vertex_colors) != len(geom_xml.vertices):
+            if vert_color is not None and len(vertex_colors) != len(vertices):
                 # This vertex has color but previous ones didn't, assign a default color to all previous vertices
-                for _ in range(len(geom_xml.vertex_colors), len(geom_xml.vertices)):
-                    geom_xml.vertex_colors.append(default_vert_color)
+                for _ in range(len(vertex_colors), len(vertices)):
+                    vertex_colors.append(default_vert_color)
 
-            if vert_color is None and len(geom_xml.vertex_colors) != 0:
+            if vert_color is None and len(vertex_colors) != 0:
                 # There are already vertex colors in this geometry, assign a default color
                 vert_color = default_vert_color
 
@@ -317,9 +342,9 @@ def create_bound_xml_polys(geom_xml: BoundGeometry | BoundGeometryBVH, obj: bpy.
 
         vert_ind = len(ind_by_vert)
         ind_by_vert[vertex_id] = vert_ind
-        geom_xml.vertices.append(Vector(vert))
+        vertices.append(vert)
         if vert_color is not None and current_game == SollumzGame.GTA:
-            geom_xml.vertex_colors.append(vert_color)
+            vertex_colors.append(vert_color)
 
         return vert_ind
 
@@ -335,16 +360,20 @@ def create_bound_xml_polys(geom_xml: BoundGeometry | BoundGeometryBVH, obj: bpy.
 
         return mat_ind
 
-    # If the bound object is a mesh, just convert its mesh data into triangles
     if isinstance(geom_xml, BoundGeometry):
+        # If the bound object is a mesh, just convert its mesh data into triangles
         create_bound_geom_xml_triangles(obj, geom_xml, get_vert_index, get_mat_index)
-        return
+    else:
+        # For empty bound objects with children, create the bound polygons from its children
+        for child in obj.children_recursive:
+            if child.sollum_type not in BOUND_POLYGON_TYPES:
+                continue
+            create_bound_xml_poly_shape(child, geom_xml, get_vert_index, get_mat_index)
 
-    # For empty bound objects with children, create the bound polygons from its children
-    for child in obj.children_recursive:
-        if child.sollum_type not in BOUND_POLYGON_TYPES:
-            continue
-        create_bound_xml_poly_shape(child, geom_xml, get_vert_index, get_mat_index)
+    geom_xml.vertices = np.array(vertices, dtype=np.float32).reshape((-1, 3))
+    if current_game == SollumzGame.GTA:
+        # Colors are truncated to integers, same as int()
+        geom_xml.vertex_colors = np.array(vertex_colors, dtype=np.float64).reshape((-1, 4)).astype(np.uint8)
 
 
 def create_bound_geom_xml_triangles(obj: bpy.types.Object, geom_xml: BoundGeometry, get_vert_index: Callable[[Vector], int], get_mat_index: Callable[[bpy.types.Material], int]):
@@ -430,53 +459,74 @@ def create_export_mesh(obj: bpy.types.Object):
 
 
 def create_poly_xml_triangles(mesh: bpy.types.Mesh, transforms: Matrix, get_vert_index: Callable[[Vector], int], get_mat_index: Callable[[bpy.types.Material], int]):
-    """Create all bound polygon triangle XML objects for this BoundGeometry/BVH."""
-    triangles: list[PolyTriangle] = []
-
+    """Create all bound polygon triangles for this BoundGeometry/BVH, as a single ``PolyTriangleArray``."""
+    num_tris = len(mesh.loop_triangles)
+    if num_tris == 0:
+        return []
+
+    tri_loops = np.empty(num_tris * 3, dtype=np.uint32)
+    mesh.loop_triangles.foreach_get("loops", tri_loops)
+    tri_verts = np.empty(num_tris * 3, dtype=np.uint32)
+    mesh.loop_triangles.foreach_get("vertices", tri_verts)
+    tri_mat_inds = np.empty(num_tris, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("material_index", tri_mat_inds)
+
+    positions = get_transformed_vertex_positions(mesh, transforms)
+    # Vertex of each triangle corner, positions followed by colors as raw bytes so rows can be compared with np.unique
+    corners = [positions[tri_verts]]
+
+    colors = None
     if current_game == SollumzGame.GTA:
         color_attr = mesh.color_attributes[0] if len(mesh.color_attributes) > 0 else None
-        if color_attr is not None and (color_attr.domain != "CORNER" or color_attr.data_type != "BYTE_COLOR"):
-            color_attr = None
-
-        for tri in mesh.loop_triangles:
-            triangle = PolyTriangle()
-            mat = mesh.materials[tri.material_index]
-            triangle.material_index = get_mat_index(mat)
-
-            tri_indices: list[int] = []
-
-            for loop_idx in tri.loops:
-                loop = mesh.loops[loop_idx]
-
-                vert_pos = transforms @ mesh.vertices[loop.vertex_index].co
-                vert_color = color_attr.data[loop_idx].color_srgb if color_attr is not None else None
-                if vert_color is not None:
-                    vert_color = (vert_color[0] * 255, vert_color[1] * 255, vert_color[2] * 255, vert_color[3] * 255)
-                vert_ind = get_vert_index(vert_pos, vert_color=vert_color)
-
-                tri_indices.append(vert_ind)
-
-            triangle.v1 = tri_indices[0]
-            triangle.v2 = tri_indices[1]
-            triangle.v3 = tri_indices[2]
-
-            triangles.append(triangle)
-
-    elif current_game == SollumzGame.RDR:
-        for tri in mesh.loop_triangles:
-            mat = mesh.materials[tri.material_index]
-            tri_indices: list[int] = []
-
-            for loop_idx in tri.loops:
-                loop = mesh.loops[loop_idx]
-                vert_pos = transforms @ mesh.vertices[loop.vertex_index].co
-                vert_ind = get_vert_index(vert_pos)
-                tri_indices.append(vert_ind)
-
-            tri_poly_string = f"Tri {get_mat_index(mat)} {tri_indices[0]} {tri_indices[1]} {tri_indices[2]}"
-            triangles.append(tri_poly_string)
-   
-    return triangles
+        if color_attr is not None and color_attr.domain == "CORNER" and color_attr.data_type == "BYTE_COLOR":
+            colors = np.empty(len(mesh.loops) * 4, dtype=np.float32)
+            color_attr.data.foreach_get("color_srgb", colors)
+            colors = colors.reshape((-1, 4)).astype(np.float64) * 255
+            corners.append(colors[tri_loops])
+
+    corner_rows = np.ascontiguousarray(np.hstack([c.view(np.uint8).reshape((len(tri_verts), -1)) for c in corners]))
+    corner_rows = corner_rows.view(np.dtype((np.void, corner_rows.shape[1]))).reshape(-1)
+    _, first_corners, corner_verts = np.unique(corner_rows, return_index=True, return_inverse=True)
+
+    # Add the vertices in the order they are first used by the triangles, same as adding them one corner at a time
+    vert_inds = np.empty(len(first_corners), dtype=np.uint32)
+    for i in np.argsort(first_corners).tolist():
+        corner = first_corners[i]
+        vert_color = tuple(colors[tri_loops[corner]].tolist()) if colors is not None else None
+        vert_inds[i] = get_vert_index(Vector(positions[tri_verts[corner]]), vert_color=vert_color)
+
+    used_mat_inds, first_tris = np.unique(tri_mat_inds, return_index=True)
+    mat_xml_inds = np.zeros(used_mat_inds.max() + 1, dtype=np.uint32)
+    for mat_ind in used_mat_inds[np.argsort(first_tris)].tolist():
+        mat_xml_inds[mat_ind] = get_mat_index(mesh.materials[mat_ind])
+
+    triangles = np.zeros(num_tris, dtype=POLY_TRIANGLE_DTYPE)
+    triangles["m"] = mat_xml_inds[tri_mat_inds]
+    tri_vert_inds = vert_inds[corner_verts.reshape(-1)].reshape((num_tris, 3))
+    triangles["v1"] = tri_vert_inds[:, 0]
+    triangles["v2"] = tri_vert_inds[:, 1]
+    triangles["v3"] = tri_vert_inds[:, 2]
+
+    return [PolyTriangleArray(triangles)]
+
+
+def get_transformed_vertex_positions(mesh: bpy.types.Mesh, transforms: Matrix) -> NDArray[np.float32]:
+    """Get the positions of all vertices of ``mesh`` multiplied by ``transforms``. Computed like ``transforms @ co``
+    in mathutils (float products summed as doubles), so the results are the same as transforming each vertex."""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape((-1, 3))
+
+    matrix = np.array(transforms, dtype=np.float32)
+    positions = np.empty_like(co)
+    for row in range(3):
+        dot = (co[:, 0] * matrix[row, 0]).astype(np.float64)
+        dot += co[:, 1] * matrix[row, 1]
+        dot += co[:, 2] * matrix[row, 2]
+        dot += matrix[row, 3]
+        positions[:, row] = dot
+
+    return positions
 
 
 def create_poly_box_xml(obj: bpy.types.Object, transforms: Matrix, get_vert_index: Callable[[Vector], int], get_mat_index: Callable[[bpy.types.Material], int]):
@@ -17,7 +17,8 @@ from ..cwxml.bound import (
     PolySphere,
     PolyCapsule,
     PolyCylinder,
-    PolyTriangle,
+    PolyTriangleArray,
+    POLY_TRIANGLE_DTYPE,
     YBN,
     Polygon,
     Material as ColMaterial
@@ -32,8 +33,10 @@ from mathutils import Matrix, Vector
 
 current_game = SollumzGame.GTA
 
-def import_ybn(filepath):
-    ybn_xml: BoundFile = YBN.from_xml_file(filepath)
+def import_ybn(filepath, ybn_xml: Optional[BoundFile] = None):
+    """Import the YBN at ``filepath``. ``ybn_xml`` can be given if the file has already been parsed."""
+    if ybn_xml is None:
+        ybn_xml = YBN.from_xml_file(filepath)
     name = os.path.basename(
         filepath.replace(YBN.file_extension, ""))
     global current_game
@@ -221,7 +224,7 @@ def create_bvh_obj(bvh_xml: BoundGeometryBVH):
 
     triangles = get_poly_triangles(bvh_xml.polygons)
 
-    if triangles:
+    if len(triangles) > 0:
         mesh = create_bound_mesh_data(bvh_xml.vertices, triangles, bvh_xml.vertex_colors, materials)
         bound_geom_obj = create_blender_object(SollumType.BOUND_POLY_TRIANGLE, object_data=mesh, sollum_game_type=current_game)
         if current_game == SollumzGame.GTA:
@@ -285,7 +288,7 @@ def set_bound_col_material_properties(bound_xml: Bound, mat: bpy.types.Material)
 def create_bvh_polys(bvh: BoundGeometryBVH, materials: list[bpy.types.Material], bvh_obj: bpy.types.Object):
     if current_game == SollumzGame.GTA:
         for poly in bvh.polygons:
-            if type(poly) is PolyTriangle:
+            if isinstance(poly, PolyTriangleArray):
                 continue
 
             poly_obj = poly_to_obj(poly, materials, bvh.vertices)
@@ -295,7 +298,7 @@ def create_bvh_polys(bvh: BoundGeometryBVH, materials: list[bpy.types.Material],
             poly_obj.parent = bvh_obj
     elif current_game == SollumzGame.RDR:
         for poly in bvh.polygons:
-            if poly[0] == 'Tri':
+            if isinstance(poly, PolyTriangleArray):
                 continue
 
             poly_obj = poly_to_obj(poly, materials, bvh.vertices)
@@ -326,15 +329,15 @@ def create_poly_box(poly, materials, vertices):
     obj = init_poly_obj(poly, SollumType.BOUND_POLY_BOX, materials)
 
     if current_game == SollumzGame.GTA:
-        v1 = vertices[poly.v1]
-        v2 = vertices[poly.v2]
-        v3 = vertices[poly.v3]
-        v4 = vertices[poly.v4]
+        v1 = Vector(vertices[poly.v1])
+        v2 = Vector(vertices[poly.v2])
+        v3 = Vector(vertices[poly.v3])
+        v4 = Vector(vertices[poly.v4])
     elif current_game == SollumzGame.RDR:
-        v1 = vertices[poly[2]]
-        v2 = vertices[poly[3]]
-        v3 = vertices[poly[4]]
-        v4 = vertices[poly[5]]
+        v1 = Vector(vertices[poly[2]])
+        v2 = Vector(vertices[poly[3]])
+        v3 = Vector(vertices[poly[4]])
+        v4 = Vector(vertices[poly[5]])
     center = (v1 + v2 + v3 + v4) * 0.25
 
     # Get edges from the 4 opposing corners of the box
@@ -404,23 +407,23 @@ def create_poly_sphere(poly, materials, vertices):
     sphere = init_poly_obj(poly, SollumType.BOUND_POLY_SPHERE, materials)
     if current_game == SollumzGame.GTA:
         sphere.bound_radius = poly.radius
-        sphere.location = vertices[poly.v]
+        sphere.location = Vector(vertices[poly.v])
     elif current_game == SollumzGame.RDR:
         sphere.bound_radius = poly[3]
-        sphere.location = vertices[poly[2]]
+        sphere.location = Vector(vertices[poly[2]])
     return sphere
 
 def create_poly_capsule(poly, materials, vertices):
     capsule = init_poly_obj(poly, SollumType.BOUND_POLY_CAPSULE, materials)
     if current_game == SollumzGame.GTA:
-        v1 = vertices[poly.v1]
-        v2 = vertices[poly.v2]
+        v1 = Vector(vertices[poly.v1])
+        v2 = Vector(vertices[poly.v2])
         rot = get_direction_of_vectors(v1, v2)
         capsule.bound_radius = poly.radius * 2
         capsule.bound_length = ((v1 - v2).length + (poly.radius * 2)) / 2
     elif current_game == SollumzGame.RDR:
-        v1 = vertices[poly[2]]
-        v2 = vertices[poly[3]]
+        v1 = Vector(vertices[poly[2]])
+        v2 = Vector(vertices[poly[3]])
         rot = get_direction_of_vectors(v1, v2)
         capsule.bound_radius = poly[4] * 2
         capsule.bound_length = ((v1 - v2).length + (poly[4] * 2)) / 2
@@ -433,12 +436,12 @@ def create_poly_capsule(poly, materials, vertices):
 def create_poly_cylinder(poly, materials, vertices):
     cylinder = init_poly_obj(poly, SollumType.BOUND_POLY_CYLINDER, materials)
     if current_game == SollumzGame.GTA:
-        v1 = vertices[poly.v1]
-        v2 = vertices[poly.v2]
+        v1 = Vector(vertices[poly.v1])
+        v2 = Vector(vertices[poly.v2])
         radius = poly.radius
     elif current_game == SollumzGame.RDR:
-        v1 = vertices[poly[2]]
-        v2 = vertices[poly[3]]
+        v1 = Vector(vertices[poly[2]])
+        v2 = Vector(vertices[poly[3]])
         radius = poly[4]
 
     rot = get_direction_of_vectors(v1, v2)
@@ -473,24 +476,34 @@ def poly_to_obj(poly, materials, vertices) -> bpy.types.Object:
         return RDR_POLY_TO_OBJ_MAP[poly[0]](poly, materials, vertices)
 
 
-def get_poly_triangles(polys: list[Polygon]):
-    if current_game == SollumzGame.GTA:
-        return [poly for poly in polys if isinstance(poly, PolyTriangle)]
-    elif current_game == SollumzGame.RDR:
-        return [poly for poly in polys if poly[0] == "Tri"]
+def get_poly_triangles(polys: list[Polygon | PolyTriangleArray]) -> NDArray:
+    """Get all triangles in ``polys`` as a single array of ``POLY_TRIANGLE_DTYPE``."""
+    triangle_arrays = [poly.data for poly in polys if isinstance(poly, PolyTriangleArray)]
+    if not triangle_arrays:
+        return np.empty(0, dtype=POLY_TRIANGLE_DTYPE)
+
+    return np.concatenate(triangle_arrays)
 
 
 def create_bound_mesh_data(
-    vertices: list[Vector],
-    triangles: list[PolyTriangle],
-    vertex_colors: Optional[list[tuple[int, int, int, int]]],
+    vertices: NDArray[np.float32],
+    triangles: NDArray,
+    vertex_colors: Optional[NDArray[np.uint8]],
     materials: list[bpy.types.Material]
 ) -> bpy.types.Mesh:
     mesh = bpy.data.meshes.new(SOLLUMZ_UI_NAMES[SollumType.BOUND_GEOMETRY])
 
     verts, faces, colors = get_bound_geom_mesh_data(vertices, triangles, vertex_colors)
 
-    mesh.from_pydata(verts, [], faces)
+    num_loops = faces.size
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.reshape(-1))
+    mesh.loops.add(num_loops)
+    mesh.loops.foreach_set("vertex_index", faces.reshape(-1))
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, num_loops, 3, dtype=np.int32))
+    mesh.polygons.foreach_set("use_smooth", np.zeros(len(faces), dtype=bool))
+    mesh.update(calc_edges=True)
 
     if colors is not None:
         create_color_attr(mesh, colors)
@@ -502,58 +515,42 @@ def create_bound_mesh_data(
     return mesh
 
 
-def apply_bound_geom_materials(mesh: bpy.types.Mesh, triangles: list[PolyTriangle], materials: list[bpy.types.Material]):
+def apply_bound_geom_materials(mesh: bpy.types.Mesh, triangles: NDArray, materials: list[bpy.types.Material]):
     for mat in materials:
         mesh.materials.append(mat)
 
-    for i, poly_xml in enumerate(triangles):
-        if current_game == SollumzGame.GTA:
-            mesh.polygons[i].material_index = poly_xml.material_index
-        elif current_game == SollumzGame.RDR:
-            mesh.polygons[i].material_index = poly_xml[1]
+    mesh.attributes.new("material_index", type="INT", domain="FACE")
+    mesh.attributes["material_index"].data.foreach_set("value", triangles["m"].astype(np.int32))
 
 
 def get_bound_geom_mesh_data(
-    vertices: list[Vector],
-    triangles: list[PolyTriangle],
-    vertex_colors: Optional[list[tuple[int, int, int, int]]]
-) -> tuple[list, list, Optional[NDArray]]:
-    def _color_to_float(color_int: tuple[int, int, int, int]):
-        return (color_int[0] / 255, color_int[1] / 255, color_int[2] / 255, color_int[3] / 255)
-
-    verts = []
-    verts_dict = {}
-    faces = []
-    colors = [] if vertex_colors else None
-
-    if current_game == SollumzGame.GTA:
-        for poly in triangles:
-            face = []
-            for v in [vertices[poly.v1], vertices[poly.v2], vertices[poly.v3]]:
-                v_tuple = tuple(v)
-                if v_tuple not in verts_dict:
-                    verts_dict[v_tuple] = len(verts)
-                    verts.append(v)
-                face.append(verts_dict[v_tuple])
-            faces.append(face)
-
-            if colors is not None:
-                colors.extend(_color_to_float(vertex_colors[v]) for v in [poly.v1, poly.v2, poly.v3])
-    elif current_game == SollumzGame.RDR:
-        for poly in triangles:
-                face = []
-                for v in [vertices[poly[2]], vertices[poly[3]], vertices[poly[4]]]:
-                    v_tuple = tuple(v)
-                    if v_tuple not in verts_dict:
-                        verts_dict[v_tuple] = len(verts)
-                        verts.append(v)
-                    face.append(verts_dict[v_tuple])
-                faces.append(face)
-
-                if colors is not None:
-                    colors.extend(_color_to_float(vertex_colors[v]) for v in [poly[2], poly[3], poly[4]])
-
-    return verts, faces, np.array(colors, dtype=np.float64) if colors is not None else None
+    vertices: NDArray[np.float32],
+    triangles: NDArray,
+    vertex_colors: Optional[NDArray[np.uint8]]
+) -> tuple[NDArray[np.float32], NDArray[np.int32], Optional[NDArray[np.float64]]]:
+    """Get the vertex positions, faces and face corner colors of the mesh of ``triangles``. Only vertices used by
+    ``triangles`` are included, vertices with the same position are welded and numbered in order of first use."""
+    corner_inds = np.column_stack((triangles["v1"], triangles["v2"], triangles["v3"])).reshape(-1)
+    used_inds, first_corner, corner_to_used = np.unique(corner_inds, return_index=True, return_inverse=True)
+
+    # Weld the used vertices in order of first use. Adding 0.0 welds -0.0 with 0.0, same as comparing tuples.
+    use_order = np.argsort(first_corner, kind="stable")
+    used_verts = vertices[used_inds[use_order]].reshape((-1, 3))
+    _, weld_first, used_to_weld = np.unique(used_verts + 0.0, axis=0, return_index=True, return_inverse=True)
+    weld_order = np.argsort(weld_first, kind="stable")
+    weld_to_vert = np.empty(len(weld_order), dtype=np.int32)
+    weld_to_vert[weld_order] = np.arange(len(weld_order), dtype=np.int32)
+
+    used_to_vert = np.empty(len(used_inds), dtype=np.int32)
+    used_to_vert[use_order] = weld_to_vert[used_to_weld.reshape(-1)]
+    faces = used_to_vert[corner_to_used.reshape(-1)].reshape((-1, 3))
+    verts = used_verts[weld_first[weld_order]]
+
+    colors = None
+    if vertex_colors is not None and len(vertex_colors) > 0:
+        colors = vertex_colors[corner_inds] / 255
+
+    return verts, faces, colors
 
 
 def set_bound_geometry_properties(geom_xml: BoundGeometry, geom_obj: bpy.types.Object):
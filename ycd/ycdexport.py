@@ -2,8 +2,12 @@ import bpy
 from mathutils import Vector, Quaternion
 import math
 import struct
+import numpy as np
+from numpy.typing import NDArray
+from typing import NamedTuple, Optional
 from ..cwxml import clipdictionary as ycdxml
 from ..sollumz_properties import SollumType
+from ..sollumz_preferences import get_export_settings
 from ..tools import jenkhash
 from ..tools.blenderhelper import build_name_bone_map, build_bone_map
 from ..tools.animationhelper import (
@@ -42,19 +46,72 @@ def parse_uv_transform_data_path(data_path: str) -> tuple[int, str]:
     return index, prop
 
 
-TrackFramesData = list[Vector] | list[Quaternion] | list[float]
+TrackFramesData = NDArray[np.float32]
+"""Values of a track at each exported frame. Float tracks are (N,) arrays, Vector3 tracks (N, 3) arrays and Quaternion
+tracks (N, 4) arrays of W, X, Y, Z."""
 SequenceItems = dict[int, dict[Track, TrackFramesData]]
 
 
+def evaluate_fcurve(fcurve: bpy.types.FCurve, frames: NDArray[np.float32]) -> NDArray[np.float32]:
+    """Evaluate ``fcurve`` at each frame of ``frames``. Frames that have a keyframe exactly on them are read directly
+    from the keyframes, only the rest are evaluated one by one."""
+    num_frames = len(frames)
+    keyframe_points = fcurve.keyframe_points
+    if len(keyframe_points) == num_frames and len(fcurve.modifiers) == 0:
+        co = np.empty(num_frames * 2, dtype=np.float32)
+        keyframe_points.foreach_get("co", co)
+        co = co.reshape((num_frames, 2))
+        values = co[:, 1].copy()
+        not_keyed = np.flatnonzero(co[:, 0] != frames)
+    else:
+        values = np.empty(num_frames, dtype=np.float32)
+        not_keyed = np.arange(num_frames)
+
+    evaluate = fcurve.evaluate
+    values[not_keyed] = [evaluate(frame) for frame in frames[not_keyed].tolist()]
+    return values
+
+
+def multiply_quaternions(a: NDArray, b: NDArray) -> NDArray[np.float64]:
+    """Multiply two arrays of W, X, Y, Z quaternions, with the same broadcasting rules as numpy."""
+    aw, ax, ay, az = np.moveaxis(np.asarray(a, dtype=np.float64), -1, 0)
+    bw, bx, by, bz = np.moveaxis(np.asarray(b, dtype=np.float64), -1, 0)
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+
+def rotate_quaternions(rotation: NDArray, quats: NDArray, local: bool = False) -> NDArray[np.float32]:
+    """Rotate ``quats`` by ``rotation`` like ``Quaternion.rotate``, which returns quaternions with a positive W.
+    If ``local`` is True, ``rotation`` is applied in the local space of each quaternion instead."""
+    rotated = multiply_quaternions(quats, rotation) if local else multiply_quaternions(rotation, quats)
+    rotated[rotated[:, 0] < 0] *= -1
+    return rotated.astype(np.float32)
+
+
+def make_quaternions_continuous(quats: NDArray[np.float32]):
+    """Negate quaternions in-place so that the dot product between each frame and the previous one is not negative."""
+    # Each flip also flips the sign of the dot product with the next frame, so a frame is negated if the number of
+    # negative dot products up to it is odd. A zero dot product is never negated and starts the count again.
+    dots = np.einsum("ij,ij->i", quats[:-1], quats[1:])
+    num_flips = np.cumsum(np.concatenate(([0], dots < 0)))
+    num_flips -= np.maximum.accumulate(np.where(np.concatenate(([True], dots == 0)), num_flips, 0))
+    quats[num_flips % 2 == 1] *= -1
+
+
 def sequence_items_from_action(
         action: bpy.types.Action,
         target_id: bpy.types.ID
 ) -> SequenceItems:
     action_frame_range = action.frame_range
     export_frame_count = get_action_export_frame_count(action)
-    def _export_frame_to_action_frame(frame_index: int) -> float:
-        export_last_frame_index = export_frame_count - 1
-        return action_frame_range[0] + (frame_index / export_last_frame_index) * (action_frame_range[1] - action_frame_range[0])
+    export_last_frame_index = export_frame_count - 1
+    export_frames = action_frame_range[0] + (np.arange(export_frame_count) / export_last_frame_index) * \
+        (action_frame_range[1] - action_frame_range[0])
+    export_frames = export_frames.astype(np.float32)
 
     target = get_target_from_id(target_id)
     target_is_armature = isinstance(target_id, bpy.types.Armature)
@@ -101,19 +158,18 @@ def sequence_items_from_action(
                     default_vec = (0.0, 1.0, 0.0)
                 else:
                     default_vec = (0.0, 0.0, 0.0)
-                bone_sequences[track] = [Vector(default_vec) for _ in range(export_frame_count)]
+                bone_sequences[track] = np.tile(np.array(default_vec, dtype=np.float32), (export_frame_count, 1))
             elif track_format == TrackFormat.Quaternion:
-                bone_sequences[track] = [Quaternion((1.0, 0.0, 0.0, 0.0)) for _ in range(export_frame_count)]
+                default_quat = np.array((1.0, 0.0, 0.0, 0.0), dtype=np.float32)
+                bone_sequences[track] = np.tile(default_quat, (export_frame_count, 1))
             elif track_format == TrackFormat.Float:
-                bone_sequences[track] = [0.0] * export_frame_count
+                bone_sequences[track] = np.zeros(export_frame_count, dtype=np.float32)
 
-        track_sequence = bone_sequences[track]
-        for frame_id in range(export_frame_count):
-            value = fcurve.evaluate(_export_frame_to_action_frame(frame_id))
-            if track_format == TrackFormat.Float:
-                track_sequence[frame_id] = value
-            else:
-                track_sequence[frame_id][comp_index] = value
+        values = evaluate_fcurve(fcurve, export_frames)
+        if track_format == TrackFormat.Float:
+            bone_sequences[track][:] = values
+        else:
+            bone_sequences[track][:, comp_index] = values
 
     if target_is_armature:
         # transform bones from pose space to local space
@@ -121,25 +177,22 @@ def sequence_items_from_action(
             transform_mat = calculate_bone_space_transform_matrix(bone_map.get(bone_id, None), None)
 
             if Track.BonePosition in bone_sequences:
+                transform = np.array(transform_mat, dtype=np.float64)
                 vecs = bone_sequences[Track.BonePosition]
-                for i in range(export_frame_count):
-                    vecs[i] = transform_mat @ vecs[i]
+                bone_sequences[Track.BonePosition] = (vecs @ transform[:3, :3].T + transform[:3, 3]).astype(np.float32)
 
             if Track.BoneRotation in bone_sequences:
                 quats = bone_sequences[Track.BoneRotation]
-                for i in range(export_frame_count):
-                    quats[i].rotate(transform_mat)
+                bone_sequences[Track.BoneRotation] = rotate_quaternions(transform_mat.to_quaternion(), quats)
 
     if target_is_camera:
-        # see animationhelper.transform_camera_rotation_quaternion
+        # see animationhelper.transform_camera_rotation_quaternion, rotating around the local X axis
         angle_delta = math.radians(-90.0)
-        x_axis = Vector((1.0, 0.0, 0.0))
+        x_axis_rotation = (math.cos(angle_delta / 2), math.sin(angle_delta / 2), 0.0, 0.0)
         for bone_id, bone_sequences in sequence_items.items():
             if Track.CameraRotation in bone_sequences:
                 quats = bone_sequences[Track.CameraRotation]
-                for i in range(export_frame_count):
-                    x_axis_local = quats[i] @ x_axis
-                    quats[i].rotate(Quaternion(x_axis_local, angle_delta))
+                bone_sequences[Track.CameraRotation] = rotate_quaternions(x_axis_rotation, quats, local=True)
 
     if target_id is not None and len(uv_transforms_fcurves) > 0:
         # copy the UV transforms defined by the user to apply f-curves on them without modifying the original ones
@@ -156,31 +209,32 @@ def sequence_items_from_action(
 
             bone_sequences = sequence_items[bone_id]
 
+            fcurves_values = []
+            for fcurve in fcurves:
+                transform_index, prop_name = parse_uv_transform_data_path(fcurve.data_path)
+                values = evaluate_fcurve(fcurve, export_frames).tolist()
+                fcurves_values.append((transform_index, prop_name, fcurve.array_index, values))
+
             # compute uv0/uv1 from uv_transform
-            bone_sequences[Track.UV0] = [Vector((0.0, 0.0, 0.0)) for _ in range(export_frame_count)]
-            bone_sequences[Track.UV1] = [Vector((0.0, 0.0, 0.0)) for _ in range(export_frame_count)]
-            uv0_sequence = bone_sequences[Track.UV0]
-            uv1_sequence = bone_sequences[Track.UV1]
+            uv0_sequence = np.zeros((export_frame_count, 3), dtype=np.float32)
+            uv1_sequence = np.zeros((export_frame_count, 3), dtype=np.float32)
             for frame_id in range(export_frame_count):
                 # apply f-curves to UV transforms
-                for fcurve in fcurves:
-                    value = fcurve.evaluate(_export_frame_to_action_frame(frame_id))
-                    transform_index, prop_name = parse_uv_transform_data_path(fcurve.data_path)
+                for transform_index, prop_name, comp_index, values in fcurves_values:
+                    value = values[frame_id]
 
                     prop = getattr(uv_transforms[transform_index], prop_name)
                     if isinstance(prop, float):
                         setattr(uv_transforms[transform_index], prop_name, value)
                     else:  # Vector
-                        comp_index = fcurve.array_index
                         prop[comp_index] = value
 
                 mat = calculate_final_uv_transform_matrix(uv_transforms)
-                uv0_sequence[frame_id][0] = mat[0][0]
-                uv0_sequence[frame_id][1] = mat[0][1]
-                uv0_sequence[frame_id][2] = mat[0][2]
-                uv1_sequence[frame_id][0] = mat[1][0]
-                uv1_sequence[frame_id][1] = mat[1][1]
-                uv1_sequence[frame_id][2] = mat[1][2]
+                uv0_sequence[frame_id] = mat[0][0:3]
+                uv1_sequence[frame_id] = mat[1][0:3]
+
+            bone_sequences[Track.UV0] = uv0_sequence
+            bone_sequences[Track.UV1] = uv1_sequence
 
         uv_transforms.clear()
 
@@ -213,42 +267,38 @@ def sequence_items_from_action(
             if quats is None:
                 continue
 
-            for i in range(1, export_frame_count):
-                if quats[i - 1].dot(quats[i]) < 0:
-                    quats[i] *= -1
+            make_quaternions_continuous(quats)
     # WARNING: ANY OPERATION WITH ROTATION WILL CAUSE SIGN CHANGE. PROCEED ANYTHING BEFORE FIX.
 
     return sequence_items
 
 
 def build_values_channel(
-    values: list[float],
-    uniq_values: list[float],
+    values: NDArray[np.float32],
     indirect_percentage: float = 0.1
 ) -> ycdxml.ChannelsList.Channel:
+    uniq_values, uniq_indices = np.unique(values, return_inverse=True)
     values_len_percentage = len(uniq_values) / len(values)
 
     if len(uniq_values) == 1:
         channel = ycdxml.ChannelsList.StaticFloat()
 
-        channel.value = uniq_values[0]
+        channel.value = uniq_values[0].item()
     elif values_len_percentage <= indirect_percentage:
         channel = ycdxml.ChannelsList.IndirectQuantizeFloat()
 
         min_value, quantum = get_quantum_and_min_val(uniq_values)
 
-        channel.values = uniq_values
+        channel.values = uniq_values.tolist()
         channel.offset = min_value
         channel.quantum = quantum
-
-        for value in values:
-            channel.frames.append(uniq_values.index(value))
+        channel.frames = uniq_indices.tolist()
     else:
         channel = ycdxml.ChannelsList.QuantizeFloat()
 
         min_value, quantum = get_quantum_and_min_val(values)
 
-        channel.values = values
+        channel.values = values.tolist()
         channel.offset = min_value
         channel.quantum = quantum
 
@@ -260,80 +310,169 @@ def build_values_channel(
     return channel
 
 
-def sequence_data_from_frames_data(
+class ChannelEncoding(NamedTuple):
+    channel: ycdxml.ChannelsList.Channel
+    size: int
+    """Estimated size of the channel data in bits."""
+    error: float
+    """Largest difference between the decoded and the original values."""
+
+
+FLOAT_BITS = 32
+# Values on a power-of-two quantum grid are exact in single precision up to 2^24 steps, so they decode back to the
+# same grid values no matter how the quantization is rounded
+QUANTIZE_MAX_STEPS = 1 << 24
+
+
+def build_error_bounded_values_channel(values: NDArray[np.float32], max_error: float) -> ChannelEncoding:
+    """Build the channel with the smallest estimated size that decodes to ``values`` within ``max_error``."""
+    values = values.astype(np.float64)
+    num_values = len(values)
+    min_value = values.min()
+    max_value = values.max()
+
+    static_value = float(np.float32((min_value + max_value) / 2))
+    static_error = max(max_value - static_value, static_value - min_value)
+    if static_error <= max_error:
+        channel = ycdxml.ChannelsList.StaticFloat()
+        channel.value = static_value
+        return ChannelEncoding(channel, FLOAT_BITS, static_error)
+
+    channel = ycdxml.ChannelsList.RawFloat()
+    channel.values = values.tolist()
+    encodings = [ChannelEncoding(channel, num_values * FLOAT_BITS, 0.0)]
+
+    quantum = 2.0 ** math.floor(math.log2(2 * max_error)) if max_error > 0 else 0.0
+    if quantum > 0 and max(abs(min_value), abs(max_value)) + quantum < QUANTIZE_MAX_STEPS * quantum:
+        offset = math.floor(min_value / quantum) * quantum
+        quantized = np.rint((values - offset) / quantum).astype(np.int64)
+        decoded = offset + quantized * quantum
+        error = np.abs(decoded - values).max()
+        value_bits = int(quantized.max()).bit_length()
+
+        channel = ycdxml.ChannelsList.QuantizeFloat()
+        channel.values = decoded.tolist()
+        channel.offset = offset
+        channel.quantum = quantum
+        encodings.append(ChannelEncoding(channel, num_values * value_bits + 2 * FLOAT_BITS, error))
+
+        uniq_values, uniq_indices = np.unique(decoded, return_inverse=True)
+        index_bits = (len(uniq_values) - 1).bit_length()
+
+        channel = ycdxml.ChannelsList.IndirectQuantizeFloat()
+        channel.values = uniq_values.tolist()
+        channel.frames = uniq_indices.tolist()
+        channel.offset = offset
+        channel.quantum = quantum
+        size = len(uniq_values) * value_bits + num_values * index_bits + 2 * FLOAT_BITS
+        encodings.append(ChannelEncoding(channel, size, error))
+
+    return min(encodings, key=lambda encoding: encoding.size)
+
+
+def build_error_bounded_cached_quaternion(
+    frames_data: TrackFramesData,
+    max_error: float
+) -> Optional[list[ChannelEncoding]]:
+    """Encode only the X, Y and Z channels of the quaternions, with W calculated by a ``CachedQuaternion1`` channel.
+    Returns None if W changes sign or cannot be calculated within ``max_error``."""
+    w = frames_data[:, 0]
+    if np.all(w >= 0):
+        quats = frames_data
+    elif np.all(w <= 0):
+        # Negating every frame keeps the same rotations and the continuity between frames
+        quats = -frames_data
+    else:
+        return None
+
+    encodings = [build_error_bounded_values_channel(quats[:, comp_index], max_error) for comp_index in (1, 2, 3)]
+
+    frame_ids = np.arange(len(quats))
+    decoded_xyz = [encoding.channel.get_values(frame_ids, []) for encoding in encodings]
+    channel = ycdxml.ChannelsList.CachedQuaternion1()
+    channel.quat_index = 3
+    error = np.abs(channel.get_values(frame_ids, decoded_xyz) - quats[:, 0]).max()
+    if error > max_error:
+        return None
+
+    encodings.append(ChannelEncoding(channel, 0, error))
+    return encodings
+
+
+def error_bounded_sequence_data_from_frames_data(
     track: Track,
-    frames_data: TrackFramesData
-) -> ycdxml.Animation.SequenceDataList.SequenceData:
+    frames_data: TrackFramesData,
+    max_error: float
+) -> tuple[ycdxml.Animation.SequenceDataList.SequenceData, int, float]:
+    """Build the sequence data with the smallest channels that decode to ``frames_data`` within ``max_error``.
+    Returns the sequence data, its estimated size in bits and its largest error."""
     sequence_data = ycdxml.Animation.SequenceDataList.SequenceData()
 
     track_format = TrackFormatMap[track]
 
-    if track_format == TrackFormat.Vector3:
-        values_x = []
-        values_y = []
-        values_z = []
+    if track_format == TrackFormat.Float:
+        encodings = [build_error_bounded_values_channel(frames_data, max_error)]
+    else:
+        # X, Y, Z and W order for quaternions
+        comp_indices = range(3) if track_format == TrackFormat.Vector3 else (1, 2, 3, 0)
+        encodings = [build_error_bounded_values_channel(frames_data[:, comp_index], max_error)
+                     for comp_index in comp_indices]
+
+        if all(encoding.channel.type == "StaticFloat" for encoding in encodings):
+            static_value = [encoding.channel.value for encoding in encodings]
+            if track_format == TrackFormat.Vector3:
+                channel = ycdxml.ChannelsList.StaticVector3()
+                channel.value = Vector(static_value)
+            else:
+                channel = ycdxml.ChannelsList.StaticQuaternion()
+                channel.value = Quaternion((static_value[3], static_value[0], static_value[1], static_value[2]))
 
-        for vector in frames_data:
-            values_x.append(vector.x)
-            values_y.append(vector.y)
-            values_z.append(vector.z)
+            encodings = [ChannelEncoding(channel, len(encodings) * FLOAT_BITS,
+                                         max(encoding.error for encoding in encodings))]
+        elif track_format == TrackFormat.Quaternion:
+            cached_encodings = build_error_bounded_cached_quaternion(frames_data, max_error)
+            if cached_encodings is not None and \
+                    sum(e.size for e in cached_encodings) < sum(e.size for e in encodings):
+                encodings = cached_encodings
 
-        uniq_x = list(set(values_x))
-        len_uniq_x = len(uniq_x)
+    for encoding in encodings:
+        sequence_data.channels.append(encoding.channel)
 
-        uniq_y = list(set(values_y))
-        len_uniq_y = len(uniq_y)
+    size = sum(encoding.size for encoding in encodings)
+    error = max(encoding.error for encoding in encodings)
+    return sequence_data, size, error
 
-        uniq_z = list(set(values_z))
-        len_uniq_z = len(uniq_z)
 
-        if len_uniq_x == 1 and len_uniq_y == 1 and len_uniq_z == 1:
+def sequence_data_from_frames_data(
+    track: Track,
+    frames_data: TrackFramesData
+) -> ycdxml.Animation.SequenceDataList.SequenceData:
+    sequence_data = ycdxml.Animation.SequenceDataList.SequenceData()
+
+    track_format = TrackFormatMap[track]
+    is_static = bool(np.all(frames_data == frames_data[0]))
+
+    if track_format == TrackFormat.Vector3:
+        if is_static:
             channel = ycdxml.ChannelsList.StaticVector3()
-            channel.value = frames_data[0]
+            channel.value = Vector(frames_data[0].tolist())
 
             sequence_data.channels.append(channel)
         else:
-            sequence_data.channels.append(build_values_channel(values_x, uniq_x))
-            sequence_data.channels.append(build_values_channel(values_y, uniq_y))
-            sequence_data.channels.append(build_values_channel(values_z, uniq_z))
+            for comp_index in range(3):
+                sequence_data.channels.append(build_values_channel(frames_data[:, comp_index]))
     elif track_format == TrackFormat.Quaternion:
-        values_x = []
-        values_y = []
-        values_z = []
-        values_w = []
-
-        for quat in frames_data:
-            values_x.append(quat.x)
-            values_y.append(quat.y)
-            values_z.append(quat.z)
-            values_w.append(quat.w)
-
-        uniq_x = list(set(values_x))
-        len_uniq_x = len(uniq_x)
-
-        uniq_y = list(set(values_y))
-        len_uniq_y = len(uniq_y)
-
-        uniq_z = list(set(values_z))
-        len_uniq_z = len(uniq_z)
-
-        uniq_w = list(set(values_w))
-        len_uniq_w = len(uniq_w)
-
-        if len_uniq_x == 1 and len_uniq_y == 1 and len_uniq_z == 1 and len_uniq_w == 1:
+        if is_static:
             channel = ycdxml.ChannelsList.StaticQuaternion()
-            channel.value = frames_data[0]
+            channel.value = Quaternion(frames_data[0].tolist())
 
             sequence_data.channels.append(channel)
         else:
-            sequence_data.channels.append(build_values_channel(values_x, uniq_x))
-            sequence_data.channels.append(build_values_channel(values_y, uniq_y))
-            sequence_data.channels.append(build_values_channel(values_z, uniq_z))
-            sequence_data.channels.append(build_values_channel(values_w, uniq_w))
+            # X, Y, Z, W order
+            for comp_index in (1, 2, 3, 0):
+                sequence_data.channels.append(build_values_channel(frames_data[:, comp_index]))
     elif track_format == TrackFormat.Float:
-        values = frames_data
-        uniq = list(set(values))
-        sequence_data.channels.append(build_values_channel(values, uniq))
+        sequence_data.channels.append(build_values_channel(frames_data))
 
     return sequence_data
 
@@ -366,11 +505,23 @@ def animation_from_object(animation_obj: bpy.types.Object) -> ycdxml.Animation:
                       for bone_id, bones_data in sequence_items.items()
                       for track, frames_data in bones_data.items()]
     sequence_datas.sort(key=lambda x: x[0] | (x[1].value << 16))
+
+    export_settings = get_export_settings()
+    max_error = export_settings.animation_max_error if export_settings.compress_animations else None
+    compressed_size = 0
+    uncompressed_size = 0
+    max_compressed_error = 0.0
     for bone_id, track, frames_data in sequence_datas:
         if track == Track.MoverPosition or track == Track.MoverRotation:
             animation.unknown10 |= AnimationFlag.RootMotion
 
-        sequence_data = sequence_data_from_frames_data(track, frames_data)
+        if max_error is None:
+            sequence_data = sequence_data_from_frames_data(track, frames_data)
+        else:
+            sequence_data, size, error = error_bounded_sequence_data_from_frames_data(track, frames_data, max_error)
+            compressed_size += size
+            uncompressed_size += frames_data.size * FLOAT_BITS
+            max_compressed_error = max(max_compressed_error, error)
 
         seq_bone_id = ycdxml.Animation.BoneIdList.BoneId()
         seq_bone_id.bone_id = bone_id
@@ -382,6 +533,12 @@ def animation_from_object(animation_obj: bpy.types.Object) -> ycdxml.Animation:
 
     animation.sequences.append(sequence)
 
+    if max_error is not None:
+        logger.info(
+            f"Animation '{animation.hash}' compressed to {compressed_size / 8192:.1f} KiB of channel data "
+            f"({uncompressed_size / 8192:.1f} KiB uncompressed), max error {max_compressed_error:.6g}."
+        )
+
     # Get int value from enum, a bit junky...
     animation.unknown10 = animation.unknown10.value
 
@@ -14,10 +14,12 @@ from .. import logger
 
 current_game = SollumzGame.GTA
 
-def import_ydd(filepath: str):
+def import_ydd(filepath: str, ydd_xml: Optional[DrawableDictionary] = None):
+    """Import the YDD at ``filepath``. ``ydd_xml`` can be given if the file has already been parsed."""
     import_settings = get_import_settings()
 
-    ydd_xml = YDD.from_xml_file(filepath)
+    if ydd_xml is None:
+        ydd_xml = YDD.from_xml_file(filepath)
     
     global current_game
     current_game = ydd_xml.game
@@ -4,7 +4,6 @@ import numpy as np
 from numpy.typing import NDArray
 from traceback import format_exc
 from ..tools.meshhelper import create_uv_attr, create_color_attr, flip_uvs
-from mathutils import Vector
 from .. import logger
 
 
@@ -75,11 +74,9 @@ class MeshBuilder:
             "value", model_mat_inds[self.mat_inds])
 
     def set_mesh_normals(self, mesh: bpy.types.Mesh):
-        mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
 
-        normals_normalized = [Vector(n[:3]).normalized()
-                              for n in self.vertex_arr["Normal"]]
-        mesh.normals_split_custom_set_from_vertices(normals_normalized)
+        mesh.normals_split_custom_set_from_vertices(get_normalized_normals(self.vertex_arr["Normal"]))
 
         if bpy.app.version < (4, 1, 0):
             # needed to use custom split normals pre-4.1
@@ -108,18 +105,15 @@ class MeshBuilder:
     def create_vertex_groups(self, obj: bpy.types.Object, bones: list[bpy.types.Bone], current_game: SollumzGame = SollumzGame.GTA, bone_mapping = None):
         vertex_groups: dict[int, bpy.types.VertexGroup] = {}
 
+        bone_by_tag: dict[int, bpy.types.Bone] = {}
+        for bone in bones or ():
+            bone_by_tag.setdefault(bone.bone_properties.tag, bone)
+
         def get_bone_by_tag(tag):
-            bone_by_tag = None
-
-            for bone in bones:
-                bone_tag = bone.bone_properties.tag
-                if bone_tag == tag:
-                    bone_by_tag = bone
-                    break
-            if bone_by_tag is None:
+            bone = bone_by_tag.get(tag)
+            if bone is None:
                 raise Exception(f"Unable to find bone with tag {tag} to create vertex group")
-            return bone_by_tag
-
+            return bone
 
         def create_group(bone_index: int):
             bone_name = f"UNKNOWN_BONE.{bone_index}"
@@ -145,25 +139,54 @@ class MeshBuilder:
                 return obj.vertex_groups.new(name=bone_name)
 
         def create_weights(weights, indices):
-            for vert_ind, bone_inds in enumerate(indices):
-                for i, bone_ind in enumerate(bone_inds):
-                    weight = weights[vert_ind][i]
-
-                    if weight == 0 and bone_ind == 0:
-                        continue
-
-                    if bone_ind not in vertex_groups:
-                        vertex_groups[bone_ind] = create_group(bone_ind)
+            bone_inds, batches = get_vertex_group_weight_batches(weights, indices)
 
-                    vgroup = vertex_groups[bone_ind]
+            for bone_ind in bone_inds:
+                if bone_ind not in vertex_groups:
+                    vertex_groups[bone_ind] = create_group(bone_ind)
 
-                    vgroup.add((vert_ind,), weight, "ADD")
+            for bone_ind, weight, vert_inds in batches:
+                vertex_groups[bone_ind].add(vert_inds, weight, "ADD")
     
-        weights = self.vertex_arr["BlendWeights"] / 255
-        indices = self.vertex_arr["BlendIndices"]
-        create_weights(weights, indices)
+        create_weights(self.vertex_arr["BlendWeights"], self.vertex_arr["BlendIndices"])
 
         if current_game == SollumzGame.RDR:
-            weights2 = self.vertex_arr["BlendWeights1"] / 255
-            indices2 = self.vertex_arr["BlendIndices1"]
-            create_weights(weights2, indices2)
+            create_weights(self.vertex_arr["BlendWeights1"], self.vertex_arr["BlendIndices1"])
+
+
+def get_normalized_normals(normals: NDArray[np.float32]) -> NDArray[np.float32]:
+    """Normalize the first 3 components of the normals. Zero-length normals are left as zero."""
+    normals = np.ascontiguousarray(normals[:, :3], dtype=np.float32)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths != 0)
+
+
+def get_vertex_group_weight_batches(
+    weights: NDArray[np.uint32],
+    indices: NDArray[np.uint32]
+) -> tuple[list[int], list[tuple[int, float, list[int]]]]:
+    """Group the vertex influences by bone index and weight, so they can be added to the vertex groups in a few
+    calls. ``weights`` are the 0-255 blend weights. Influences with weight 0 on bone 0 are skipped.
+    Returns the bone indices in order of first use and the batches as (bone index, weight, vertex indices).
+    Batches of the first influence slot come first, so weights of a bone repeated in a vertex are added
+    in slot order."""
+    weights = weights.astype(np.uint64)
+    indices = indices.astype(np.uint64)
+    used = (weights != 0) | (indices != 0)
+
+    used_bone_inds, first_use = np.unique(indices[used], return_index=True)
+    bone_inds = used_bone_inds[np.argsort(first_use)].tolist()
+
+    batches = []
+    for slot in range(indices.shape[1]):
+        vert_inds = np.flatnonzero(used[:, slot])
+        keys = (indices[vert_inds, slot] << np.uint64(32)) | weights[vert_inds, slot]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        vert_inds = vert_inds[order]
+
+        unique_keys, starts = np.unique(keys, return_index=True)
+        for key, vert_inds_batch in zip(unique_keys.tolist(), np.split(vert_inds, starts[1:])):
+            batches.append((key >> 32, (key & 0xFFFFFFFF) / 255, vert_inds_batch.tolist()))
+
+    return bone_inds, batches
@@ -95,8 +95,6 @@ def split_model_by_group(model_data: ModelData, bones: list[Bone]) -> list[Model
 def get_group_face_inds(mesh_data: MeshData, bones: list[Bone]):
     """Get face indices split by vertex group. Overlapping vertex groups are merged
     based on bone parenting."""
-    group_inds: dict[int, set] = defaultdict(list)
-
     blend_inds = mesh_data.vert_arr["BlendIndices"]
     weights = mesh_data.vert_arr["BlendWeights"]
 
@@ -107,43 +105,63 @@ def get_group_face_inds(mesh_data: MeshData, bones: list[Bone]):
     face_blend_inds = blend_inds[faces]
     face_weights = weights[faces]
     # Any given face could be in a maximum of 12 vertex groups (3 verts * 4 possible groups per vert)
-    face_blend_inds = face_blend_inds.reshape((num_tris, 12))
-    face_weights = face_blend_inds.reshape((num_tris, 12))
+    face_blend_inds = face_blend_inds.reshape((num_tris, -1))
+    face_weights = face_blend_inds.reshape((num_tris, -1))
 
     # Mapping of blend indices in each face where (BlendIndex, BlendWeight) pairs are not (0, 0)
     blend_inds_mask = np.logical_or(face_blend_inds != 0, face_weights != 0)
     # Maps group indices to the group index of the object they should be parented to
     parent_map = get_group_parent_map(face_blend_inds, bones)
+    parent_lookup = np.zeros(max(parent_map.keys(), default=0) + 1, dtype=np.int64)
+    for blend_ind, parent_ind in parent_map.items():
+        parent_lookup[blend_ind] = parent_ind
 
-    for i, all_blend_inds in enumerate(face_blend_inds):
-        # Valid BlendIndices are those where either the index or weight is not 0
-        valid_blend_inds = all_blend_inds[blend_inds_mask[i]]
-
-        if valid_blend_inds.size == 0:
-            group_ind = 0
-        else:
-            group_ind = parent_map[valid_blend_inds[0]]
+    # Each face goes to the group of its first valid BlendIndex (either the index or weight is not 0), or group 0
+    # if it has none
+    first_valid = blend_inds_mask.argmax(axis=1)
+    face_groups = parent_lookup[face_blend_inds[np.arange(num_tris), first_valid]]
+    face_groups[~blend_inds_mask.any(axis=1)] = 0
 
-        group_inds[group_ind].append(i)
+    # Split face indices by group, with groups in order of first appearance
+    groups, first_face, face_group_inds = np.unique(face_groups, return_index=True, return_inverse=True)
+    face_group_inds = face_group_inds.reshape(-1)
+    faces_by_group = np.argsort(face_group_inds, kind="stable").astype(np.uint32)
+    group_face_inds = np.split(faces_by_group, np.cumsum(np.bincount(face_group_inds))[:-1])
 
-    return {i: np.array(face_inds, dtype=np.uint32) for i, face_inds in group_inds.items()}
+    return {int(groups[i]): group_face_inds[i] for i in np.argsort(first_face)}
 
 
 def get_group_parent_map(face_blend_inds: NDArray[np.uint32], bones: list[Bone]) -> dict[int, set]:
     """Get a mapping of each blend index to the blend index of the object they should be parented to."""
-    # Mapping of each blend index to blend indices with overlapping faces
-    group_relations: dict[int, set[int]] = defaultdict(set)
     parent_map: dict[int, int] = {}
-    group_inds = np.unique(face_blend_inds)
+    # Blend indices are bone indices, so they are small enough to be compacted with a lookup table
+    is_used = np.zeros(int(face_blend_inds.max(initial=0)) + 1, dtype=bool)
+    is_used[face_blend_inds] = True
+    group_inds = np.flatnonzero(is_used)
+    face_group_inds = (np.cumsum(is_used, dtype=np.uint64) - np.uint64(1))[face_blend_inds]
+    num_groups = len(group_inds)
+    if num_groups == 0:
+        return parent_map
+
+    # Bit mask of the groups in each face. Most faces share the same few combinations of groups, so each
+    # combination is only looked at once
+    num_words = (num_groups + 63) // 64
+    face_masks = np.zeros((len(face_group_inds), num_words), dtype=np.uint64)
+    face_rows = np.arange(len(face_group_inds))
+    for column in face_group_inds.T:
+        face_masks[face_rows, column // 64] |= np.uint64(1) << (column % 64)
+    group_combinations = np.unique(face_masks, axis=0)
+
+    # Co-occurrence matrix of groups, True where two groups appear together in a face
+    group_ids = np.arange(num_groups, dtype=np.uint64)
+    incidence = (group_combinations[:, group_ids // 64] >> (group_ids % 64)) & np.uint64(1)
+    incidence = incidence.astype(np.float32)
+    cooccurrence = (incidence.T @ incidence) > 0
+
+    for i, blend_ind in enumerate(group_inds):
+        # Groups with overlapping faces. Ignore 0 group because all vertex groups are a part of group 0
+        blend_inds = [j for j in group_inds[cooccurrence[i]] if j != 0 and j != blend_ind]
 
-    for group_ind in group_inds:
-        occurences = np.any(face_blend_inds == group_ind, axis=1)
-        related_groups = np.unique(face_blend_inds[occurences].flatten())
-        # Ignore 0 group because all vertex groups are a part of group 0
-        group_relations[group_ind] = [
-            i for i in related_groups if i != 0 and i != group_ind]
-
-    for blend_ind, blend_inds in group_relations.items():
         # blend_ind does not overlap with any other vertex groups, so it can be created as its own object
         if not blend_inds:
             parent_map[blend_ind] = blend_ind
@@ -194,23 +212,14 @@ def get_faces_subset(vert_arr: NDArray, ind_arr: NDArray[np.uint32], face_inds:
 
     subset_inds = faces[face_inds].flatten()
 
-    # Map old vert inds to new vert inds
-    # TODO: Remap inds using numpy?
-    vert_inds_map: dict[int, int] = {}
-    vert_inds = []
-    new_inds = []
-
-    for vert_ind in subset_inds:
-        if vert_ind in vert_inds_map:
-            new_inds.append(vert_inds_map[vert_ind])
-        else:
-            new_vert_ind = len(vert_inds_map)
-            new_inds.append(new_vert_ind)
-            vert_inds_map[vert_ind] = new_vert_ind
-            vert_inds.append(vert_ind)
+    # Map old vert inds to new vert inds, numbered in order of first appearance
+    vert_inds, first_occurrence, inverse = np.unique(subset_inds, return_index=True, return_inverse=True)
+    order = np.argsort(first_occurrence)
+    new_vert_inds = np.empty(len(order), dtype=np.uint32)
+    new_vert_inds[order] = np.arange(len(order), dtype=np.uint32)
 
-    new_vert_arr = vert_arr[vert_inds]
-    new_ind_arr = np.array(new_inds, dtype=np.uint32)
+    new_vert_arr = vert_arr[vert_inds[order]]
+    new_ind_arr = new_vert_inds[inverse.reshape(-1)]
 
     return new_vert_arr, new_ind_arr
 
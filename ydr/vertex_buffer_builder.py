@@ -16,6 +16,50 @@ def get_bone_by_vgroup(vgroups: bpy.types.VertexGroups, bones: list[bpy.types.Bo
     return {i: bone_ind_by_name[group.name] if group.name in bone_ind_by_name else -1 for i, group in enumerate(vgroups)}
 
 
+def get_bone_lookup_array(bone_by_vgroup: dict[int, int]) -> NDArray[np.int64]:
+    """Convert ``bone_by_vgroup`` to an array indexed by vertex group index. Groups without a bone are -1."""
+    lookup = np.full(max(bone_by_vgroup.keys(), default=-1) + 1, -1, dtype=np.int64)
+    for vgroup, bone_index in bone_by_vgroup.items():
+        lookup[vgroup] = bone_index
+    return lookup
+
+
+def select_vertex_group_influences(
+    vert_inds: NDArray[np.int64],
+    group_inds: NDArray[np.int64],
+    weights: NDArray[np.float32],
+    num_verts: int,
+    bone_lookup: NDArray[np.int64],
+    max_influences: int
+) -> Tuple[NDArray[np.float32], NDArray[np.int64]]:
+    """Get the ``max_influences`` vertex groups with the highest weight of each vertex, from the flat arrays of
+    vertex group elements (``vert_inds`` in ascending order). Groups without a bone are ignored. Returns
+    weights and vertex group indices of shape (num_verts, max_influences), sorted by weight in descending
+    order (ties keep the order of the elements). Unused slots have a weight of 0 and a group index of -1."""
+    weights_arr = np.zeros((num_verts, max_influences), dtype=np.float32)
+    group_arr = np.full((num_verts, max_influences), -1, dtype=np.int64)
+
+    # skip the groups that don't have a corresponding bone
+    has_bone = group_inds < len(bone_lookup)
+    has_bone[has_bone] = bone_lookup[group_inds[has_bone]] != -1
+    vert_inds = vert_inds[has_bone]
+    group_inds = group_inds[has_bone]
+    weights = weights[has_bone]
+
+    # sort by weight within each vertex so the groups with less influence are to be ignored
+    order = np.lexsort((-weights, vert_inds))
+    vert_inds = vert_inds[order]
+    rank = np.arange(len(vert_inds)) - np.searchsorted(vert_inds, vert_inds, side="left")
+
+    keep = rank < max_influences
+    vert_inds = vert_inds[keep]
+    rank = rank[keep]
+    weights_arr[vert_inds, rank] = weights[order][keep]
+    group_arr[vert_inds, rank] = group_inds[order][keep]
+
+    return weights_arr, group_arr
+
+
 def remove_arr_field(name: str, vertex_arr: NDArray):
     names = [n for n in vertex_arr.dtype.names if n != name]
     return vertex_arr[names]
@@ -45,27 +89,131 @@ def remove_unused_uvs(vertex_arr: NDArray, used_texcoords: set[str]) -> NDArray:
     return vertex_arr[new_names]
 
 
-def dedupe_and_get_indices(vertex_arr: NDArray) -> Tuple[NDArray, NDArray[np.uint32]]:
-    """Remove duplicate vertices from the buffer and get the new vertex indices in triangle order (used for IndexBuffer). Returns vertices, indices."""
+# Size of the grid cells vertex attributes are snapped to when looking for duplicate vertices, by attribute name
+# without the layer number. Vertices are welded when all their attributes fall in the same cells.
+WELD_TOLERANCES = {
+    "Position": 1e-6,
+    "Normal": 1e-5,
+    "Tangent": 1e-5,
+    "TexCoord": 1e-5,
+}
+DEFAULT_WELD_TOLERANCE = 1e-6
+
+_HASH_PRIME = np.uint64(0x100000001B3)
+
+
+def get_weld_tolerance(name: str, tolerances: dict[str, float]) -> float:
+    """Get the weld tolerance of a vertex attribute, e.g. ``TexCoord1`` uses the ``TexCoord`` tolerance."""
+    tolerance = tolerances.get(name)
+    if tolerance is None:
+        tolerance = tolerances.get(name.rstrip("0123456789"), DEFAULT_WELD_TOLERANCE)
+    return tolerance
+
+
+def quantize_vertex_attribute(values: NDArray, tolerance: float, offset: float = 0.0) -> NDArray[np.int64]:
+    """Snap a vertex attribute column to a grid of ``tolerance``-sized cells, shifted by ``offset`` cells. Integer
+    attributes are kept as is, and so are float attributes with a tolerance of 0 (compared by value)."""
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64)
+
+    values = values.astype(np.float64)
+    if tolerance <= 0:
+        values += 0.0  # -0.0 -> 0.0
+        return values.view(np.int64)
+
+    values /= tolerance
+    if offset:
+        values += offset
+    np.rint(values, out=values)
+    return values.astype(np.int64)
+
+
+def iter_quantized_vertex_columns(vertex_arr: NDArray, tolerances: dict[str, float], offset: float = 0.0):
+    for name in vertex_arr.dtype.names:
+        attr = vertex_arr[name]
+        tolerance = get_weld_tolerance(name, tolerances)
+        if attr.ndim == 1:
+            yield quantize_vertex_attribute(attr, tolerance, offset)
+            continue
+
+        for i in range(attr.shape[1]):
+            yield quantize_vertex_attribute(attr[:, i], tolerance, offset)
+
+
+def get_weld_groups(vertex_arr: NDArray, tolerances: dict[str, float], offset: float = 0.0) -> NDArray[np.int64]:
+    """Group the vertices whose attributes snap to the same grid cells. Returns the index of the first vertex of
+    the group of each vertex."""
+    # The attributes are quantized one column at a time and hashed into a single 64-bit key per vertex, which is
+    # much cheaper to sort than the whole vertex. Vertices with the same key are then checked against the first vertex
+    # with that key to separate hash collisions.
+    num_verts = len(vertex_arr)
+    keys = np.zeros(num_verts, dtype=np.uint64)
+    for column in iter_quantized_vertex_columns(vertex_arr, tolerances, offset):
+        keys ^= column.view(np.uint64)
+        keys *= _HASH_PRIME
+
+    _, first_inds, group_inds = np.unique(keys, return_index=True, return_inverse=True)
+    group_inds = group_inds.reshape(-1)
+    del keys
+
+    collided = np.zeros(num_verts, dtype=bool)
+    for column in iter_quantized_vertex_columns(vertex_arr, tolerances, offset):
+        collided |= column != column[first_inds][group_inds]
+
+    first_by_vertex = first_inds[group_inds]
+    if collided.any():
+        # Rare, split the vertices that don't match the first vertex with their key by their actual values
+        collided_inds = np.flatnonzero(collided)
+        collided_columns = np.column_stack([
+            column[collided_inds] for column in iter_quantized_vertex_columns(vertex_arr, tolerances, offset)
+        ])
+        _, collided_first, collided_groups = np.unique(
+            collided_columns, axis=0, return_index=True, return_inverse=True)
+
+        first_by_vertex[collided_inds] = collided_inds[collided_first][collided_groups.reshape(-1)]
+
+    return first_by_vertex
+
+
+def dedupe_and_get_indices(
+    vertex_arr: NDArray,
+    tolerances: Optional[dict[str, float]] = None
+) -> Tuple[NDArray, NDArray[np.uint32]]:
+    """Remove duplicate vertices from the buffer and get the new vertex indices in triangle order (used for
+    IndexBuffer). Vertices are considered duplicates when their attributes snap to the same grid cells, sized per
+    attribute by ``tolerances`` (defaults to ``WELD_TOLERANCES``), either on the grid or on the grid shifted by half
+    a cell, and so are vertices connected through other duplicates. Unique vertices are kept in order of first
+    appearance. Returns vertices, indices."""
 
     # Cannot use np.unique directly on the vertex array because it doesn't have a tolerance parameter, only checks exact
     # equality, so floating-point values that are only different due to rounding errors would not be deduplicated.
     # For example, normals calculated by Blender for the same vertex in different loops end up slightly different from
     # rounding errors, causing this vertex to appear multiple times on export.
-    # So we first round the values in the vertex array and then pass it to np.unique.
+    # Values on either side of a cell boundary of one grid are in the same cell of the other, so the vertices are
+    # grouped on both grids and the groups that share a vertex are merged.
+    if tolerances is None:
+        tolerances = WELD_TOLERANCES
+
+    groups = get_weld_groups(vertex_arr, tolerances)
+    shifted_groups = get_weld_groups(vertex_arr, tolerances, offset=0.5)
 
-    # Convert vertex array to a 2D unstructured array of float64 to be able to use np.round, it doesn't work on the
-    # structured array.
-    # Each vertex is converted to a float64 array by concatenating the struct fields: [x, y, z, nx, ny, nz, r, g, b, a, ...]
-    vertex_arr_flatten = np.concatenate([vertex_arr[name] for name in vertex_arr.dtype.names], axis=1, dtype=np.float64)
-    np.round(vertex_arr_flatten, out=vertex_arr_flatten, decimals=6)
+    # Label each vertex with the first vertex it is connected to through either grouping. Usually converges right
+    # away, only chains of vertices straddling boundaries of both grids need more iterations
+    labels = groups
+    while True:
+        new_labels = labels
+        for group_inds in (shifted_groups, groups):
+            label_by_group = np.arange(len(vertex_arr))
+            np.minimum.at(label_by_group, group_inds, new_labels)
+            new_labels = label_by_group[group_inds]
 
-    _, unique_indices, inverse_indices = np.unique(vertex_arr_flatten, axis=0, return_index=True, return_inverse=True)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
 
-    # Lookup the vertices in the original structured and un-rounded array
-    vertex_arr = vertex_arr[unique_indices]
-    index_arr = np.asarray(inverse_indices, dtype=np.uint32)
-    return vertex_arr, index_arr
+    # Labels are vertex indices, so the unique labels are already in order of first appearance
+    first_inds, index_arr = np.unique(labels, return_inverse=True)
+    return vertex_arr[first_inds], index_arr.reshape(-1).astype(np.uint32)
 
 
 class VertexBufferBuilder:
@@ -180,30 +328,20 @@ class VertexBufferBuilder:
     def _get_weights_indices(self) -> Tuple[NDArray[np.uint32], NDArray[np.uint32]]:
         """Get all BlendWeights and BlendIndices."""
         num_verts = len(self.mesh.vertices)
-        bone_by_vgroup = self._bone_by_vgroup
+        bone_lookup = get_bone_lookup_array(self._bone_by_vgroup)
+        vert_inds, group_inds, weights = self._get_vertex_group_elements()
 
+        max_influences = 4 if current_game == SollumzGame.GTA else 8
+        weights_arr, group_arr = select_vertex_group_influences(
+            vert_inds, group_inds, weights, num_verts, bone_lookup, max_influences)
+
+        used = group_arr != -1
+        ind_arr = np.zeros(group_arr.shape, dtype=np.uint32)
         if current_game == SollumzGame.GTA:
-            ind_arr = np.zeros((num_verts, 4), dtype=np.uint32)
-            weights_arr = np.zeros((num_verts, 4), dtype=np.float32)
+            ind_arr[used] = bone_lookup[group_arr[used]]
         elif current_game == SollumzGame.RDR:
-            ind_arr = np.zeros((num_verts, 8), dtype=np.uint32)
-            weights_arr = np.zeros((num_verts, 8), dtype=np.float32)
-
-        for i, vert in enumerate(self.mesh.vertices):
-            groups = self._get_sorted_vertex_group_elements(vert)
-            for j, grp in enumerate(groups):
-                if j < 4:
-                    weights_arr[i][j] = grp.weight
-                    if current_game == SollumzGame.GTA:
-                        ind_arr[i][j] = bone_by_vgroup[grp.group]
-                    elif current_game == SollumzGame.RDR:
-                        ind_arr[i][j] = grp.group
-                elif current_game == SollumzGame.RDR and j >= 4 and j < 8:
-                    weights_arr[i][j] = grp.weight
-                    ind_arr[i][j] = grp.group
-                else:
-                    break
-        
+            ind_arr[used] = group_arr[used]
+
         if current_game == SollumzGame.GTA:
             weights_arr = self._normalize_weights(weights_arr)
             weights_arr, ind_arr = self._sort_weights_inds(weights_arr, ind_arr)
@@ -234,22 +372,15 @@ class VertexBufferBuilder:
         elif current_game == SollumzGame.RDR:
             return [weights_arr[self._vert_inds], ind_arr[self._vert_inds], weights_arr2[self._vert_inds], ind_arr2[self._vert_inds]]
         
-    def _get_sorted_vertex_group_elements(self, vertex: bpy.types.MeshVertex) -> list[bpy.types.VertexGroupElement]:
-        elements = []
-        bone_by_vgroup = self._bone_by_vgroup
-        for element in vertex.groups:
-            bone_index = bone_by_vgroup.get(element.group, -1)
-
-            # skip the group that doesn't have a corresponding bone
-            if bone_index == -1:
-                continue
-
-            elements.append(element)
-
-        # sort by weight so the groups with less influence are to be ignored
-        elements = sorted(elements, reverse=True, key=lambda e: e.weight)
-        return elements
-    
+    def _get_vertex_group_elements(self) -> Tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float32]]:
+        """Get the vertex index, vertex group index and weight of all vertex group elements as flat arrays."""
+        # Vertex groups can't be read with foreach_get, so this is the only per-vertex loop
+        elements = [(i, element.group, element.weight)
+                    for i, vert in enumerate(self.mesh.vertices) for element in vert.groups]
+        elements = np.array(elements, dtype=np.float64).reshape((-1, 3))
+
+        return elements[:, 0].astype(np.int64), elements[:, 1].astype(np.int64), elements[:, 2].astype(np.float32)
+
     def _sort_weights_inds(self, weights_arr: NDArray[np.float32], ind_arr: NDArray[np.uint32]):
         """Sort BlendWeights and BlendIndices."""
         # Blend weights and indices are sorted by weights in ascending order starting from the 3rd index and continues to the left
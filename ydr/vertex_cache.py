@@ -0,0 +1,127 @@
+"""
+Index buffer optimizations for the GPU post-transform vertex cache.
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+from typing import NamedTuple, Tuple
+
+VERTEX_CACHE_SIZE = 16
+
+
+class VertexCacheStats(NamedTuple):
+    acmr: float
+    """Average cache miss ratio, vertex shader invocations per triangle (0.5 - 3.0, lower is better)."""
+    atvr: float
+    """Average transformed vertex ratio, vertex shader invocations per vertex (1.0 is optimal)."""
+
+
+def get_vertex_cache_stats(
+    ind_arr: NDArray[np.uint32],
+    num_verts: int,
+    cache_size: int = VERTEX_CACHE_SIZE
+) -> VertexCacheStats:
+    """Simulate a FIFO vertex cache of ``cache_size`` entries over the index buffer."""
+    num_tris = len(ind_arr) // 3
+    if num_tris == 0 or num_verts == 0:
+        return VertexCacheStats(0.0, 0.0)
+
+    # A vertex is in the cache if less than ``cache_size`` vertices were added to it after the vertex
+    added_at = [-cache_size] * num_verts
+    num_misses = 0
+    for v in ind_arr.tolist():
+        if num_misses - added_at[v] >= cache_size:
+            added_at[v] = num_misses
+            num_misses += 1
+
+    return VertexCacheStats(num_misses / num_tris, num_misses / num_verts)
+
+
+def optimize_vertex_cache(
+    ind_arr: NDArray[np.uint32],
+    num_verts: int,
+    cache_size: int = VERTEX_CACHE_SIZE
+) -> NDArray[np.uint32]:
+    """Reorder the triangles of the index buffer for vertex cache locality, using the Tipsify algorithm
+    (Sander, Nehab and Barczak, "Fast Triangle Reordering for Vertex Locality and Reduced Overdraw", 2007).
+    Triangles are emitted in fans around vertices, choosing the next vertex to fan around from the vertices
+    that are still in the cache."""
+    num_tris = len(ind_arr) // 3
+    if num_tris == 0:
+        return ind_arr
+
+    # Triangles using each vertex
+    vert_order = np.argsort(ind_arr, kind="stable")
+    adjacency = (vert_order // 3).tolist()
+    adjacency_start = np.concatenate(([0], np.cumsum(np.bincount(ind_arr, minlength=num_verts)))).tolist()
+
+    triangles = ind_arr.reshape((-1, 3)).tolist()
+    live_count = np.bincount(ind_arr, minlength=num_verts).tolist()
+    cache_time = [0] * num_verts
+    emitted = [False] * num_tris
+    dead_end = []
+    new_tris = []
+
+    time = cache_size + 1
+    cursor = 0
+
+    def skip_dead_end() -> int:
+        nonlocal cursor
+        while dead_end:
+            v = dead_end.pop()
+            if live_count[v] > 0:
+                return v
+        while cursor < num_verts:
+            if live_count[cursor] > 0:
+                return cursor
+            cursor += 1
+        return -1
+
+    fan_vert = skip_dead_end()
+    while fan_vert >= 0:
+        candidates = []
+        for tri_ind in adjacency[adjacency_start[fan_vert]:adjacency_start[fan_vert + 1]]:
+            if emitted[tri_ind]:
+                continue
+
+            tri = triangles[tri_ind]
+            new_tris.append(tri_ind)
+            emitted[tri_ind] = True
+            for v in tri:
+                dead_end.append(v)
+                candidates.append(v)
+                live_count[v] -= 1
+                if time - cache_time[v] > cache_size:
+                    cache_time[v] = time
+                    time += 1
+
+        # Pick the candidate still in the cache that will stay there longest after emitting its triangles
+        fan_vert = -1
+        best_priority = -1
+        for v in candidates:
+            if live_count[v] <= 0:
+                continue
+
+            priority = 0
+            age = time - cache_time[v]
+            if age + 2 * live_count[v] <= cache_size:
+                priority = age
+            if priority > best_priority:
+                best_priority = priority
+                fan_vert = v
+
+        if fan_vert == -1:
+            fan_vert = skip_dead_end()
+
+    return ind_arr.reshape((-1, 3))[new_tris].reshape(-1)
+
+
+def optimize_vertex_fetch(vert_arr: NDArray, ind_arr: NDArray[np.uint32]) -> Tuple[NDArray, NDArray[np.uint32]]:
+    """Reorder the vertices in order of first use by the index buffer, so vertices are fetched from memory
+    sequentially. Unused vertices are removed. Returns vertices, indices."""
+    unique_indices, first_use, inverse = np.unique(ind_arr, return_index=True, return_inverse=True)
+    order = np.argsort(first_use)
+    new_index = np.empty(len(order), dtype=np.uint32)
+    new_index[order] = np.arange(len(order), dtype=np.uint32)
+
+    return vert_arr[unique_indices[order]], new_index[inverse.reshape(-1)]
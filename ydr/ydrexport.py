@@ -57,6 +57,7 @@ from ..ybn.ybnexport import create_composite_xml, create_bound_xml
 from .properties import get_model_properties
 from .render_bucket import RenderBucket
 from .vertex_buffer_builder import VertexBufferBuilder, dedupe_and_get_indices, remove_arr_field, remove_unused_colors, get_bone_by_vgroup, remove_unused_uvs
+from .vertex_cache import get_vertex_cache_stats, optimize_vertex_cache, optimize_vertex_fetch
 from .lights import create_xml_lights
 from ..cwxml.shader import ShaderManager, ShaderDef, ShaderParameterCBufferDef, ShaderParameterFloatVectorDef, ShaderParameterSamplerDef, ShaderParameterType
 
@@ -302,6 +303,10 @@ def create_geometries_xml(mesh_eval: bpy.types.Mesh, materials: list[bpy.types.M
     bone_by_vgroup = get_bone_by_vgroup(
         vertex_groups, bones) if bones and vertex_groups else None
 
+    export_settings = get_export_settings()
+    optimize_cache = export_settings.optimize_vertex_cache
+    weld_tolerances = export_settings.weld_tolerances
+
     total_vert_buffer = VertexBufferBuilder(mesh_eval, bone_by_vgroup).build(current_game)
     shader.current_game = current_game
     for mat_index, loop_inds in loop_inds_by_mat.items():
@@ -337,7 +342,11 @@ def create_geometries_xml(mesh_eval: bpy.types.Mesh, materials: list[bpy.types.M
 
                 vert_buffer = vert_buffer[new_names]
 
-        vert_buffer, ind_buffer = dedupe_and_get_indices(vert_buffer)
+        vert_buffer, ind_buffer = dedupe_and_get_indices(vert_buffer, weld_tolerances)
+
+        if optimize_cache:
+            vert_buffer, ind_buffer = optimize_geometry_buffers(
+                vert_buffer, ind_buffer, f"{mesh_eval.original.name} ({material.name})")
 
         geom_xml = Geometry()
 
@@ -396,6 +405,26 @@ def create_geometries_xml(mesh_eval: bpy.types.Mesh, materials: list[bpy.types.M
     return [geometries, bone_by_vgroup]
 
 
+def optimize_geometry_buffers(
+    vert_buffer: NDArray,
+    ind_buffer: NDArray[np.uint32],
+    geom_name: str
+) -> tuple[NDArray, NDArray[np.uint32]]:
+    """Reorder the triangles for vertex cache locality and the vertices in order of first use."""
+    num_verts = len(vert_buffer)
+    old_stats = get_vertex_cache_stats(ind_buffer, num_verts)
+
+    ind_buffer = optimize_vertex_cache(ind_buffer, num_verts)
+    vert_buffer, ind_buffer = optimize_vertex_fetch(vert_buffer, ind_buffer)
+
+    new_stats = get_vertex_cache_stats(ind_buffer, len(vert_buffer))
+    logger.info(
+        f"Optimized vertex cache of geometry '{geom_name}': ACMR {old_stats.acmr:.3f} -> {new_stats.acmr:.3f}, "
+        f"ATVR {old_stats.atvr:.3f} -> {new_stats.atvr:.3f}")
+
+    return vert_buffer, ind_buffer
+
+
 def sort_geoms_by_shader(geometries: list[Geometry]):
     return sorted(geometries, key=lambda g: g.shader_index)
 
@@ -676,7 +705,8 @@ def split_geom_by_vert_count(geom_xml: Geometry):
         raise ValueError(
             "Failed to split Geometry by vertex count. Vertex buffer and index buffer cannot be None!")
 
-    vert_buffers, ind_buffers = split_vert_buffers(geom_xml.vertex_buffer.data, geom_xml.index_buffer.data)
+    vert_buffers, ind_buffers = split_vert_buffers(
+        geom_xml.vertex_buffer.data, geom_xml.index_buffer.data, get_export_settings().reorder_split_triangles)
 
     geoms: list[Geometry] = []
 
@@ -697,41 +727,35 @@ def split_geom_by_vert_count(geom_xml: Geometry):
 
 def split_vert_buffers(
     vert_buffer: NDArray,
-    ind_buffer: NDArray[np.uint32]
+    ind_buffer: NDArray[np.uint32],
+    reorder_triangles: bool = False
 ) -> tuple[tuple[NDArray], tuple[NDArray[np.uint32]]]:
     """Splits vertex and index buffers on chunks that fit in 16-bit indices.
-    Returns tuple of split vertex buffers and tuple of index buffers"""
+    Returns tuple of split vertex buffers and tuple of index buffers.
+
+    If ``reorder_triangles`` is set and the buffers need to be split, triangles are sorted by their lowest vertex
+    index first, so triangles sharing vertices tend to end up in the same chunk and fewer vertices are duplicated."""
     MAX_INDEX = 65535
 
-    total_index = 0
     idx_count = len(ind_buffer)
 
+    if reorder_triangles and idx_count > MAX_INDEX:
+        triangles = ind_buffer.reshape((-1, 3))
+        ind_buffer = triangles[np.argsort(triangles.min(axis=1), kind="stable")].reshape(-1)
+
     split_vert_arrs = []
     split_ind_arrs = []
-    while total_index < idx_count:
-        old_index_to_new_index = {}
-        chunk_vertices_indices = []
-        chunk_indices = []
-        chunk_index = 0
-        while total_index < idx_count and len(chunk_indices) < MAX_INDEX:
-            old_index = ind_buffer[total_index]
-            existing_index = old_index_to_new_index.get(old_index, None)
-            if existing_index is not None:
-                # we already have this index vertex addedm simply remap it to new index
-                chunk_indices.append(existing_index)
-            else:
-                # We got new index unseen before, we have to add both vertex and index
-                chunk_indices.append(chunk_index)
-                chunk_vertices_indices.append(old_index)
-                old_index_to_new_index[old_index] = chunk_index
-                chunk_index += 1
-
-            total_index += 1
-
-        chunk_vertices_arr = vert_buffer[chunk_vertices_indices]
-        chunk_indices_arr = np.array(chunk_indices, dtype=np.uint32)
-        split_vert_arrs.append(chunk_vertices_arr)
-        split_ind_arrs.append(chunk_indices_arr)
+    for start in range(0, idx_count, MAX_INDEX):
+        chunk = ind_buffer[start:start + MAX_INDEX]
+
+        # Number the vertices of the chunk in order of first appearance
+        unique_indices, first_occurrence, inverse = np.unique(chunk, return_index=True, return_inverse=True)
+        order = np.argsort(first_occurrence)
+        new_index = np.empty(len(order), dtype=np.uint32)
+        new_index[order] = np.arange(len(order), dtype=np.uint32)
+
+        split_vert_arrs.append(vert_buffer[unique_indices[order]])
+        split_ind_arrs.append(new_index[inverse.reshape(-1)])
 
     return (tuple(split_vert_arrs), tuple(split_ind_arrs))
 
@@ -8,8 +8,21 @@ from ..tools.drawablehelper import get_model_xmls_by_lod
 from .shader_materials import create_shader, get_detail_extra_sampler, create_tinted_shader_graph
 from ..ybn.ybnimport import create_bound_composite, create_bound_object, create_rdr_bound
 from ..sollumz_properties import SollumzGame, TextureFormat, TextureUsage, SollumType, SOLLUMZ_UI_NAMES
-from ..sollumz_preferences import get_addon_preferences, get_import_settings
-from ..cwxml.drawable import YDR, BoneLimit, Joints, LodList, Shader, ShaderGroup, Drawable, Bone, Skeleton, RotationLimit, DrawableModel
+from ..sollumz_preferences import get_addon_preferences, get_import_settings, get_shared_textures_index
+from ..cwxml.drawable import (
+    YDR,
+    BoneLimit,
+    Joints,
+    LodList,
+    Shader,
+    ShaderGroup,
+    Drawable,
+    Bone,
+    Skeleton,
+    RotationLimit,
+    DrawableModel,
+    Texture,
+)
 from ..cwxml.bound import BoundChild
 from ..tools.blenderhelper import add_child_of_bone_constraint, create_empty_object, create_blender_object, join_objects, add_armature_modifier, parent_objs
 from ..tools.utils import get_filename
@@ -26,11 +39,13 @@ from ..tools import jenkhash
 
 current_game = SollumzGame.GTA
 
-def import_ydr(filepath: str):
+def import_ydr(filepath: str, ydr_xml: Optional[Drawable] = None):
+    """Import the YDR at ``filepath``. ``ydr_xml`` can be given if the file has already been parsed."""
     import_settings = get_import_settings()
 
     name = get_filename(filepath)
-    ydr_xml = YDR.from_xml_file(filepath)
+    if ydr_xml is None:
+        ydr_xml = YDR.from_xml_file(filepath)
     
     if import_settings.import_as_asset:
         return create_drawable_as_asset(ydr_xml, name, filepath)
@@ -254,10 +269,10 @@ def lookup_texture_file(texture_name: str, model_textures_directory: Path) -> Op
             return None
 
         if recursive:
-            # NOTE: rglob returns files in arbitrary order. We are just taking whatever is the first one it returns.
-            #       Maybe we should enforce some kind of sort (i.e. alphabetical), but really only makes sense to have
-            #       a single texture with this the name in the directory tree.
-            texture_path = next(directory.rglob(texture_filename), None)
+            # NOTE: Looked up in the shared textures index, which is refreshed once per import session. If there are
+            #       multiple textures with this name in the directory tree, the first one in sorted order is used.
+            texture_path = get_shared_textures_index().find(str(directory), texture_filename)
+            texture_path = Path(texture_path) if texture_path is not None else None
         else:
             texture_path = directory.joinpath(texture_filename)
 
@@ -279,6 +294,33 @@ def lookup_texture_file(texture_name: str, model_textures_directory: Path) -> Op
     return None
 
        
+def get_shader_node_index(material: bpy.types.Material) -> tuple[dict[str, bpy.types.ShaderNodeTexImage], dict]:
+    """Get the image nodes of ``material`` by name and its parameter nodes by name (GTA) or by case-sensitive
+    name hash (RDR), so each shader parameter finds its node with a single lookup."""
+    image_nodes = {}
+    parameter_nodes = {}
+    for n in material.node_tree.nodes:
+        if isinstance(n, bpy.types.ShaderNodeTexImage):
+            image_nodes[n.name] = n
+        elif isinstance(n, SzShaderNodeParameter):
+            key = n.name if current_game == SollumzGame.GTA else jenkhash.GenerateCaseSensitive(n.name)
+            parameter_nodes[key] = n
+
+    return image_nodes, parameter_nodes
+
+
+def get_embedded_textures_index(shader_group: ShaderGroup) -> dict[str, Texture]:
+    """Get the textures of the embedded texture dictionary by name."""
+    texture_dictionary = shader_group.texture_dictionary
+    if texture_dictionary is None:
+        return {}
+
+    if current_game == SollumzGame.RDR:
+        texture_dictionary = texture_dictionary.textures
+
+    return {texture.name: texture for texture in texture_dictionary}
+
+
 def shader_item_to_material(shader: Shader, shader_group: ShaderGroup, filepath: str):
     texture_folder = Path(os.path.dirname(filepath) + "\\" + os.path.basename(filepath)[:-8])
 
@@ -302,114 +344,97 @@ def shader_item_to_material(shader: Shader, shader_group: ShaderGroup, filepath:
     if current_game == SollumzGame.RDR:
         parameters = parameters.items
 
+    image_nodes, parameter_nodes = get_shader_node_index(material)
+    embedded_textures = get_embedded_textures_index(shader_group)
+    preferences = get_addon_preferences(bpy.context)
+
     for param in parameters:
-        for n in material.node_tree.nodes:
-            if isinstance(n, bpy.types.ShaderNodeTexImage):
-                if param.name == n.name:
-                    texture_path = lookup_texture_file(param.texture_name, texture_folder)
-                    if texture_path is not None:
-                        img = bpy.data.images.load(str(texture_path), check_existing=True)
-                        n.image = img
-                    if current_game == SollumzGame.RDR:
-                        n.texture_properties.index = param.index
-
-
-                    if not n.image:
-                        # for texture shader parameters with no name
-                        if not param.texture_name:
-                            continue
-                        # Check for existing texture
-                        existing_texture = None
-                        for image in bpy.data.images:
-                            if image.name == param.texture_name:
-                                existing_texture = image
-                        texture = bpy.data.images.new(
-                            name=param.texture_name, width=512, height=512) if not existing_texture else existing_texture
-                        n.image = texture
-                 
-                    # assign non color to normal maps
-                    if param.name in ("Bump", "bump", "normal", "bumptex", "speculartex", "speculartex2") or param.name == "distanceMapSampler":
-                        n.image.colorspace_settings.name = "Non-Color"
-
-                    # rdr check if we should set tint mix to 0.95
-                    if param.name == "tintpalettetex" and n.image is not None:
-                        hasTint = True
-
-                    preferences = get_addon_preferences(bpy.context)
-                    text_name = preferences.use_text_name_as_mat_name
-                    if text_name:
-                        if param.texture_name and param.name in ("DiffuseSampler", "diffusetex"):
-                            material.name = param.texture_name
-
-                    # Assign embedded texture dictionary properties
-                    texture_dictionary = shader_group.texture_dictionary
-                    if current_game == SollumzGame.RDR:
-                        texture_dictionary = shader_group.texture_dictionary.textures
-                    if texture_dictionary is not None:
-                        for texture in texture_dictionary:
-                            if texture.name == param.texture_name:
-                                n.texture_properties.embedded = True
-                                if current_game == SollumzGame.GTA:
-                                    try:
-                                        format = TextureFormat[texture.format.replace("D3DFMT_", "")]
-                                        n.texture_properties.format = format
-                                    except AttributeError:
-                                        print(f"Failed to set texture format: format '{texture.format}' unknown.")
-
-                                    try:
-                                        usage = TextureUsage[texture.usage]
-                                        n.texture_properties.usage = usage
-                                    except AttributeError:
-                                        print(f"Failed to set texture usage: usage '{texture.usage}' unknown.")
-                                    
-                                    for prop in dir(n.texture_flags):
-                                        for uf in texture.usage_flags:
-                                            if uf.lower() == prop:
-                                                setattr(
-                                                    n.texture_flags, prop, True)
-
-                                    n.texture_properties.extra_flags = texture.extra_flags
-                                elif current_game == SollumzGame.RDR:
-                                    n.texture_properties.game_type = SollumzGame.RDR
-                                    n.texture_properties.extra_flags = texture.flags
-
-                    if not n.texture_properties.embedded and not n.image.filepath:
-                        # Set external texture name for non-embedded textures
-                        n.image.source = "FILE"
-                        n.image.filepath = "//" + param.texture_name + ".dds"
-
-            elif isinstance(n, SzShaderNodeParameter):
+        n = image_nodes.get(param.name)
+        if n is not None:
+            texture_path = lookup_texture_file(param.texture_name, texture_folder)
+            if texture_path is not None:
+                img = bpy.data.images.load(str(texture_path), check_existing=True)
+                n.image = img
+            if current_game == SollumzGame.RDR:
+                n.texture_properties.index = param.index
+
+            if not n.image:
+                # for texture shader parameters with no name
+                if not param.texture_name:
+                    continue
+                # Check for existing texture
+                existing_texture = bpy.data.images.get(param.texture_name)
+                texture = bpy.data.images.new(
+                    name=param.texture_name, width=512, height=512) if not existing_texture else existing_texture
+                n.image = texture
+
+            # assign non color to normal maps
+            if param.name in ("Bump", "bump", "normal", "bumptex", "speculartex", "speculartex2") or param.name == "distanceMapSampler":
+                n.image.colorspace_settings.name = "Non-Color"
+
+            # rdr check if we should set tint mix to 0.95
+            if param.name == "tintpalettetex" and n.image is not None:
+                hasTint = True
+
+            text_name = preferences.use_text_name_as_mat_name
+            if text_name:
+                if param.texture_name and param.name in ("DiffuseSampler", "diffusetex"):
+                    material.name = param.texture_name
+
+            # Assign embedded texture dictionary properties
+            texture = embedded_textures.get(param.texture_name)
+            if texture is not None:
+                n.texture_properties.embedded = True
                 if current_game == SollumzGame.GTA:
-                    if param.name == n.name and n.num_rows == 1:
-                        n.set("X", param.x)
-                        if n.num_cols > 1:
-                            n.set("Y", param.y)
-                        if n.num_cols > 2:
-                            n.set("Z", param.z)
-                        if n.num_cols > 3:
-                            n.set("W", param.w)
-                        
-                        if param.type == "CBuffer":
-                            n.extra_property.buffer = param.buffer
-                            n.extra_property.offset = param.offset
-                        elif param.type == "Sampler":
-                            n.extra_property.index = param.index       
-
-                if current_game == SollumzGame.RDR:
-                   if jenkhash.GenerateCaseSensitive(param.name) == jenkhash.GenerateCaseSensitive(n.name) and n.num_rows == 1:
-                        n.set("X", param.x)
-                        if n.num_cols > 1:
-                            n.set("Y", param.y)
-                        if n.num_cols > 2:
-                            n.set("Z", param.z)
-                        if n.num_cols > 3:
-                            n.set("W", param.w)
-                        
-                        if param.type == "CBuffer":
-                            n.extra_property.buffer = param.buffer
-                            n.extra_property.offset = param.offset
-                        elif param.type == "Sampler":
-                            n.extra_property.index = param.index
+                    try:
+                        format = TextureFormat[texture.format.replace("D3DFMT_", "")]
+                        n.texture_properties.format = format
+                    except AttributeError:
+                        print(f"Failed to set texture format: format '{texture.format}' unknown.")
+
+                    try:
+                        usage = TextureUsage[texture.usage]
+                        n.texture_properties.usage = usage
+                    except AttributeError:
+                        print(f"Failed to set texture usage: usage '{texture.usage}' unknown.")
+
+                    usage_flags = {uf.lower() for uf in texture.usage_flags}
+                    for prop in dir(n.texture_flags):
+                        if prop in usage_flags:
+                            setattr(
+                                n.texture_flags, prop, True)
+
+                    n.texture_properties.extra_flags = texture.extra_flags
+                elif current_game == SollumzGame.RDR:
+                    n.texture_properties.game_type = SollumzGame.RDR
+                    n.texture_properties.extra_flags = texture.flags
+
+            if not n.texture_properties.embedded and not n.image.filepath:
+                # Set external texture name for non-embedded textures
+                n.image.source = "FILE"
+                n.image.filepath = "//" + param.texture_name + ".dds"
+
+            continue
+
+        if current_game == SollumzGame.GTA:
+            n = parameter_nodes.get(param.name)
+        else:
+            n = parameter_nodes.get(jenkhash.GenerateCaseSensitive(param.name))
+
+        if n is not None and n.num_rows == 1:
+            n.set("X", param.x)
+            if n.num_cols > 1:
+                n.set("Y", param.y)
+            if n.num_cols > 2:
+                n.set("Z", param.z)
+            if n.num_cols > 3:
+                n.set("W", param.w)
+
+            if param.type == "CBuffer":
+                n.extra_property.buffer = param.buffer
+                n.extra_property.offset = param.offset
+            elif param.type == "Sampler":
+                n.extra_property.index = param.index
 
     # assign extra detail node image for viewing
     dtl_ext = get_detail_extra_sampler(material)
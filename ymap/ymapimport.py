@@ -2,6 +2,7 @@ import binascii
 import struct
 import math
 import bpy
+from typing import Optional
 from mathutils import Vector, Euler
 from ..sollumz_helper import duplicate_object_with_children, set_object_collection
 from ..tools.ymaphelper import add_occluder_material, get_cargen_mesh
@@ -293,8 +294,10 @@ def ymap_to_obj(ymap: CMapData):
     return ymap_obj
 
 
-def import_ymap(filepath):
-    ymap_xml: CMapData = YMAP.from_xml_file(filepath)
+def import_ymap(filepath, ymap_xml: Optional[CMapData] = None):
+    """Import the YMAP at ``filepath``. ``ymap_xml`` can be given if the file has already been parsed."""
+    if ymap_xml is None:
+        ymap_xml = YMAP.from_xml_file(filepath)
     found = False
     for obj in bpy.context.scene.objects:
         if obj.sollum_type == SollumType.YMAP and obj.name == ymap_xml.name:
@@ -160,6 +160,8 @@ def navmesh_to_obj(navmesh, filepath):
     bpy.context.collection.objects.link(npobj)
 
 
-def import_ynv(filepath):
-    ynv_xml = YNV.from_xml_file(filepath)
+def import_ynv(filepath, ynv_xml=None):
+    """Import the YNV at ``filepath``. ``ynv_xml`` can be given if the file has already been parsed."""
+    if ynv_xml is None:
+        ynv_xml = YNV.from_xml_file(filepath)
     navmesh_to_obj(ynv_xml, filepath)